@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from .base import AdapterCapabilities, RecallResult
+from .storage import EngineStorage
 
 
 class BM25OnlyAdapter:
@@ -16,19 +17,40 @@ class BM25OnlyAdapter:
         supports_metadata=True,
     )
 
-    def __init__(self) -> None:
+    supports_storage = True
+    supports_snapshots = True
+
+    def __init__(self, storage: str = "memory", cache: str = "warm") -> None:
+        self._storage = EngineStorage(storage, cache)
+        if self._storage.label:
+            self.name = f"{type(self).name} [{self._storage.label}]"
         self._engine = None
-        self._id_map: dict[str, str] = {}
+        self._id_map: dict[str, str] = {}  # benchmark_id -> openmem_id
+        self._reverse_map: dict[str, str] = {}  # openmem_id -> benchmark_id
 
     def setup(self) -> None:
-        from openmem.engine import MemoryEngine
-
-        self._engine = MemoryEngine(db_path=":memory:", max_hops=0)
+        self._engine = self._storage.open(max_hops=0)
         self._id_map = {}
+        self._reverse_map = {}
+
+    def setup_from_snapshot(self, snapshot) -> None:
+        """``setup`` on a clone of a populated scenario database."""
+        self._engine = self._storage.open(snapshot, max_hops=0)
+        self._id_map = dict(snapshot.id_map)
+        self._reverse_map = {v: k for k, v in self._id_map.items()}
+
+    def save_snapshot(self, snapshots, key: str):
+        return snapshots.save(key, self._engine.store.conn, self._id_map)
 
     def teardown(self) -> None:
+        self._storage.close(self._engine)
         self._engine = None
         self._id_map = {}
+        self._reverse_map = {}
+
+    def before_query(self) -> None:
+        """Called by the runner, untimed, before each query."""
+        self._engine = self._storage.before_query(self._engine)
 
     def store(self, id: str, text: str, metadata: dict | None = None) -> None:
         meta = metadata or {}
@@ -40,6 +62,7 @@ class BM25OnlyAdapter:
             gist=meta.get("gist"),
         )
         self._id_map[id] = mem.id
+        self._reverse_map[mem.id] = id
 
     def link(self, source_id: str, target_id: str, rel_type: str = "mentions",
              weight: float = 0.5) -> None:
@@ -56,8 +79,7 @@ class BM25OnlyAdapter:
 
     def recall(self, query: str, top_k: int = 10) -> list[RecallResult]:
         results = self._engine.recall(query, top_k=top_k, token_budget=50000)
-        reverse_map = {v: k for k, v in self._id_map.items()}
         return [
-            RecallResult(id=reverse_map.get(sm.memory.id, sm.memory.id), score=sm.score)
+            RecallResult(id=self._reverse_map.get(sm.memory.id, sm.memory.id), score=sm.score)
             for sm in results
         ]
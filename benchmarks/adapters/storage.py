@@ -0,0 +1,117 @@
+"""Where the OpenMem-based adapters keep their database.
+
+``memory`` is the default ``:memory:`` database: fast, and free of all
+I/O. ``file`` puts the database in a temporary directory, so commits pay
+for WAL writes and fsync as they do in ``~/.openmem/memories.db``.
+
+With the ``cold`` cache mode every query runs on a freshly opened engine
+(empty SQLite page cache, FTS planner and tagger caches) after the
+database files have been evicted from the OS page cache with
+``posix_fadvise(DONTNEED)``. Where that call is unavailable, the new
+connection gets a tiny SQLite ``cache_size`` instead.
+
+``open`` can start from a populated scenario snapshot (see
+``benchmarks.snapshots``) instead of an empty database.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import time
+
+STORAGE_MODES = ("memory", "file")
+CACHE_MODES = ("warm", "cold")
+
+# SQLite page cache for cold connections when the OS cache cannot be dropped
+COLD_CACHE_KIB = 64
+
+
+def drop_os_cache(path: str) -> bool:
+    """Ask the OS to evict ``path`` and its WAL files from the page cache.
+
+    Returns False where ``posix_fadvise`` is not available.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    for name in (path, path + "-wal", path + "-shm"):
+        try:
+            fd = os.open(name, os.O_RDONLY)
+        except FileNotFoundError:
+            continue
+        try:
+            os.fsync(fd)  # only clean pages can be dropped
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return True
+
+
+class EngineStorage:
+    """Opens, reopens and cleans up an adapter's ``MemoryEngine``."""
+
+    def __init__(self, storage: str = "memory", cache: str = "warm"):
+        if storage not in STORAGE_MODES:
+            raise ValueError(f"unknown storage mode: {storage!r}")
+        if cache not in CACHE_MODES:
+            raise ValueError(f"unknown cache mode: {cache!r}")
+        if storage == "memory" and cache == "cold":
+            raise ValueError("the cold cache mode needs file storage")
+        self.storage = storage
+        self.cache = cache
+        self._dir: str | None = None
+        self._engine_kwargs: dict = {}
+
+    @property
+    def label(self) -> str:
+        """Suffix for adapter names; empty for the default in-memory mode."""
+        if self.storage == "memory":
+            return ""
+        return f"{self.storage}/{self.cache}"
+
+    @property
+    def db_path(self) -> str:
+        if self._dir is None:
+            return ":memory:"
+        return os.path.join(self._dir, "memories.db")
+
+    def open(self, snapshot=None, **engine_kwargs):
+        """A new engine, on a clone of ``snapshot`` when given."""
+        from openmem.engine import MemoryEngine
+
+        from ..snapshots import clone_snapshot, drop_metadata, shift_timestamps
+
+        if self.storage == "file" and self._dir is None:
+            self._dir = tempfile.mkdtemp(prefix="openmem-bench-")
+        if snapshot is not None and self.storage == "file":
+            shutil.copyfile(snapshot.path, self.db_path)
+        self._engine_kwargs = engine_kwargs
+        engine = MemoryEngine(db_path=self.db_path, **engine_kwargs)
+        if snapshot is not None:
+            if self.storage == "memory":
+                clone_snapshot(snapshot, engine.store.conn)
+            else:
+                drop_metadata(engine.store.conn)
+            shift_timestamps(engine.store.conn, time.time() - snapshot.built_at)
+        return engine
+
+    def before_query(self, engine):
+        """The engine to run the next query on: ``engine`` itself when
+        warm, a freshly opened one when cold."""
+        if self.cache != "cold":
+            return engine
+        from openmem.engine import MemoryEngine
+
+        engine.close()
+        dropped = drop_os_cache(self.db_path)
+        engine = MemoryEngine(db_path=self.db_path, **self._engine_kwargs)
+        if not dropped:
+            engine.store.conn.execute(f"PRAGMA cache_size = -{COLD_CACHE_KIB}")
+        return engine
+
+    def close(self, engine) -> None:
+        if engine is not None:
+            engine.close()
+        if self._dir is not None:
+            shutil.rmtree(self._dir, ignore_errors=True)
+            self._dir = None
@@ -0,0 +1,155 @@
+"""Record and replay the agent benchmark's OpenAI traffic.
+
+A cassette is one JSON file per scenario holding every chat completion the
+agent and the judge received, in order: assistant text plus tool calls
+(name and raw JSON arguments) for the agent, the JSON verdict for the
+judge. ``CassetteClient`` stands in for the ``OpenAI`` client on both
+sides:
+
+- ``record`` forwards each request to the real client and appends the
+  response to the cassette.
+- ``replay`` never touches the network; it hands back the recorded
+  responses one by one.
+
+Replay ignores what the request contains: the agent issues exactly the
+recorded ``memory_recall`` queries against whichever adapter is under
+test, and the judge returns the recorded verdict. Recall latencies are
+therefore measured on an identical, deterministic call sequence, while
+answer-quality scores are those of the adapter the cassette was
+recorded with.
+"""
+from __future__ import annotations
+
+import json
+import os
+from types import SimpleNamespace
+
+CASSETTE_VERSION = 1
+CHANNELS = ("agent", "judge")
+
+
+class CassetteError(RuntimeError):
+    """A cassette is missing, stale, or has run out of responses."""
+
+
+def cassette_path(directory: str, scenario_name: str) -> str:
+    return os.path.join(directory, f"{scenario_name}.json")
+
+
+class Cassette:
+    """Recorded completions for one scenario."""
+
+    def __init__(self, scenario: str, task: str, model: str = "", judge_model: str = ""):
+        self.scenario = scenario
+        self.task = task
+        self.model = model
+        self.judge_model = judge_model
+        self.responses: dict[str, list[dict]] = {channel: [] for channel in CHANNELS}
+        self._cursor = {channel: 0 for channel in CHANNELS}
+
+    def rewind(self) -> None:
+        self._cursor = {channel: 0 for channel in CHANNELS}
+
+    def append(self, channel: str, message: dict) -> None:
+        self.responses[channel].append(message)
+
+    def next(self, channel: str) -> dict:
+        index = self._cursor[channel]
+        if index >= len(self.responses[channel]):
+            raise CassetteError(
+                f"cassette for {self.scenario!r} has no {channel} response #{index + 1}"
+            )
+        self._cursor[channel] = index + 1
+        return self.responses[channel][index]
+
+    def to_dict(self) -> dict:
+        return {
+            "version": CASSETTE_VERSION,
+            "scenario": self.scenario,
+            "task": self.task,
+            "model": self.model,
+            "judge_model": self.judge_model,
+            **{channel: self.responses[channel] for channel in CHANNELS},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Cassette:
+        if data.get("version") != CASSETTE_VERSION:
+            raise CassetteError(f"unsupported cassette version: {data.get('version')!r}")
+        cassette = cls(data["scenario"], data["task"], data.get("model", ""), data.get("judge_model", ""))
+        for channel in CHANNELS:
+            cassette.responses[channel] = list(data.get(channel, []))
+        return cassette
+
+    def save(self, directory: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        path = cassette_path(directory, self.scenario)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+        return path
+
+    @classmethod
+    def load(cls, directory: str, scenario_name: str, task: str | None = None) -> Cassette:
+        """Load a scenario's cassette; with ``task``, refuse a stale one."""
+        path = cassette_path(directory, scenario_name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                cassette = cls.from_dict(json.load(f))
+        except FileNotFoundError:
+            raise CassetteError(f"no cassette for {scenario_name!r} in {directory}") from None
+        if task is not None and cassette.task != task:
+            raise CassetteError(
+                f"cassette for {scenario_name!r} was recorded for a different task; re-record it"
+            )
+        return cassette
+
+
+def _serialize_message(message) -> dict:
+    data: dict = {"content": message.content}
+    if getattr(message, "tool_calls", None):
+        data["tool_calls"] = [
+            {"id": tc.id, "name": tc.function.name, "arguments": tc.function.arguments}
+            for tc in message.tool_calls
+        ]
+    return data
+
+
+def _response(data: dict) -> SimpleNamespace:
+    """Rebuild the parts of a ``ChatCompletion`` the benchmark reads."""
+    tool_calls = [
+        SimpleNamespace(
+            id=tc["id"],
+            type="function",
+            function=SimpleNamespace(name=tc["name"], arguments=tc["arguments"]),
+        )
+        for tc in data.get("tool_calls", [])
+    ] or None
+    message = SimpleNamespace(content=data.get("content"), tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class CassetteClient:
+    """Drop-in for ``OpenAI()`` that records to or replays from a cassette.
+
+    Only ``client.chat.completions.create`` is provided.
+    """
+
+    def __init__(self, cassette: Cassette, channel: str, real=None):
+        if channel not in CHANNELS:
+            raise ValueError(f"unknown cassette channel: {channel!r}")
+        self.cassette = cassette
+        self.channel = channel
+        self.real = real
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    @property
+    def recording(self) -> bool:
+        return self.real is not None
+
+    def _create(self, **kwargs):
+        if not self.recording:
+            return _response(self.cassette.next(self.channel))
+        response = self.real.chat.completions.create(**kwargs)
+        self.cassette.append(self.channel, _serialize_message(response.choices[0].message))
+        return response
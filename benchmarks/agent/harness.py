@@ -90,8 +90,10 @@ class AgentHarness:
             self._client = OpenAI()
         return self._client
 
-    def run(self, adapter: MemoryAdapter, task: str) -> AgentResult:
-        client = self._get_client()
+    def run(self, adapter: MemoryAdapter, task: str, client=None) -> AgentResult:
+        """Run the agent on ``task``; ``client`` overrides the OpenAI client
+        (e.g. a ``CassetteClient``) for this run only."""
+        client = client or self._get_client()
         messages = [
             {"role": "system", "content": SYSTEM_PROMPT},
             {"role": "user", "content": task},
@@ -53,10 +53,12 @@ def judge_answer(
     key_facts: list[str],
     actual_answer: str,
     model: str = "gpt-4o-mini",
+    client=None,
 ) -> JudgeResult:
-    from openai import OpenAI
+    if client is None:
+        from openai import OpenAI
 
-    client = OpenAI()
+        client = OpenAI()
 
     prompt = JUDGE_PROMPT.format(
         question=question,
@@ -2,6 +2,10 @@
 
 Sets up each adapter with pre-populated memories, runs the LLM agent,
 and evaluates the answer with an LLM judge.
+
+With a cassette directory the OpenAI traffic is recorded once per
+scenario (by the first adapter that runs it) and replayed for every
+other adapter; in ``replay`` mode nothing goes over the network.
 """
 from __future__ import annotations
 
@@ -9,6 +13,7 @@ from dataclasses import dataclass, field
 
 from benchmarks.adapters.base import MemoryAdapter
 
+from .cassette import Cassette, CassetteClient, CassetteError
 from .harness import AgentHarness, AgentResult
 from .judge import JudgeResult, judge_answer
 from .scenarios import AgentScenario
@@ -41,6 +46,28 @@ def _should_skip(adapter: MemoryAdapter, scenario: AgentScenario) -> str | None:
     return None
 
 
+CASSETTE_MODES = ("record", "replay")
+
+
+def _cassette_clients(
+    scenario: AgentScenario,
+    harness: AgentHarness,
+    judge_model: str,
+    cassette_dir: str,
+    mode: str,
+) -> tuple[Cassette, CassetteClient, CassetteClient]:
+    if mode == "replay":
+        cassette = Cassette.load(cassette_dir, scenario.name, task=scenario.task)
+        return cassette, CassetteClient(cassette, "agent"), CassetteClient(cassette, "judge")
+    if mode != "record":
+        raise ValueError(f"unknown cassette mode: {mode!r}")
+    from openai import OpenAI
+
+    real = OpenAI()
+    cassette = Cassette(scenario.name, scenario.task, model=harness.model, judge_model=judge_model)
+    return cassette, CassetteClient(cassette, "agent", real), CassetteClient(cassette, "judge", real)
+
+
 def _apply_temporal_offset(adapter: MemoryAdapter, mem_def, age_days: int) -> None:
     if age_days <= 0:
         return
@@ -64,6 +91,8 @@ def run_agent_scenario(
     harness: AgentHarness,
     judge_model: str = "gpt-4o-mini",
     verbose: bool = False,
+    cassette_dir: str | None = None,
+    cassette_mode: str = "replay",
 ) -> AgentScenarioResult:
     skip_reason = _should_skip(adapter, scenario)
     if skip_reason:
@@ -74,6 +103,20 @@ def run_agent_scenario(
             skip_reason=skip_reason,
         )
 
+    cassette = agent_client = judge_client = None
+    if cassette_dir is not None:
+        try:
+            cassette, agent_client, judge_client = _cassette_clients(
+                scenario, harness, judge_model, cassette_dir, cassette_mode
+            )
+        except CassetteError as e:
+            return AgentScenarioResult(
+                scenario_name=scenario.name,
+                adapter_name=adapter.name,
+                skipped=True,
+                skip_reason=str(e),
+            )
+
     try:
         adapter.setup()
     except ImportError as e:
@@ -113,7 +156,7 @@ def run_agent_scenario(
         # Run the agent
         if verbose:
             print(f"    Running agent...", end="", flush=True)
-        agent_result = harness.run(adapter, scenario.task)
+        agent_result = harness.run(adapter, scenario.task, client=agent_client)
         if verbose:
             print(f" {agent_result.recall_calls} recalls, {agent_result.total_latency_ms:.0f}ms total")
 
@@ -137,10 +180,16 @@ def run_agent_scenario(
             key_facts=scenario.key_facts,
             actual_answer=agent_result.answer,
             model=judge_model,
+            client=judge_client,
         )
         if verbose:
             print(f" score={judge_result.overall:.2f}")
 
+        if cassette is not None and agent_client.recording:
+            path = cassette.save(cassette_dir)
+            if verbose:
+                print(f"    Recorded {path}")
+
         return AgentScenarioResult(
             scenario_name=scenario.name,
             adapter_name=adapter.name,
@@ -158,8 +207,18 @@ def run_agent_benchmark(
     harness: AgentHarness,
     judge_model: str = "gpt-4o-mini",
     verbose: bool = False,
+    cassette_dir: str | None = None,
+    cassette_mode: str = "replay",
 ) -> list[AgentBenchmarkResult]:
+    """Run every scenario on every adapter.
+
+    ``cassette_mode="record"`` records each scenario on the first adapter
+    that completes it and replays that cassette for the remaining ones.
+    """
+    if cassette_mode not in CASSETTE_MODES:
+        raise ValueError(f"unknown cassette mode: {cassette_mode!r}")
     results = []
+    recorded: set[str] = set()
 
     for adapter in adapters:
         if verbose:
@@ -173,13 +232,18 @@ def run_agent_benchmark(
             if verbose:
                 print(f"  {scenario.name}:")
 
+            mode = "replay" if scenario.name in recorded else cassette_mode
             scenario_result = run_agent_scenario(
                 adapter=adapter,
                 scenario=scenario,
                 harness=harness,
                 judge_model=judge_model,
                 verbose=verbose,
+                cassette_dir=cassette_dir,
+                cassette_mode=mode,
             )
+            if mode == "record" and cassette_dir is not None and scenario_result.judge_result:
+                recorded.add(scenario.name)
 
             if verbose and scenario_result.skipped:
                 print(f"    SKIP ({scenario_result.skip_reason})")
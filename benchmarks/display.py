@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 from .adapters.base import MemoryAdapter
+from .load import LoadResult
+from .mcp_roundtrip import McpResult
+from .micro import MicroResult
+from .results import LATENCY_METRICS, Comparison
 from .runner import BenchmarkResult
+from .topologies import TopologyResult
+from .scale import ScaleResult
 
 
 def print_results_table(results: list[BenchmarkResult], scenarios: list[str]) -> None:
     col = 10
-    acol = 24
+    acol = max([24] + [len(r.adapter_name) for r in results])
 
     print("\n" + "=" * 80)
     print("BENCHMARK RESULTS")
@@ -55,7 +61,7 @@ def print_feature_matrix(adapters: list[MemoryAdapter]) -> None:
     print("=" * 80)
 
     fcol = 16
-    acol = 24
+    acol = max([24] + [len(adapter.name) for adapter in adapters])
     header = f"{'Feature':<{fcol}}"
     for adapter in adapters:
         header += f" {adapter.name:>{acol}}"
@@ -96,3 +102,228 @@ def print_summary(results: list[BenchmarkResult]) -> None:
         print(f"    Avg MRR:          {avg_mrr:.3f}")
         print(f"    Avg Latency p50:  {avg_lat:.1f}ms")
         print(f"    Scenarios run:    {n}/{len(result.scenario_results)}")
+
+
+def _megabytes(n: int | None) -> str:
+    return "n/a" if n is None else f"{n / 1_048_576:.1f}MB"
+
+
+def print_scale_table(results: list[ScaleResult]) -> None:
+    col = 10
+
+    print("\n" + "=" * 80)
+    print("SCALE RESULTS")
+    print("=" * 80)
+
+    header = (
+        f"{'Memories':>{col}} {'Ingest/s':>{col}} {'Links/s':>{col}} "
+        f"{'Lat p50':>{col}} {'Lat p95':>{col}} {'Lat p99':>{col}} {'Hit@10':>{col - 2}} "
+        f"{'Peak RSS':>{col}} {'DB':>{col}} {'FTS':>{col}}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.size:>{col},} "
+            f"{r.memories_per_second:>{col}.0f} "
+            f"{r.links_per_second:>{col}.0f} "
+            f"{r.latency_p50_ms:>{col - 2}.1f}ms "
+            f"{r.latency_p95_ms:>{col - 2}.1f}ms "
+            f"{r.latency_p99_ms:>{col - 2}.1f}ms "
+            f"{r.hit_rate_at_10:>{col - 2}.3f} "
+            f"{_megabytes(r.peak_rss_bytes):>{col}} "
+            f"{_megabytes(r.db_bytes + r.wal_bytes):>{col}} "
+            f"{_megabytes(r.fts_bytes):>{col}}"
+        )
+
+
+def print_load_results(result: LoadResult) -> None:
+    col = 10
+    config = result.config
+    kind = "threads" if config.use_threads else "processes"
+
+    print("\n" + "=" * 80)
+    print(
+        f"LOAD RESULTS  ({config.readers} readers, {config.writers} writers, {kind}, "
+        f"busy_timeout={config.busy_timeout_ms}ms, {result.elapsed_s:g}s)"
+    )
+    print("=" * 80)
+
+    header = (
+        f"{'Operation':<{col}} {'Ops':>{col}} {'Ops/s':>{col}} {'Lat p50':>{col}} "
+        f"{'Lat p95':>{col}} {'Lat p99':>{col}} {'Lat max':>{col}} {'Locked':>{col}}"
+    )
+    print(header)
+    print("-" * len(header))
+    for op, stats in result.operations.items():
+        print(
+            f"{op:<{col}} "
+            f"{stats.count:>{col}} "
+            f"{stats.throughput:>{col}.1f} "
+            f"{stats.latency_p50_ms:>{col - 2}.1f}ms "
+            f"{stats.latency_p95_ms:>{col - 2}.1f}ms "
+            f"{stats.latency_p99_ms:>{col - 2}.1f}ms "
+            f"{stats.latency_max_ms:>{col - 2}.1f}ms "
+            f"{stats.locked_rate:>{col - 1}.1%}"
+        )
+    errors = sum(s.errors - s.locked for s in result.operations.values())
+    print(f"\n  Total throughput: {result.total_throughput:.1f} ops/s")
+    if errors:
+        print(f"  Other SQLite errors: {errors}")
+
+
+def _describe_run(metadata: dict) -> str:
+    sha = (metadata.get("git_sha") or "unknown")[:10]
+    if metadata.get("git_dirty"):
+        sha += "+dirty"
+    return (
+        f"{sha}  Python {metadata.get('python', '?')}  "
+        f"SQLite {metadata.get('sqlite', '?')}  {metadata.get('platform', '?')}"
+    )
+
+
+def print_comparison(
+    comparisons: list[Comparison], baseline_meta: dict, current_meta: dict
+) -> None:
+    acol = 24
+    scol = 22
+    mcol = 16
+    col = 10
+
+    print("\n" + "=" * 80)
+    print("BASELINE COMPARISON")
+    print("=" * 80)
+    print(f"  baseline: {_describe_run(baseline_meta)}")
+    print(f"  current:  {_describe_run(current_meta)}")
+    if baseline_meta.get("machine") != current_meta.get("machine") or (
+        baseline_meta.get("cpu_count") != current_meta.get("cpu_count")
+    ):
+        print("  warning: runs are from different machines; latency is not comparable")
+    if baseline_meta.get("scenario_clock") != current_meta.get("scenario_clock"):
+        print(
+            "  warning: runs stamp scenario memories on different clocks; quality "
+            "deltas may not be ranking changes (see runner.SCENARIO_CLOCK)"
+        )
+
+    if not comparisons:
+        print("\n  No metrics in common.")
+        return
+
+    header = (
+        f"{'Adapter':<{acol}} {'Scenario':<{scol}} {'Metric':<{mcol}} "
+        f"{'Baseline':>{col}} {'Current':>{col}} {'Change':>{col}}"
+    )
+    print("\n" + header)
+    print("-" * len(header))
+    for c in comparisons:
+        if c.metric in LATENCY_METRICS:
+            change = f"{c.change:+.1%}"
+        else:
+            change = f"{c.change:+.3f}"
+        flag = "  REGRESSION" if c.regression else ""
+        print(
+            f"{c.adapter:<{acol}} {c.scenario:<{scol}} {c.metric:<{mcol}} "
+            f"{c.baseline:>{col}.3f} {c.current:>{col}.3f} {change:>{col}}{flag}"
+        )
+
+    regressed = [c for c in comparisons if c.regression]
+    print(f"\n  {len(regressed)} regression(s) in {len(comparisons)} metrics")
+
+
+def print_micro_results(results: list[MicroResult], size: int) -> None:
+    ncol = 30
+    col = 11
+
+    print("\n" + "=" * 80)
+    print(f"MICRO-BENCHMARKS  ({size:,} memories)")
+    print("=" * 80)
+
+    header = (
+        f"{'Stage':<{ncol}} {'Mean':>{col}} {'±95% CI':>{col}} {'Median':>{col}} "
+        f"{'p95':>{col}} {'Peak heap':>{col}} {'Blocks':>{col - 3}}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        peak = "--" if r.peak_bytes is None else f"{r.peak_bytes / 1024:.1f}KB"
+        blocks = "--" if r.net_blocks is None else f"{r.net_blocks:.0f}"
+        print(
+            f"{r.name:<{ncol}} "
+            f"{r.mean_ns / 1000:>{col - 2}.1f}us "
+            f"{r.ci95_ns / 1000:>{col - 2}.1f}us "
+            f"{r.median_ns / 1000:>{col - 2}.1f}us "
+            f"{r.percentile_ns(95) / 1000:>{col - 2}.1f}us "
+            f"{peak:>{col}} "
+            f"{blocks:>{col - 3}}"
+        )
+
+
+def print_topology_results(results: list[TopologyResult]) -> None:
+    ncol = 14
+    col = 10
+
+    print("\n" + "=" * 80)
+    print("GRAPH TOPOLOGIES")
+    print("=" * 80)
+
+    header = (
+        f"{'Topology':<{ncol}} {'Edges':>{col}} {'Activated':>{col}} {'Scanned':>{col}} "
+        f"{'Spread p50':>{col + 1}} {'Spread heap':>{col + 1}} "
+        f"{'Confl p50':>{col + 1}} {'Demoted':>{col - 2}}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        spread_heap = "--" if r.spread.peak_bytes is None else f"{r.spread.peak_bytes / 1024:.0f}KB"
+        print(
+            f"{r.name:<{ncol}} "
+            f"{r.edges:>{col}} "
+            f"{r.activated:>{col}} "
+            f"{r.edges_scanned:>{col}} "
+            f"{r.spread.median_ns / 1e6:>{col - 1}.2f}ms "
+            f"{spread_heap:>{col + 1}} "
+            f"{r.conflicts.median_ns / 1e6:>{col - 1}.2f}ms "
+            f"{r.demoted:>{col - 2}}"
+        )
+
+
+def print_mcp_results(result: McpResult) -> None:
+    col = 10
+    ncol = 18
+
+    print("\n" + "=" * 80)
+    print(f"MCP STDIO ROUND TRIPS  ({result.seed_size:,} seeded memories)")
+    print("=" * 80)
+    if result.startup_ms:
+        startup = sorted(result.startup_ms)[len(result.startup_ms) // 2]
+        first = sorted(result.first_call_ms)[len(result.first_call_ms) // 2]
+        print(
+            f"  Cold start (median of {len(result.startup_ms)}): initialize {startup:.0f}ms, "
+            f"first recall {first:.0f}ms\n"
+        )
+
+    header = (
+        f"{'Tool':<{ncol}} {'Calls':>{col}} {'Calls/s':>{col}} {'Lat p50':>{col}} "
+        f"{'Lat p95':>{col}} {'Lat p99':>{col}} {'Lat max':>{col}} {'Errors':>{col - 2}}"
+    )
+    print(header)
+    print("-" * len(header))
+    rows = list(result.tools.items())
+    if result.direct_recall:
+        rows.append(("recall (direct)", result.direct_recall))
+    for name, stats in rows:
+        print(
+            f"{name:<{ncol}} "
+            f"{stats.count:>{col}} "
+            f"{stats.calls_per_second:>{col}.1f} "
+            f"{stats.latency_p50_ms:>{col - 2}.2f}ms "
+            f"{stats.latency_p95_ms:>{col - 2}.2f}ms "
+            f"{stats.latency_p99_ms:>{col - 2}.2f}ms "
+            f"{stats.latency_max_ms:>{col - 2}.2f}ms "
+            f"{stats.errors:>{col - 2}}"
+        )
+    print(f"\n  Total throughput: {result.throughput:.1f} calls/s")
+    recall = result.tools.get("memory_recall")
+    if recall and result.direct_recall:
+        overhead = recall.latency_p50_ms - result.direct_recall.latency_p50_ms
+        print(f"  Protocol overhead on recall (p50): {overhead:.2f}ms")
@@ -0,0 +1,239 @@
+"""Concurrent load against one database file.
+
+Several MCP server processes, the ``digest`` hook and the web UI share
+``~/.openmem/memories.db`` in production. This generator reproduces that:
+reader and writer workers, each with its own ``MemoryEngine`` on the same
+file, run a weighted mix of operations for a fixed duration. Per operation
+it reports throughput, latency percentiles and the rate of ``database is
+locked`` errors, so WAL, busy-timeout and write-path changes can be
+compared by numbers.
+
+Workers are processes by default (as in production); ``use_threads`` runs
+them as threads of one process instead.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from .metrics import percentile
+from .scenarios.corpus import CorpusSpec, SyntheticCorpus
+
+# Operation weights per worker role. Recall also writes: it updates the
+# access counters of what it returns.
+READER_MIX = {"recall": 1.0}
+WRITER_MIX = {"store": 0.6, "reinforce": 0.3, "recall": 0.1}
+
+OPERATIONS = ("recall", "store", "reinforce")
+
+DEFAULT_SEED_SIZE = 2000
+DEFAULT_BUSY_TIMEOUT_MS = 5000  # sqlite3.connect's default timeout
+
+
+@dataclass
+class LoadConfig:
+    readers: int = 4
+    writers: int = 2
+    duration_s: float = 10.0
+    seed_size: int = DEFAULT_SEED_SIZE
+    busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS
+    use_threads: bool = False
+    reader_mix: dict[str, float] = field(default_factory=lambda: dict(READER_MIX))
+    writer_mix: dict[str, float] = field(default_factory=lambda: dict(WRITER_MIX))
+    seed: int = 0
+
+
+@dataclass
+class WorkerResult:
+    role: str
+    latencies_ms: dict[str, list[float]] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+    locked: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class OperationStats:
+    count: int = 0
+    throughput: float = 0.0
+    latency_p50_ms: float = 0.0
+    latency_p95_ms: float = 0.0
+    latency_p99_ms: float = 0.0
+    latency_max_ms: float = 0.0
+    errors: int = 0
+    locked: int = 0
+    locked_rate: float = 0.0
+
+
+@dataclass
+class LoadResult:
+    config: LoadConfig
+    elapsed_s: float = 0.0
+    operations: dict[str, OperationStats] = field(default_factory=dict)
+
+    @property
+    def total_throughput(self) -> float:
+        return sum(s.throughput for s in self.operations.values())
+
+
+def _is_locked(error: sqlite3.OperationalError) -> bool:
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+def prepare_database(db_path: str, size: int, seed: int = 0) -> None:
+    """Fill ``db_path`` with a ``size``-memory synthetic corpus."""
+    from openmem.engine import MemoryEngine
+
+    corpus = SyntheticCorpus(CorpusSpec(size=size, seed=seed))
+    engine = MemoryEngine(db_path=db_path)
+    ids: list[str] = []
+    for memory in corpus.memories():
+        meta = memory.metadata or {}
+        ids.append(engine.add(memory.text, type=meta["type"], entities=meta["entities"]).id)
+    for link in corpus.links():
+        engine.link(
+            ids[int(link.source_id.rsplit("_", 1)[1])],
+            ids[int(link.target_id.rsplit("_", 1)[1])],
+            rel_type=link.rel_type, weight=link.weight,
+        )
+    engine.close()
+
+
+def run_worker(
+    db_path: str,
+    role: str,
+    worker: int,
+    mix: dict[str, float],
+    start_at: float,
+    duration_s: float,
+    busy_timeout_ms: int,
+    seed_size: int,
+    seed: int = 0,
+) -> WorkerResult:
+    """Run ``mix`` against ``db_path`` from ``start_at`` for ``duration_s``.
+
+    ``start_at`` is wall-clock time so that workers in different
+    processes start together.
+    """
+    from openmem.engine import MemoryEngine
+
+    engine = MemoryEngine(db_path=db_path)
+    # Before the first recall, so the seed channels' reader connections
+    # (opened lazily) get the same timeout
+    engine.store.set_busy_timeout(busy_timeout_ms)
+    rng = random.Random(f"{seed}:{role}:{worker}")
+    queries = [q.query for q in SyntheticCorpus(CorpusSpec(size=seed_size, seed=seed)).queries(200)]
+    ids = [row[0] for row in engine.store.conn.execute("SELECT id FROM memories")]
+    # Fresh text for stores, distinct per worker, over the same entities
+    new_memories = SyntheticCorpus(CorpusSpec(
+        size=10**9,
+        entity_count=CorpusSpec(size=seed_size).entities,
+        seed=f"{seed}:{role}:{worker}",
+    )).memories()
+    ops = list(mix)
+    weights = [mix[op] for op in ops]
+    result = WorkerResult(role=role)
+
+    delay = start_at - time.time()
+    if delay > 0:
+        time.sleep(delay)
+    stop = time.perf_counter() + duration_s
+    while time.perf_counter() < stop:
+        op = rng.choices(ops, weights=weights)[0]
+        start = time.perf_counter()
+        try:
+            if op == "recall":
+                engine.recall(rng.choice(queries))
+            elif op == "store":
+                memory = next(new_memories)
+                meta = memory.metadata or {}
+                ids.append(engine.add(memory.text, type=meta["type"], entities=meta["entities"]).id)
+            elif op == "reinforce":
+                engine.reinforce(rng.choice(ids))
+            else:
+                raise ValueError(f"unknown operation: {op!r}")
+        except sqlite3.OperationalError as e:
+            result.errors[op] = result.errors.get(op, 0) + 1
+            if _is_locked(e):
+                result.locked[op] = result.locked.get(op, 0) + 1
+            continue
+        result.latencies_ms.setdefault(op, []).append((time.perf_counter() - start) * 1000)
+    engine.close()
+    return result
+
+
+def summarize(config: LoadConfig, workers: list[WorkerResult], elapsed_s: float) -> LoadResult:
+    """Merge per-worker results into per-operation statistics."""
+    result = LoadResult(config=config, elapsed_s=elapsed_s)
+    names = sorted(
+        {op for w in workers for op in (*w.latencies_ms, *w.errors)},
+        key=lambda op: OPERATIONS.index(op) if op in OPERATIONS else len(OPERATIONS),
+    )
+    for op in names:
+        latencies = [ms for w in workers for ms in w.latencies_ms.get(op, [])]
+        errors = sum(w.errors.get(op, 0) for w in workers)
+        locked = sum(w.locked.get(op, 0) for w in workers)
+        attempts = len(latencies) + errors
+        result.operations[op] = OperationStats(
+            count=len(latencies),
+            throughput=len(latencies) / elapsed_s if elapsed_s else 0.0,
+            latency_p50_ms=percentile(latencies, 50),
+            latency_p95_ms=percentile(latencies, 95),
+            latency_p99_ms=percentile(latencies, 99),
+            latency_max_ms=max(latencies, default=0.0),
+            errors=errors,
+            locked=locked,
+            locked_rate=locked / attempts if attempts else 0.0,
+        )
+    return result
+
+
+def run_load(
+    config: LoadConfig, db_path: str | None = None, verbose: bool = False
+) -> LoadResult:
+    """Run the load described by ``config``.
+
+    Uses ``db_path`` as is when given; otherwise seeds a temporary
+    database with ``config.seed_size`` synthetic memories.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if db_path is None:
+            db_path = os.path.join(tmp, "memories.db")
+            if verbose:
+                print(f"Seeding {config.seed_size:,} memories...")
+            prepare_database(db_path, config.seed_size, config.seed)
+
+        roles = [("reader", i, config.reader_mix) for i in range(config.readers)]
+        roles += [("writer", i, config.writer_mix) for i in range(config.writers)]
+        if not roles:
+            return LoadResult(config=config)
+        # Leave time for every worker to start and open its engine
+        start_at = time.time() + (0.5 if config.use_threads else 2.0)
+        if config.use_threads:
+            executor = ThreadPoolExecutor(max_workers=len(roles))
+        else:
+            executor = ProcessPoolExecutor(
+                max_workers=len(roles), mp_context=multiprocessing.get_context("spawn")
+            )
+        if verbose:
+            kind = "threads" if config.use_threads else "processes"
+            print(
+                f"Running {config.readers} readers and {config.writers} writers "
+                f"({kind}) for {config.duration_s:g}s..."
+            )
+        with executor:
+            futures = [
+                executor.submit(
+                    run_worker, db_path, role, i, mix, start_at, config.duration_s,
+                    config.busy_timeout_ms, config.seed_size, config.seed,
+                )
+                for role, i, mix in roles
+            ]
+            workers = [f.result() for f in futures]
+        return summarize(config, workers, config.duration_s)
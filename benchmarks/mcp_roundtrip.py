@@ -0,0 +1,397 @@
+"""End-to-end MCP tool calls through the stdio transport.
+
+Users feel memory latency as a whole ``memory_recall`` tool call:
+JSON-RPC framing on the pipes, FastMCP dispatch and argument validation,
+the engine's recall and ``format_recall_results``. This benchmark starts
+the real server (``openmem-engine serve`` by default) as a subprocess on
+a seeded temporary database and speaks newline-delimited JSON-RPC to it
+over stdin/stdout, as an MCP client does.
+
+It reports:
+
+- cold start: process spawn to the ``initialize`` reply, and to the first
+  successful ``memory_recall``, over several fresh server processes
+  (imports, engine open and the startup decay pass included)
+- per tool: round-trip latency percentiles and calls per second for a
+  weighted mix of store, recall, reinforce and link calls
+- the same recalls run in-process (engine plus formatting) afterwards,
+  so the protocol overhead is the difference between the two
+
+The server needs the ``mcp`` package; ``mcp_available`` tells whether it
+can be started from this interpreter.
+"""
+from __future__ import annotations
+
+import importlib.util
+import json
+import os
+import queue
+import random
+import re
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .load import prepare_database
+from .metrics import percentile
+from .scenarios.corpus import CorpusSpec, SyntheticCorpus
+
+DEFAULT_MIX = {
+    "memory_recall": 0.6,
+    "memory_store": 0.25,
+    "memory_reinforce": 0.1,
+    "memory_link": 0.05,
+}
+TOOLS = tuple(DEFAULT_MIX)
+
+DEFAULT_SEED_SIZE = 2000
+DEFAULT_CALLS = 300
+DEFAULT_COLD_STARTS = 3
+WARMUP_CALLS = 5
+PROTOCOL_VERSION = "2024-11-05"
+RESPONSE_TIMEOUT_S = 60.0
+
+_SRC = str(Path(__file__).resolve().parent.parent / "src")
+_STORED_ID = re.compile(r"^\[([^\]]+)\]", re.MULTILINE)
+
+
+def mcp_available() -> bool:
+    return importlib.util.find_spec("mcp") is not None
+
+
+def default_command() -> list[str]:
+    """``openmem-engine serve`` run from this checkout."""
+    return [sys.executable, "-m", "openmem.cli", "serve"]
+
+
+class McpServerError(RuntimeError):
+    """The server exited, timed out or answered with a JSON-RPC error."""
+
+
+@dataclass
+class ToolStats:
+    count: int = 0
+    errors: int = 0
+    calls_per_second: float = 0.0  # one client, back to back
+    latency_mean_ms: float = 0.0
+    latency_p50_ms: float = 0.0
+    latency_p95_ms: float = 0.0
+    latency_p99_ms: float = 0.0
+    latency_max_ms: float = 0.0
+
+    @classmethod
+    def from_latencies(cls, latencies_ms: list[float], errors: int = 0) -> ToolStats:
+        busy_s = sum(latencies_ms) / 1000
+        return cls(
+            count=len(latencies_ms),
+            errors=errors,
+            calls_per_second=len(latencies_ms) / busy_s if busy_s else 0.0,
+            latency_mean_ms=statistics.fmean(latencies_ms) if latencies_ms else 0.0,
+            latency_p50_ms=percentile(latencies_ms, 50),
+            latency_p95_ms=percentile(latencies_ms, 95),
+            latency_p99_ms=percentile(latencies_ms, 99),
+            latency_max_ms=max(latencies_ms, default=0.0),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "calls_per_second": round(self.calls_per_second, 1),
+            "latency_mean_ms": round(self.latency_mean_ms, 3),
+            "latency_p50_ms": round(self.latency_p50_ms, 3),
+            "latency_p95_ms": round(self.latency_p95_ms, 3),
+            "latency_p99_ms": round(self.latency_p99_ms, 3),
+            "latency_max_ms": round(self.latency_max_ms, 3),
+        }
+
+
+@dataclass
+class McpResult:
+    command: list[str]
+    seed_size: int
+    startup_ms: list[float] = field(default_factory=list)  # spawn -> initialize reply
+    first_call_ms: list[float] = field(default_factory=list)  # spawn -> first recall reply
+    elapsed_s: float = 0.0
+    tools: dict[str, ToolStats] = field(default_factory=dict)
+    direct_recall: ToolStats | None = None  # engine.recall + formatting, in-process
+
+    @property
+    def throughput(self) -> float:
+        calls = sum(s.count for s in self.tools.values())
+        return calls / self.elapsed_s if self.elapsed_s else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "command": self.command,
+            "seed_size": self.seed_size,
+            "startup_ms": [round(ms, 1) for ms in self.startup_ms],
+            "first_call_ms": [round(ms, 1) for ms in self.first_call_ms],
+            "elapsed_s": round(self.elapsed_s, 3),
+            "throughput": round(self.throughput, 1),
+            "tools": {name: stats.to_dict() for name, stats in self.tools.items()},
+            "direct_recall": self.direct_recall.to_dict() if self.direct_recall else None,
+        }
+
+
+class StdioClient:
+    """Minimal MCP client: newline-delimited JSON-RPC over a child's pipes."""
+
+    def __init__(self, command: list[str], env: dict[str, str]):
+        self.spawned_at = time.perf_counter()
+        self.proc = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+        )
+        self._next_id = 0
+        self._lines: queue.Queue[bytes | None] = queue.Queue()
+        self._stderr: list[bytes] = []
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+
+    def _read_stdout(self) -> None:
+        for line in self.proc.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def _read_stderr(self) -> None:
+        for line in self.proc.stderr:
+            self._stderr.append(line)
+
+    def _fail(self, message: str) -> McpServerError:
+        tail = b"".join(self._stderr[-20:]).decode(errors="replace").strip()
+        return McpServerError(f"{message}\n{tail}" if tail else message)
+
+    def _send(self, message: dict) -> None:
+        try:
+            self.proc.stdin.write(json.dumps(message).encode() + b"\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            raise self._fail("MCP server closed its stdin") from None
+
+    def request(self, method: str, params: dict | None = None) -> dict:
+        self._next_id += 1
+        request_id = self._next_id
+        self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}})
+        while True:
+            try:
+                line = self._lines.get(timeout=RESPONSE_TIMEOUT_S)
+            except queue.Empty:
+                raise self._fail(f"no reply to {method} within {RESPONSE_TIMEOUT_S:g}s") from None
+            if line is None:
+                raise self._fail(f"MCP server exited during {method}")
+            message = json.loads(line)
+            if message.get("id") != request_id:
+                continue  # notifications and log messages
+            if "error" in message:
+                raise McpServerError(f"{method}: {message['error'].get('message')}")
+            return message["result"]
+
+    def notify(self, method: str, params: dict | None = None) -> None:
+        self._send({"jsonrpc": "2.0", "method": method, "params": params or {}})
+
+    def initialize(self) -> dict:
+        result = self.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "openmem-benchmark", "version": "0"},
+        })
+        self.notify("notifications/initialized")
+        return result
+
+    def call_tool(self, name: str, arguments: dict) -> tuple[str, bool]:
+        """Text of the tool's reply and whether it reported an error."""
+        result = self.request("tools/call", {"name": name, "arguments": arguments})
+        text = "".join(c.get("text", "") for c in result.get("content", []))
+        return text, bool(result.get("isError"))
+
+    def close(self) -> None:
+        if self.proc.stdin and not self.proc.stdin.closed:
+            try:
+                self.proc.stdin.close()  # EOF ends the stdio transport
+            except OSError:
+                pass
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+def server_env(directory: str) -> dict[str, str]:
+    """Environment pointing a server at ``directory`` instead of ~/.openmem."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (_SRC, env.get("PYTHONPATH")) if p)
+    env.update({
+        "OPENMEM_DB": os.path.join(directory, "memories.db"),
+        "OPENMEM_ARCHIVE_DB": os.path.join(directory, "archive.db"),
+        "OPENMEM_ENTITIES": os.path.join(directory, "entities.txt"),
+        "OPENMEM_SLOWLOG": "off",
+        "OPENMEM_PROFILE": "",
+    })
+    return env
+
+
+def _ms_since(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
+
+
+def cold_start(command: list[str], env: dict[str, str], query: str) -> tuple[float, float]:
+    """Spawn a server; milliseconds to its initialize reply and to the
+    first successful ``memory_recall``."""
+    client = StdioClient(command, env)
+    try:
+        client.initialize()
+        startup_ms = _ms_since(client.spawned_at)
+        _, is_error = client.call_tool("memory_recall", {"query": query})
+        if is_error:
+            raise McpServerError("first memory_recall failed")
+        return startup_ms, _ms_since(client.spawned_at)
+    finally:
+        client.close()
+
+
+def _session_calls(
+    corpus: SyntheticCorpus, calls: int, mix: dict[str, float], seed: int
+):
+    """Tool names and argument factories, in call order."""
+    rng = random.Random(seed)
+    queries = [q.query for q in corpus.queries(max(1, min(calls, corpus.spec.size)))]
+    new_memories = SyntheticCorpus(CorpusSpec(
+        size=10**9, seed=f"{seed}-mcp", entity_count=corpus.spec.entities
+    )).memories()
+    names, weights = zip(*mix.items())
+    for i in range(calls):
+        name = rng.choices(names, weights)[0]
+        if name == "memory_recall":
+            yield name, lambda ids, q=queries[i % len(queries)]: {"query": q}
+        elif name == "memory_store":
+            memory = next(new_memories)
+            meta = memory.metadata or {}
+            yield name, lambda ids, m=memory, meta=meta: {
+                "text": m.text, "type": meta["type"], "entities": meta["entities"],
+            }
+        elif name == "memory_reinforce":
+            yield name, lambda ids, r=rng.random(): {"memory_id": ids[int(r * len(ids))]}
+        elif name == "memory_link":
+            yield name, lambda ids, r=(rng.random(), rng.random()): {
+                "source_id": ids[int(r[0] * len(ids))],
+                "target_id": ids[int(r[1] * len(ids))],
+                "rel_type": "mentions",
+            }
+        else:
+            raise ValueError(f"unsupported tool in mix: {name!r}")
+
+
+def _direct_recalls(env: dict[str, str], queries: list[str]) -> ToolStats:
+    """The recall tool's engine and formatting work, without the protocol.
+
+    The engine is configured from ``env`` the way the server configures
+    its own (archive tier, entity dictionary, no slow log), so the
+    difference to the tool-call latency is the protocol alone.
+    """
+    from openmem._formatting import format_recall_results
+    from openmem.engine import MemoryEngine
+    from openmem.entities import load_entity_dictionary
+
+    entities_path = env["OPENMEM_ENTITIES"]
+    engine = MemoryEngine(
+        db_path=env["OPENMEM_DB"],
+        archive_path=env["OPENMEM_ARCHIVE_DB"],
+        entity_dictionary=(
+            load_entity_dictionary(entities_path) if os.path.exists(entities_path) else None
+        ),
+    )
+    try:
+        for query in queries[:WARMUP_CALLS]:
+            format_recall_results(engine.recall(query, top_k=5, token_budget=2000))
+        latencies = []
+        for query in queries:
+            start = time.perf_counter()
+            format_recall_results(engine.recall(query, top_k=5, token_budget=2000))
+            latencies.append(_ms_since(start))
+    finally:
+        engine.close()
+    return ToolStats.from_latencies(latencies)
+
+
+def run_mcp_benchmark(
+    command: list[str] | None = None,
+    seed_size: int = DEFAULT_SEED_SIZE,
+    calls: int = DEFAULT_CALLS,
+    cold_starts: int = DEFAULT_COLD_STARTS,
+    mix: dict[str, float] | None = None,
+    seed: int = 0,
+    verbose: bool = False,
+) -> McpResult:
+    command = command or default_command()
+    result = McpResult(command=command, seed_size=seed_size)
+    corpus = SyntheticCorpus(CorpusSpec(size=seed_size, seed=seed))
+    first_query = next(iter(corpus.queries(1))).query
+
+    with tempfile.TemporaryDirectory(prefix="openmem-mcp-bench-") as tmp:
+        env = server_env(tmp)
+        db_path = env["OPENMEM_DB"]
+        if verbose:
+            print(f"Seeding {seed_size:,} memories...")
+        prepare_database(db_path, seed_size, seed)
+        conn = sqlite3.connect(db_path)
+        try:
+            ids = [row[0] for row in conn.execute("SELECT id FROM memories")]
+        finally:
+            conn.close()
+
+        for i in range(cold_starts):
+            startup_ms, first_ms = cold_start(command, env, first_query)
+            result.startup_ms.append(startup_ms)
+            result.first_call_ms.append(first_ms)
+            if verbose:
+                print(f"  cold start {i + 1}: initialize {startup_ms:.0f}ms, "
+                      f"first recall {first_ms:.0f}ms")
+
+        if verbose:
+            print(f"Running {calls} tool calls...")
+        client = StdioClient(command, env)
+        latencies: dict[str, list[float]] = {name: [] for name in TOOLS}
+        errors: dict[str, int] = {name: 0 for name in TOOLS}
+        recall_queries: list[str] = []
+        session = list(_session_calls(corpus, calls, mix or DEFAULT_MIX, seed))
+        try:
+            client.initialize()
+            for _ in range(WARMUP_CALLS):
+                client.call_tool("memory_recall", {"query": first_query})
+            started = time.perf_counter()
+            for name, make_args in session:
+                arguments = make_args(ids)
+                start = time.perf_counter()
+                text, is_error = client.call_tool(name, arguments)
+                elapsed = _ms_since(start)
+                if is_error:
+                    errors[name] += 1
+                    continue
+                latencies[name].append(elapsed)
+                if name == "memory_store" and (match := _STORED_ID.search(text)):
+                    ids.append(match.group(1))
+                elif name == "memory_recall":
+                    recall_queries.append(arguments["query"])
+            result.elapsed_s = time.perf_counter() - started
+        finally:
+            client.close()
+
+        result.tools = {
+            name: ToolStats.from_latencies(latencies[name], errors[name])
+            for name in TOOLS
+            if latencies[name] or errors[name]
+        }
+        if recall_queries:
+            result.direct_recall = _direct_recalls(env, recall_queries)
+    return result
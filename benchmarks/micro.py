@@ -0,0 +1,142 @@
+"""Micro-benchmark harness: warmup, repeated samples, confidence intervals.
+
+``measure`` times a callable with ``perf_counter_ns``: a few untimed warmup
+calls first (FTS planner caches, SQLite page cache, lazily built state),
+then ``repeat`` timed samples of ``number`` calls each. Arguments come from
+an optional ``setup`` callable that runs outside the timed region, so
+per-call bookkeeping never shows up in the numbers.
+
+With ``track_allocations`` a separate, untimed pass runs the callable under
+``tracemalloc`` (which slows Python code several-fold, so it never overlaps
+timing) and records the peak Python heap growth and the number of memory
+blocks still allocated after each call, its return value included.
+SQLite's own allocations happen in C and are not seen by ``tracemalloc``.
+"""
+from __future__ import annotations
+
+import math
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable
+
+DEFAULT_WARMUP = 5
+DEFAULT_REPEAT = 30
+ALLOCATION_CALLS = 5
+
+# Two-sided 95% Student t critical values by degrees of freedom
+_T95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+
+
+def t_critical_95(df: int) -> float:
+    if df < 1:
+        return math.inf
+    return _T95[df - 1] if df <= len(_T95) else 1.96
+
+
+@dataclass
+class MicroResult:
+    name: str
+    number: int
+    samples_ns: list[int] = field(default_factory=list)  # per call
+    peak_bytes: int | None = None
+    net_blocks: float | None = None
+
+    @property
+    def mean_ns(self) -> float:
+        return statistics.fmean(self.samples_ns)
+
+    @property
+    def stdev_ns(self) -> float:
+        return statistics.stdev(self.samples_ns) if len(self.samples_ns) > 1 else 0.0
+
+    @property
+    def median_ns(self) -> float:
+        return statistics.median(self.samples_ns)
+
+    @property
+    def ci95_ns(self) -> float:
+        """Half-width of the 95% confidence interval of the mean."""
+        n = len(self.samples_ns)
+        if n < 2:
+            return math.inf
+        return t_critical_95(n - 1) * self.stdev_ns / math.sqrt(n)
+
+    def percentile_ns(self, p: float) -> float:
+        ordered = sorted(self.samples_ns)
+        index = min(len(ordered) - 1, round(p / 100 * (len(ordered) - 1)))
+        return ordered[index]
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "samples": len(self.samples_ns),
+            "number": self.number,
+            "mean_ms": round(self.mean_ns / 1e6, 4),
+            "ci95_ms": round(self.ci95_ns / 1e6, 4),
+            "stdev_ms": round(self.stdev_ns / 1e6, 4),
+            "min_ms": round(min(self.samples_ns) / 1e6, 4),
+            "latency_p50_ms": round(self.median_ns / 1e6, 4),
+            "latency_p95_ms": round(self.percentile_ns(95) / 1e6, 4),
+            "peak_bytes": self.peak_bytes,
+            "net_blocks": self.net_blocks,
+        }
+
+
+def _allocations(fn: Callable, setup: Callable[[], tuple] | None) -> tuple[int, float]:
+    """Mean peak heap growth (bytes) and net new blocks per call."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        peaks, blocks = [], []
+        for _ in range(ALLOCATION_CALLS):
+            args = setup() if setup else ()
+            before = tracemalloc.take_snapshot()
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            result = fn(*args)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+            after = tracemalloc.take_snapshot()
+            blocks.append(sum(s.count_diff for s in after.compare_to(before, "filename")))
+            del result
+    finally:
+        if started:
+            tracemalloc.stop()
+    return round(statistics.fmean(peaks)), statistics.fmean(blocks)
+
+
+def measure(
+    name: str,
+    fn: Callable,
+    setup: Callable[[], tuple] | None = None,
+    warmup: int = DEFAULT_WARMUP,
+    repeat: int = DEFAULT_REPEAT,
+    number: int = 1,
+    track_allocations: bool = False,
+) -> MicroResult:
+    """Time ``fn(*setup())`` and return per-call samples.
+
+    ``setup`` runs once per sample, before the clock starts; the ``number``
+    calls of a sample share its arguments, so ``fn`` must not consume them.
+    """
+    for _ in range(warmup):
+        fn(*(setup() if setup else ()))
+
+    result = MicroResult(name=name, number=number)
+    clock = time.perf_counter_ns
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = clock()
+        for _ in range(number):
+            fn(*args)
+        result.samples_ns.append((clock() - start) // number)
+
+    if track_allocations:
+        result.peak_bytes, result.net_blocks = _allocations(fn, setup)
+    return result
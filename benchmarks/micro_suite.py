@@ -0,0 +1,139 @@
+"""Micro-benchmarks of the recall pipeline stages.
+
+One synthetic corpus is loaded into an in-memory engine, and each stage
+is timed in isolation on inputs precomputed from a fixed query set:
+
+- ``search_bm25``: the FTS5 MATCH for a query
+- ``spread_activation``: spreading from that query's normalized BM25 hits
+- ``compete``: scoring the activated, hydrated memories
+- ``detect_and_resolve_conflicts``: the conflict pass over the scored list
+
+Every sample takes the next query's inputs round-robin, prepared outside
+the timed region.
+"""
+from __future__ import annotations
+
+import itertools
+import time
+from dataclasses import dataclass, field
+
+from .micro import DEFAULT_REPEAT, DEFAULT_WARMUP, MicroResult, measure
+from .scenarios.corpus import CorpusSpec, SyntheticCorpus
+
+CASES = ("search_bm25", "spread_activation", "compete", "detect_and_resolve_conflicts")
+
+DEFAULT_SIZE = 5000
+DEFAULT_QUERY_COUNT = 20
+SEED_LIMIT = 40
+# One contradicts edge per this many memories, so the conflict pass has work
+CONTRADICTION_EVERY = 25
+
+
+@dataclass
+class QueryInputs:
+    query: str
+    seeds: dict[str, float] = field(default_factory=dict)
+    activations: dict[str, float] = field(default_factory=dict)
+    memories: dict = field(default_factory=dict)
+    scored: list = field(default_factory=list)
+
+
+@dataclass
+class MicroFixture:
+    engine: object
+    inputs: list[QueryInputs]
+    now: float
+
+
+def build_fixture(
+    size: int = DEFAULT_SIZE, queries: int = DEFAULT_QUERY_COUNT, seed: int = 0
+) -> MicroFixture:
+    from openmem.activation import spread_activation
+    from openmem.engine import MemoryEngine, _normalize_hits
+    from openmem.scoring import compete
+
+    corpus = SyntheticCorpus(CorpusSpec(size=size, seed=seed))
+    engine = MemoryEngine(db_path=":memory:")
+    ids: list[str] = []
+    for memory in corpus.memories():
+        meta = memory.metadata or {}
+        ids.append(engine.add(memory.text, type=meta["type"], entities=meta["entities"]).id)
+    for link in corpus.links():
+        engine.link(
+            ids[int(link.source_id.rsplit("_", 1)[1])],
+            ids[int(link.target_id.rsplit("_", 1)[1])],
+            rel_type=link.rel_type, weight=link.weight,
+        )
+    for i in range(0, size - 1, CONTRADICTION_EVERY):
+        engine.contradict(ids[i], ids[i + 1])
+
+    now = time.time()
+    inputs = []
+    for query_def in corpus.queries(queries):
+        item = QueryInputs(query=query_def.query)
+        item.seeds = _normalize_hits(engine.store.search_bm25(item.query, limit=SEED_LIMIT))
+        item.activations = spread_activation(
+            item.seeds,
+            engine.store,
+            max_hops=engine.max_hops,
+            decay_per_hop=engine.decay_per_hop,
+            entity_weight=engine.entity_weight,
+            max_entity_fan=engine.max_entity_fan,
+        )
+        item.memories = {
+            mid: mem
+            for mid in item.activations
+            if (mem := engine.store.get_memory(mid)) is not None
+        }
+        item.scored = compete(item.activations, item.memories, now=now)
+        inputs.append(item)
+    return MicroFixture(engine=engine, inputs=inputs, now=now)
+
+
+def run_micro_suite(
+    fixture: MicroFixture,
+    cases: list[str] | None = None,
+    warmup: int = DEFAULT_WARMUP,
+    repeat: int = DEFAULT_REPEAT,
+    track_allocations: bool = False,
+) -> list[MicroResult]:
+    from openmem.activation import spread_activation
+    from openmem.conflict import detect_and_resolve_conflicts
+    from openmem.scoring import compete
+
+    engine = fixture.engine
+    store = engine.store
+    now = fixture.now
+
+    def rotation():
+        cycle = itertools.cycle(fixture.inputs)
+        return lambda: (next(cycle),)
+
+    bodies = {
+        "search_bm25": lambda item: store.search_bm25(item.query, limit=SEED_LIMIT),
+        "spread_activation": lambda item: spread_activation(
+            item.seeds,
+            store,
+            max_hops=engine.max_hops,
+            decay_per_hop=engine.decay_per_hop,
+            entity_weight=engine.entity_weight,
+            max_entity_fan=engine.max_entity_fan,
+        ),
+        "compete": lambda item: compete(item.activations, item.memories, now=now),
+        "detect_and_resolve_conflicts": lambda item: detect_and_resolve_conflicts(
+            item.scored, store, now=now
+        ),
+    }
+    results = []
+    for name in cases or CASES:
+        if name not in bodies:
+            raise ValueError(f"unknown micro-benchmark: {name!r}")
+        results.append(measure(
+            name,
+            bodies[name],
+            setup=rotation(),
+            warmup=warmup,
+            repeat=repeat,
+            track_allocations=track_allocations,
+        ))
+    return results
@@ -0,0 +1,199 @@
+"""Persisted benchmark results and regression checks against a baseline.
+
+A results document is JSON::
+
+    {"metadata": {...}, "scenarios": {adapter: {scenario: {metric: value}}},
+     "scale": [{"size": ..., ...}, ...], "micro": [{"name": ..., ...}, ...],
+     "topology": [{"topology": ..., "param": ..., "spread": {...}, ...}, ...],
+     "mcp": {"startup_ms": [...], "tools": {tool: {metric: value}}, ...}}
+
+``metadata`` records where the numbers came from (git SHA, Python and
+SQLite versions, machine, scenario clock). ``compare`` lines two documents up metric by
+metric; latency may grow by a relative tolerance (plus a small absolute
+slack, so sub-millisecond noise is not a regression) and quality metrics
+may drop by an absolute tolerance.
+"""
+from __future__ import annotations
+
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from .runner import SCENARIO_CLOCK
+
+# Lower is better; compared relative to the baseline
+LATENCY_METRICS = ("latency_p50_ms", "latency_p95_ms", "latency_p99_ms")
+# Higher is better; compared in absolute terms
+QUALITY_METRICS = ("precision_at_k", "recall_at_k", "ndcg_at_k", "mrr", "hit_rate_at_10")
+
+DEFAULT_LATENCY_TOLERANCE = 0.25
+DEFAULT_LATENCY_SLACK_MS = 1.0
+DEFAULT_QUALITY_TOLERANCE = 0.02
+
+_REPO = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class Tolerances:
+    latency: float = DEFAULT_LATENCY_TOLERANCE
+    latency_slack_ms: float = DEFAULT_LATENCY_SLACK_MS
+    quality: float = DEFAULT_QUALITY_TOLERANCE
+
+
+@dataclass
+class Comparison:
+    adapter: str
+    scenario: str
+    metric: str
+    baseline: float
+    current: float
+    regression: bool
+
+    @property
+    def change(self) -> float:
+        """Relative change for latency, absolute for quality."""
+        if self.metric in LATENCY_METRICS:
+            return (self.current - self.baseline) / self.baseline if self.baseline else 0.0
+        return self.current - self.baseline
+
+
+def _git(*args: str) -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", *args], cwd=_REPO, capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() if out.returncode == 0 else None
+
+
+def run_metadata() -> dict:
+    """Where and from what code a set of results was produced."""
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "timestamp": time.time(),
+        "git_sha": _git("rev-parse", "HEAD"),
+        "git_dirty": bool(status) if status is not None else None,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "scenario_clock": SCENARIO_CLOCK,
+    }
+
+
+def scenario_results_to_dict(results: list) -> dict:
+    """``BenchmarkResult`` list as ``{adapter: {scenario: {metric: value}}}``."""
+    output = {}
+    for result in results:
+        adapter_data = {}
+        for name, metrics in result.scenario_results.items():
+            if metrics.skipped:
+                adapter_data[name] = {"skipped": True, "reason": metrics.skip_reason}
+            else:
+                adapter_data[name] = {
+                    "precision_at_k": round(metrics.avg_precision, 4),
+                    "recall_at_k": round(metrics.avg_recall, 4),
+                    "ndcg_at_k": round(metrics.avg_ndcg, 4),
+                    "mrr": round(metrics.avg_mrr, 4),
+                    "latency_p50_ms": round(metrics.latency_p50_ms, 2),
+                    "latency_p95_ms": round(metrics.latency_p95_ms, 2),
+                    "latency_p99_ms": round(metrics.latency_p99_ms, 2),
+                }
+        output[result.adapter_name] = adapter_data
+    return output
+
+
+def results_document(
+    scenario_results: list | None = None,
+    scale_results: list | None = None,
+    micro_results: list | None = None,
+    topology_results: list | None = None,
+    mcp_result=None,
+) -> dict:
+    document: dict = {"metadata": run_metadata()}
+    if scenario_results is not None:
+        document["scenarios"] = scenario_results_to_dict(scenario_results)
+    if scale_results is not None:
+        document["scale"] = [r.to_dict() for r in scale_results]
+    if micro_results is not None:
+        document["micro"] = [r.to_dict() for r in micro_results]
+    if topology_results is not None:
+        document["topology"] = [r.to_dict() for r in topology_results]
+    if mcp_result is not None:
+        document["mcp"] = mcp_result.to_dict()
+    return document
+
+
+def save_results(path: str, document: dict) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+        f.write("\n")
+
+
+def load_results(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _flatten(document: dict) -> dict[tuple[str, str], dict]:
+    """``(adapter, scenario) -> metrics`` for every comparable entry."""
+    flat = {}
+    for adapter, scenarios in document.get("scenarios", {}).items():
+        for scenario, metrics in scenarios.items():
+            if not metrics.get("skipped"):
+                flat[(adapter, scenario)] = metrics
+    for entry in document.get("scale", []):
+        flat[("scale", f"scale_{entry['size']}")] = entry
+    for entry in document.get("micro", []):
+        flat[("micro", entry["name"])] = entry
+    for entry in document.get("topology", []):
+        for stage in ("spread", "conflicts"):
+            if entry.get(stage):
+                flat[("topology", f"{entry['topology']}_{entry['param']}:{stage}")] = entry[stage]
+    for tool, metrics in document.get("mcp", {}).get("tools", {}).items():
+        flat[("mcp", tool)] = metrics
+    return flat
+
+
+def compare(
+    baseline: dict, current: dict, tolerances: Tolerances | None = None
+) -> list[Comparison]:
+    """Compare every metric present in both documents.
+
+    Entries only in one document are ignored: adding or dropping a
+    scenario is not a regression.
+    """
+    tolerances = tolerances or Tolerances()
+    base = _flatten(baseline)
+    comparisons = []
+    for key, metrics in _flatten(current).items():
+        if key not in base:
+            continue
+        for metric in LATENCY_METRICS + QUALITY_METRICS:
+            old, new = base[key].get(metric), metrics.get(metric)
+            if old is None or new is None:
+                continue
+            if metric in LATENCY_METRICS:
+                limit = old * (1 + tolerances.latency) + tolerances.latency_slack_ms
+                regression = new > limit
+            else:
+                regression = new < old - tolerances.quality
+            comparisons.append(Comparison(key[0], key[1], metric, old, new, regression))
+    return comparisons
+
+
+def regressions(comparisons: list[Comparison]) -> list[Comparison]:
+    return [c for c in comparisons if c.regression]
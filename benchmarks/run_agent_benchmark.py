@@ -6,6 +6,8 @@ Usage:
     python -m benchmarks.run_agent_benchmark --adapters openmem chromadb
     python -m benchmarks.run_agent_benchmark --scenarios fact_retrieval needle_retrieval
     python -m benchmarks.run_agent_benchmark --model gpt-4o --verbose --detail
+    python -m benchmarks.run_agent_benchmark --record cassettes/ --adapters openmem
+    python -m benchmarks.run_agent_benchmark --replay cassettes/
 """
 from __future__ import annotations
 
@@ -14,9 +16,12 @@ import json
 import sys
 from pathlib import Path
 
-from dotenv import load_dotenv
-
-load_dotenv(Path(__file__).parent / ".env")
+try:
+    from dotenv import load_dotenv
+except ImportError:  # only needed for live runs with a .env file
+    pass
+else:
+    load_dotenv(Path(__file__).parent / ".env")
 
 from .adapters import ADAPTER_REGISTRY
 from .agent.display import print_agent_detail, print_agent_results, print_agent_summary
@@ -58,6 +63,21 @@ def build_parser() -> argparse.ArgumentParser:
         default=10,
         help="Max agent turns per scenario (default: 10)",
     )
+    cassettes = parser.add_mutually_exclusive_group()
+    cassettes.add_argument(
+        "--record",
+        metavar="DIR",
+        default=None,
+        help="Record OpenAI responses to cassettes in DIR, one per scenario; "
+        "the first adapter records, the others replay",
+    )
+    cassettes.add_argument(
+        "--replay",
+        metavar="DIR",
+        default=None,
+        help="Replay cassettes from DIR instead of calling OpenAI (no network); "
+        "quality scores are those of the recording run",
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -117,6 +137,8 @@ def main(argv: list[str] | None = None) -> None:
         harness=harness,
         judge_model=args.judge_model,
         verbose=args.verbose,
+        cassette_dir=args.record or args.replay,
+        cassette_mode="record" if args.record else "replay",
     )
 
     # Output
@@ -145,6 +167,7 @@ def _results_to_dict(results: list) -> dict:
                     "overall": round(sr.judge_result.overall, 3),
                     "recall_calls": sr.agent_result.recall_calls,
                     "memory_latency_ms": round(sum(sr.agent_result.recall_latencies_ms), 1),
+                    "recall_latencies_ms": [round(ms, 3) for ms in sr.agent_result.recall_latencies_ms],
                     "total_latency_ms": round(sr.agent_result.total_latency_ms, 1),
                     "key_facts_found": sr.judge_result.key_facts_found,
                     "key_facts_missing": sr.judge_result.key_facts_missing,
@@ -6,6 +6,12 @@ Usage:
     python -m benchmarks.run_benchmark --adapters openmem chromadb
     python -m benchmarks.run_benchmark --scenarios basic_recall graph_boosted
     python -m benchmarks.run_benchmark --verbose --json
+    python -m benchmarks.run_benchmark --storage memory file --cache warm cold
+    python -m benchmarks.run_benchmark --jobs 4 --latency pinned
+    python -m benchmarks.run_benchmark --repeat 5 --snapshot-dir .bench-snapshots
+    python -m benchmarks.run_benchmark --scale 10000 100000
+    python -m benchmarks.run_benchmark --output results.json --baseline baseline.json
+    python -m benchmarks.run_benchmark --compare baseline.json results.json
 """
 from __future__ import annotations
 
@@ -14,9 +20,30 @@ import json
 import sys
 
 from .adapters import ADAPTER_REGISTRY
-from .display import print_feature_matrix, print_results_table, print_summary
-from .runner import run_all
+from .adapters.storage import CACHE_MODES, STORAGE_MODES
+from .display import (
+    print_comparison,
+    print_feature_matrix,
+    print_results_table,
+    print_scale_table,
+    print_summary,
+)
+from .results import (
+    DEFAULT_LATENCY_SLACK_MS,
+    DEFAULT_LATENCY_TOLERANCE,
+    DEFAULT_QUALITY_TOLERANCE,
+    Tolerances,
+    compare,
+    load_results,
+    regressions,
+    results_document,
+    save_results,
+    scenario_results_to_dict,
+)
+from .runner import LATENCY_MODES, run_all
+from .scale import DEFAULT_QUERIES, DEFAULT_SIZES, run_scales
 from .scenarios.scenarios import all_scenarios
+from .snapshots import SnapshotCache
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -53,20 +80,157 @@ def build_parser() -> argparse.ArgumentParser:
         default=1,
         help="Repeat each scenario N times (averages latency)",
     )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Run (adapter, scenario) pairs on N worker processes (default: 1, serial)",
+    )
+    parser.add_argument(
+        "--latency",
+        choices=list(LATENCY_MODES),
+        default="serial",
+        help="With --jobs: re-time every pair serially after the parallel run, "
+        "or pin each worker to its own CPU and keep its timings (default: serial)",
+    )
+    snapshots = parser.add_mutually_exclusive_group()
+    snapshots.add_argument(
+        "--snapshot-dir",
+        default=None,
+        metavar="DIR",
+        help="Keep populated scenario databases in DIR and reuse them across "
+        "invocations (default: a temporary directory for this run)",
+    )
+    snapshots.add_argument(
+        "--no-snapshots",
+        action="store_true",
+        help="Populate every scenario from scratch on every run",
+    )
+    parser.add_argument(
+        "--storage",
+        nargs="+",
+        choices=list(STORAGE_MODES),
+        default=["memory"],
+        help="Database locations for the OpenMem-based adapters: in-memory "
+        "and/or a file in a temp dir (default: memory)",
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="+",
+        choices=list(CACHE_MODES),
+        default=["warm"],
+        help="Cache states for file storage; cold reopens the engine and evicts "
+        "the database from the OS page cache before every query (default: warm)",
+    )
+    parser.add_argument(
+        "--scale",
+        nargs="*",
+        type=int,
+        default=None,
+        metavar="N",
+        help="Run the scale benchmark on synthetic corpora of N memories "
+        f"instead of the scenarios (default sizes: {' '.join(map(str, DEFAULT_SIZES))})",
+    )
+    parser.add_argument(
+        "--scale-queries",
+        type=int,
+        default=DEFAULT_QUERIES,
+        help="Timed recalls per corpus size in --scale mode",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed for the synthetic corpus in --scale mode",
+    )
+    parser.add_argument(
+        "--output", "-o",
+        default=None,
+        help="Write results with run metadata (git SHA, versions, machine) to this JSON file",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=None,
+        help="Compare results against this results file; exit 1 on regression",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASELINE", "CURRENT"),
+        default=None,
+        help="Compare two results files without running anything; exit 1 on regression",
+    )
+    parser.add_argument(
+        "--latency-tolerance",
+        type=float,
+        default=DEFAULT_LATENCY_TOLERANCE,
+        help="Allowed relative latency increase before flagging a regression "
+        f"(default: {DEFAULT_LATENCY_TOLERANCE})",
+    )
+    parser.add_argument(
+        "--latency-slack-ms",
+        type=float,
+        default=DEFAULT_LATENCY_SLACK_MS,
+        help="Absolute latency increase always allowed, for noise on fast "
+        f"operations (default: {DEFAULT_LATENCY_SLACK_MS})",
+    )
+    parser.add_argument(
+        "--quality-tolerance",
+        type=float,
+        default=DEFAULT_QUALITY_TOLERANCE,
+        help="Allowed absolute drop in precision, recall, NDCG, MRR or hit rate "
+        f"(default: {DEFAULT_QUALITY_TOLERANCE})",
+    )
     return parser
 
 
+def _check(args, baseline: dict, current: dict) -> None:
+    """Print the comparison and exit 1 if anything regressed."""
+    tolerances = Tolerances(
+        latency=args.latency_tolerance,
+        latency_slack_ms=args.latency_slack_ms,
+        quality=args.quality_tolerance,
+    )
+    comparisons = compare(baseline, current, tolerances)
+    print_comparison(comparisons, baseline.get("metadata", {}), current.get("metadata", {}))
+    if regressions(comparisons):
+        sys.exit(1)
+
+
 def main(argv: list[str] | None = None) -> None:
     parser = build_parser()
     args = parser.parse_args(argv)
 
+    if args.compare:
+        _check(args, load_results(args.compare[0]), load_results(args.compare[1]))
+        return
+
+    if args.scale is not None:
+        scale_results = run_scales(
+            args.scale or list(DEFAULT_SIZES),
+            queries=args.scale_queries,
+            seed=args.seed,
+            verbose=args.verbose,
+        )
+        if args.json_output:
+            print(json.dumps([r.to_dict() for r in scale_results], indent=2))
+        else:
+            print_scale_table(scale_results)
+        _finish(args, results_document(scale_results=scale_results))
+        return
+
     # Build adapters
     adapter_names = args.adapters or list(ADAPTER_REGISTRY.keys())
     adapters = []
     for name in adapter_names:
         try:
             adapter_cls = ADAPTER_REGISTRY[name]
-            adapters.append(adapter_cls())
+            if not getattr(adapter_cls, "supports_storage", False):
+                adapters.append(adapter_cls())
+                continue
+            for storage in args.storage:
+                for cache in args.cache if storage == "file" else ["warm"]:
+                    adapters.append(adapter_cls(storage=storage, cache=cache))
         except (ImportError, KeyError) as e:
             print(f"Warning: Skipping {name}: {e}", file=sys.stderr)
 
@@ -83,11 +247,23 @@ def main(argv: list[str] | None = None) -> None:
             print("Error: No matching scenarios found.", file=sys.stderr)
             sys.exit(1)
 
-    # Run benchmarks
+    # Run benchmarks; populated scenarios are snapshotted and cloned
+    snapshots = None if args.no_snapshots else SnapshotCache(args.snapshot_dir)
     all_results = []
-    for _ in range(args.repeat):
-        results = run_all(adapters, scenarios, verbose=args.verbose)
-        all_results.append(results)
+    try:
+        for _ in range(args.repeat):
+            results = run_all(
+                adapters,
+                scenarios,
+                verbose=args.verbose,
+                jobs=args.jobs,
+                latency=args.latency,
+                snapshots=snapshots,
+            )
+            all_results.append(results)
+    finally:
+        if snapshots is not None:
+            snapshots.close()
 
     final_results = all_results[0]
 
@@ -111,34 +287,21 @@ def main(argv: list[str] | None = None) -> None:
 
     # Output
     if args.json_output:
-        output = _results_to_dict(final_results)
+        output = scenario_results_to_dict(final_results)
         print(json.dumps(output, indent=2))
     else:
         scenario_names = [s.name for s in scenarios]
         print_results_table(final_results, scenario_names)
         print_feature_matrix(adapters)
         print_summary(final_results)
+    _finish(args, results_document(scenario_results=final_results))
 
 
-def _results_to_dict(results: list) -> dict:
-    output = {}
-    for result in results:
-        adapter_data = {}
-        for name, metrics in result.scenario_results.items():
-            if metrics.skipped:
-                adapter_data[name] = {"skipped": True, "reason": metrics.skip_reason}
-            else:
-                adapter_data[name] = {
-                    "precision_at_k": round(metrics.avg_precision, 4),
-                    "recall_at_k": round(metrics.avg_recall, 4),
-                    "ndcg_at_k": round(metrics.avg_ndcg, 4),
-                    "mrr": round(metrics.avg_mrr, 4),
-                    "latency_p50_ms": round(metrics.latency_p50_ms, 2),
-                    "latency_p95_ms": round(metrics.latency_p95_ms, 2),
-                    "latency_p99_ms": round(metrics.latency_p99_ms, 2),
-                }
-        output[result.adapter_name] = adapter_data
-    return output
+def _finish(args, document: dict) -> None:
+    if args.output:
+        save_results(args.output, document)
+    if args.baseline:
+        _check(args, load_results(args.baseline), document)
 
 
 if __name__ == "__main__":
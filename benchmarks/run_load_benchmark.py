@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""CLI entry point for the concurrent load benchmark.
+
+Usage:
+    python -m benchmarks.run_load_benchmark
+    python -m benchmarks.run_load_benchmark --readers 8 --writers 2 --duration 30
+    python -m benchmarks.run_load_benchmark --busy-timeout-ms 100 --threads
+    python -m benchmarks.run_load_benchmark --db ~/.openmem/copy-of-memories.db --json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import asdict
+
+from .display import print_load_results
+from .load import DEFAULT_BUSY_TIMEOUT_MS, DEFAULT_SEED_SIZE, LoadConfig, run_load
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Concurrent readers and writers against one OpenMem database file",
+    )
+    parser.add_argument("--readers", type=int, default=4, help="Reader workers (default: 4)")
+    parser.add_argument("--writers", type=int, default=2, help="Writer workers (default: 2)")
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="Seconds of load per run (default: 10)",
+    )
+    parser.add_argument(
+        "--seed-size",
+        type=int,
+        default=DEFAULT_SEED_SIZE,
+        help=f"Memories in the generated database (default: {DEFAULT_SEED_SIZE})",
+    )
+    parser.add_argument(
+        "--busy-timeout-ms",
+        type=int,
+        default=DEFAULT_BUSY_TIMEOUT_MS,
+        help=f"SQLite busy timeout per worker (default: {DEFAULT_BUSY_TIMEOUT_MS})",
+    )
+    parser.add_argument(
+        "--threads",
+        action="store_true",
+        help="Run workers as threads of one process instead of processes",
+    )
+    parser.add_argument(
+        "--db",
+        default=None,
+        help="Load an existing database instead of generating one (it is written to)",
+    )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Print progress",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output results as JSON",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    config = LoadConfig(
+        readers=args.readers,
+        writers=args.writers,
+        duration_s=args.duration,
+        seed_size=args.seed_size,
+        busy_timeout_ms=args.busy_timeout_ms,
+        use_threads=args.threads,
+    )
+    result = run_load(config, db_path=args.db, verbose=args.verbose)
+    if args.json_output:
+        print(json.dumps({
+            "config": asdict(result.config),
+            "elapsed_s": result.elapsed_s,
+            "operations": {op: asdict(s) for op, s in result.operations.items()},
+        }, indent=2))
+    else:
+        print_load_results(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""CLI entry point for the MCP stdio round-trip benchmark.
+
+Usage:
+    python -m benchmarks.run_mcp_benchmark
+    python -m benchmarks.run_mcp_benchmark --calls 1000 --seed-size 10000
+    python -m benchmarks.run_mcp_benchmark --command uvx openmem-engine serve
+    python -m benchmarks.run_mcp_benchmark --cold-starts 10 --output mcp.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+from .display import print_mcp_results
+from .mcp_roundtrip import (
+    DEFAULT_CALLS,
+    DEFAULT_COLD_STARTS,
+    DEFAULT_SEED_SIZE,
+    McpServerError,
+    default_command,
+    mcp_available,
+    run_mcp_benchmark,
+)
+from .results import results_document, save_results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Tool-call round trips to the OpenMem MCP server over stdio",
+    )
+    parser.add_argument(
+        "--calls",
+        type=int,
+        default=DEFAULT_CALLS,
+        help=f"Tool calls in the timed session (default: {DEFAULT_CALLS})",
+    )
+    parser.add_argument(
+        "--seed-size",
+        type=int,
+        default=DEFAULT_SEED_SIZE,
+        help=f"Memories in the generated database (default: {DEFAULT_SEED_SIZE})",
+    )
+    parser.add_argument(
+        "--cold-starts",
+        type=int,
+        default=DEFAULT_COLD_STARTS,
+        help=f"Fresh server processes to time to first recall (default: {DEFAULT_COLD_STARTS})",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Workload seed (default: 0)")
+    parser.add_argument(
+        "--command",
+        nargs=argparse.REMAINDER,
+        default=None,
+        help="Server command, as the rest of the line "
+        "(default: this interpreter running 'openmem-engine serve')",
+    )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Print progress",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output results as JSON",
+    )
+    parser.add_argument(
+        "--output", "-o",
+        default=None,
+        help="Write results with run metadata to this JSON file "
+        "(compare with run_benchmark --compare)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    if not args.command and not mcp_available():
+        print("The MCP server needs the 'mcp' package: pip install mcp", file=sys.stderr)
+        sys.exit(1)
+    try:
+        result = run_mcp_benchmark(
+            command=args.command or default_command(),
+            seed_size=args.seed_size,
+            calls=args.calls,
+            cold_starts=args.cold_starts,
+            seed=args.seed,
+            verbose=args.verbose,
+        )
+    except McpServerError as e:
+        print(f"MCP server error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.json_output:
+        print(json.dumps(result.to_dict(), indent=2))
+    else:
+        print_mcp_results(result)
+    if args.output:
+        save_results(args.output, results_document(mcp_result=result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""CLI entry point for micro-benchmarks of the recall pipeline stages.
+
+Usage:
+    python -m benchmarks.run_micro_benchmark
+    python -m benchmarks.run_micro_benchmark --cases search_bm25 compete --repeat 100
+    python -m benchmarks.run_micro_benchmark --size 20000 --allocations
+    python -m benchmarks.run_micro_benchmark --output micro.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+
+from .display import print_micro_results
+from .micro import DEFAULT_REPEAT, DEFAULT_WARMUP
+from .micro_suite import CASES, DEFAULT_SIZE, build_fixture, run_micro_suite
+from .results import results_document, save_results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Time individual recall stages with warmup and repeated samples",
+    )
+    parser.add_argument(
+        "--cases",
+        nargs="+",
+        choices=list(CASES),
+        default=None,
+        help="Which stages to time (default: all)",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=DEFAULT_SIZE,
+        help=f"Memories in the synthetic corpus (default: {DEFAULT_SIZE})",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=DEFAULT_WARMUP,
+        help=f"Untimed calls before sampling (default: {DEFAULT_WARMUP})",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Timed samples per stage (default: {DEFAULT_REPEAT})",
+    )
+    parser.add_argument(
+        "--allocations",
+        action="store_true",
+        help="Also measure Python heap peak and retained blocks per call (tracemalloc)",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output results as JSON",
+    )
+    parser.add_argument(
+        "--output", "-o",
+        default=None,
+        help="Write results with run metadata to this JSON file "
+        "(compare with run_benchmark --compare)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    fixture = build_fixture(args.size)
+    results = run_micro_suite(
+        fixture,
+        cases=args.cases,
+        warmup=args.warmup,
+        repeat=args.repeat,
+        track_allocations=args.allocations,
+    )
+    if args.json_output:
+        print(json.dumps([r.to_dict() for r in results], indent=2))
+    else:
+        print_micro_results(results, args.size)
+    if args.output:
+        save_results(args.output, results_document(micro_results=results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""CLI entry point for the adversarial graph-topology benchmark.
+
+Usage:
+    python -m benchmarks.run_topology_benchmark
+    python -m benchmarks.run_topology_benchmark --hub 100 1000 --chain --clique 50
+    python -m benchmarks.run_topology_benchmark --max-hops 3 --output topologies.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+
+from .display import print_topology_results
+from .results import results_document, save_results
+from .topologies import DEFAULT_PARAMS, DEFAULT_REPEAT, TOPOLOGIES, run_topologies
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Spreading activation and conflict resolution on hub, chain "
+        "and contradiction-clique graphs",
+    )
+    for topology, label in zip(TOPOLOGIES, ("hub degrees", "chain depths", "clique sizes")):
+        defaults = " ".join(map(str, DEFAULT_PARAMS[topology]))
+        parser.add_argument(
+            f"--{topology}",
+            nargs="*",
+            type=int,
+            default=None,
+            metavar="N",
+            help=f"{label.capitalize()} to run; bare flag skips it "
+            f"(default: {defaults})",
+        )
+    parser.add_argument(
+        "--max-hops",
+        type=int,
+        default=2,
+        help="Spreading depth (default: 2, the engine default)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help=f"Timed samples per measurement (default: {DEFAULT_REPEAT})",
+    )
+    parser.add_argument(
+        "--no-allocations",
+        action="store_false",
+        dest="allocations",
+        help="Skip the tracemalloc pass",
+    )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Print progress",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        dest="json_output",
+        help="Output results as JSON",
+    )
+    parser.add_argument(
+        "--output", "-o",
+        default=None,
+        help="Write results with run metadata to this JSON file "
+        "(compare with run_benchmark --compare)",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    params = {}
+    for topology in TOPOLOGIES:
+        chosen = getattr(args, topology)
+        params[topology] = list(DEFAULT_PARAMS[topology]) if chosen is None else chosen
+    results = run_topologies(
+        params,
+        max_hops=args.max_hops,
+        repeat=args.repeat,
+        track_allocations=args.allocations,
+        verbose=args.verbose,
+    )
+    if args.json_output:
+        print(json.dumps([r.to_dict() for r in results], indent=2))
+    else:
+        print_topology_results(results)
+    if args.output:
+        save_results(args.output, results_document(topology_results=results))
+
+
+if __name__ == "__main__":
+    main()
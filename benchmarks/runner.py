@@ -1,10 +1,40 @@
+"""Runs scenarios against adapters and collects their metrics.
+
+``run_all`` is serial by default. With ``jobs > 1`` the (adapter, scenario)
+pairs are sharded across a pool of spawned processes; every scenario builds
+its own store, so the pairs are independent. Ranking quality does not
+depend on timing and is taken from that parallel pass. Latency is not
+trusted there, because workers compete for cores and caches:
+
+- ``latency="serial"`` re-runs every pair one at a time afterwards and
+  takes the latencies from that pass only.
+- ``latency="pinned"`` pins each worker to its own CPU (Linux only, at
+  most one worker per available CPU) and keeps the parallel latencies.
+  Caches and memory bandwidth are still shared.
+"""
 from __future__ import annotations
 
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 
 from .adapters.base import MemoryAdapter
 from .metrics import ScenarioMetrics, aggregate_query_metrics, evaluate_query
 from .scenarios.scenarios import Scenario
+from .snapshots import SnapshotCache
+
+LATENCY_MODES = ("serial", "pinned")
+
+# Logical spacing between a scenario's memories, in storage order
+STORE_INTERVAL_S = 1.0
+
+# How scenario memories are timestamped, recorded in results metadata.
+# Baselines without it stamped them with the wall clock at store time;
+# against those, basic_recall NDCG drops from 0.7468 to 0.7314 for both
+# OpenMem and BM25-only with no change in ranking logic.
+SCENARIO_CLOCK = "logical"
 
 
 @dataclass
@@ -24,9 +54,19 @@ def _should_skip(adapter: MemoryAdapter, scenario: Scenario) -> str | None:
     return None
 
 
-def _apply_temporal_offset(adapter: MemoryAdapter, memory_def, age_days: int) -> None:
-    """Backdate memory timestamps for adapters that support it."""
-    if age_days <= 0:
+def _apply_temporal_offset(
+    adapter: MemoryAdapter, memory_def, age_days: int, base: float | None = None
+) -> None:
+    """Backdate memory timestamps for adapters that support it.
+
+    With ``base``, the memory is stamped ``base`` minus its age: callers
+    pass a logical clock so a scenario's memories are a fixed interval
+    apart in storage order, rather than however many microseconds apart
+    they happened to be stored. Strength is min-max normalized in
+    ``compete``, which would otherwise turn that jitter into rank changes
+    and make ranking quality depend on machine load.
+    """
+    if age_days <= 0 and base is None:
         return
 
     from .adapters.bm25_only_adapter import BM25OnlyAdapter
@@ -35,53 +75,84 @@ def _apply_temporal_offset(adapter: MemoryAdapter, memory_def, age_days: int) ->
     if isinstance(adapter, (OpenMemAdapter, BM25OnlyAdapter)):
         internal_id = adapter._id_map.get(memory_def.id)
         if internal_id and adapter._engine:
-            mem = adapter._engine.store.get_memory(internal_id)
+            store = adapter._engine.store
+            mem = store.get_memory(internal_id)
             if mem:
-                offset = age_days * 86400
-                mem.created_at -= offset
-                mem.updated_at -= offset
-                adapter._engine.store.update_memory(mem)
+                created = (mem.created_at if base is None else base) - max(age_days, 0) * 86400
+                # update_memory() does not write created_at
+                store.conn.execute(
+                    "UPDATE memories SET created_at = ?, updated_at = ? WHERE id = ?",
+                    (created, created, internal_id),
+                )
+                store.conn.commit()
+
+
+def _populate(adapter: MemoryAdapter, scenario: Scenario) -> None:
+    """Store the scenario's memories, links and operations."""
+    # Store all memories
+    for mem_def in scenario.memories:
+        adapter.store(mem_def.id, mem_def.text, mem_def.metadata)
+
+    # Apply temporal offsets on a logical clock, STORE_INTERVAL_S apart
+    start = time.time() - len(scenario.memories) * STORE_INTERVAL_S
+    for i, mem_def in enumerate(scenario.memories):
+        age_days = (mem_def.metadata or {}).get("age_days", 0)
+        _apply_temporal_offset(adapter, mem_def, age_days, start + i * STORE_INTERVAL_S)
+
+    # Create links
+    for link_def in scenario.links:
+        adapter.link(
+            link_def.source_id, link_def.target_id,
+            link_def.rel_type, link_def.weight,
+        )
 
+    # Apply operations
+    for op_def in scenario.operations:
+        if op_def.op == "supersede":
+            adapter.supersede(**op_def.args)
+        elif op_def.op == "contradict":
+            adapter.contradict(**op_def.args)
+        elif op_def.op == "reinforce":
+            adapter.reinforce(**op_def.args)
 
-def run_scenario(adapter: MemoryAdapter, scenario: Scenario) -> ScenarioMetrics:
+
+def run_scenario(
+    adapter: MemoryAdapter, scenario: Scenario, snapshots: SnapshotCache | None = None
+) -> ScenarioMetrics:
+    """Populate ``adapter`` with ``scenario`` and evaluate its queries.
+
+    With ``snapshots``, adapters that support it are populated once per
+    scenario and adapter class; later runs start from a clone.
+    """
     skip_reason = _should_skip(adapter, scenario)
     if skip_reason:
         return ScenarioMetrics(skipped=True, skip_reason=skip_reason)
 
+    key = snapshot = None
+    if snapshots is not None and getattr(adapter, "supports_snapshots", False):
+        key = snapshots.key(type(adapter).__name__, scenario)
+        snapshot = snapshots.get(key)
+
     try:
-        adapter.setup()
+        if snapshot is not None:
+            adapter.setup_from_snapshot(snapshot)
+        else:
+            adapter.setup()
     except ImportError as e:
         return ScenarioMetrics(skipped=True, skip_reason=str(e))
 
     try:
-        # Store all memories
-        for mem_def in scenario.memories:
-            adapter.store(mem_def.id, mem_def.text, mem_def.metadata)
-
-        # Apply temporal offsets
-        for mem_def in scenario.memories:
-            age_days = (mem_def.metadata or {}).get("age_days", 0)
-            _apply_temporal_offset(adapter, mem_def, age_days)
-
-        # Create links
-        for link_def in scenario.links:
-            adapter.link(
-                link_def.source_id, link_def.target_id,
-                link_def.rel_type, link_def.weight,
-            )
-
-        # Apply operations
-        for op_def in scenario.operations:
-            if op_def.op == "supersede":
-                adapter.supersede(**op_def.args)
-            elif op_def.op == "contradict":
-                adapter.contradict(**op_def.args)
-            elif op_def.op == "reinforce":
-                adapter.reinforce(**op_def.args)
+        if snapshot is None:
+            _populate(adapter, scenario)
+            if key is not None:
+                adapter.save_snapshot(snapshots, key)
 
-        # Run queries
+        # Run queries; cache preparation stays outside the timed call
+        before_query = getattr(adapter, "before_query", None)
         query_metrics = []
         for query_def in scenario.queries:
+            if before_query is not None:
+                before_query()
             qm = evaluate_query(
                 recall_fn=adapter.recall,
                 query=query_def.query,
@@ -97,11 +168,49 @@ def run_scenario(adapter: MemoryAdapter, scenario: Scenario) -> ScenarioMetrics:
         adapter.teardown()
 
 
+def _describe(metrics: ScenarioMetrics) -> str:
+    if metrics.skipped:
+        return f"SKIP  ({metrics.skip_reason})"
+    return (
+        f"P@K={metrics.avg_precision:.3f}  "
+        f"R@K={metrics.avg_recall:.3f}  "
+        f"NDCG={metrics.avg_ndcg:.3f}  "
+        f"MRR={metrics.avg_mrr:.3f}  "
+        f"lat={metrics.latency_p50_ms:.1f}ms"
+    )
+
+
+def _pin_worker(cores) -> None:
+    """Pool initializer: pin this worker to the next free CPU."""
+    os.sched_setaffinity(0, {cores.get()})
+
+
+def _merge_latency(metrics: ScenarioMetrics, timed: ScenarioMetrics) -> None:
+    """Replace the latencies in ``metrics`` with those measured in ``timed``."""
+    metrics.latency_p50_ms = timed.latency_p50_ms
+    metrics.latency_p95_ms = timed.latency_p95_ms
+    metrics.latency_p99_ms = timed.latency_p99_ms
+    for qm, timed_qm in zip(metrics.per_query, timed.per_query):
+        qm.latency_ms = timed_qm.latency_ms
+
+
 def run_all(
     adapters: list[MemoryAdapter],
     scenarios: list[Scenario],
     verbose: bool = False,
+    jobs: int = 1,
+    latency: str = "serial",
+    snapshots: SnapshotCache | None = None,
 ) -> list[BenchmarkResult]:
+    if latency not in LATENCY_MODES:
+        raise ValueError(f"unknown latency mode: {latency!r}")
+    if latency == "pinned":
+        if not hasattr(os, "sched_setaffinity"):
+            raise ValueError("pinned latency needs os.sched_setaffinity (Linux)")
+        jobs = min(jobs, len(os.sched_getaffinity(0)))
+    if jobs > 1:
+        return _run_parallel(adapters, scenarios, verbose, jobs, latency, snapshots)
+
     results = []
     for adapter in adapters:
         if verbose:
@@ -114,21 +223,63 @@ def run_all(
             if verbose:
                 print(f"  {scenario.name:30s} ", end="", flush=True)
 
-            metrics = run_scenario(adapter, scenario)
+            metrics = run_scenario(adapter, scenario, snapshots)
 
             if verbose:
-                if metrics.skipped:
-                    print(f"SKIP  ({metrics.skip_reason})")
-                else:
-                    print(
-                        f"P@K={metrics.avg_precision:.3f}  "
-                        f"R@K={metrics.avg_recall:.3f}  "
-                        f"NDCG={metrics.avg_ndcg:.3f}  "
-                        f"MRR={metrics.avg_mrr:.3f}  "
-                        f"lat={metrics.latency_p50_ms:.1f}ms"
-                    )
+                print(_describe(metrics))
 
             bench_result.scenario_results[scenario.name] = metrics
         results.append(bench_result)
 
     return results
+
+
+def _run_parallel(
+    adapters: list[MemoryAdapter],
+    scenarios: list[Scenario],
+    verbose: bool,
+    jobs: int,
+    latency: str,
+    snapshots: SnapshotCache | None = None,
+) -> list[BenchmarkResult]:
+    context = multiprocessing.get_context("spawn")
+    pool_kwargs: dict = {"max_workers": jobs, "mp_context": context}
+    if latency == "pinned":
+        cores = context.Queue()
+        for core in sorted(os.sched_getaffinity(0))[:jobs]:
+            cores.put(core)
+        pool_kwargs.update(initializer=_pin_worker, initargs=(cores,))
+
+    if verbose:
+        print(f"\nQuality pass: {len(adapters) * len(scenarios)} runs on {jobs} workers")
+    metrics: dict[tuple[int, int], ScenarioMetrics] = {}
+    with ProcessPoolExecutor(**pool_kwargs) as pool:
+        futures = {
+            (a, s): pool.submit(run_scenario, adapter, scenario, snapshots)
+            for a, adapter in enumerate(adapters)
+            for s, scenario in enumerate(scenarios)
+        }
+        for (a, s), future in futures.items():
+            metrics[(a, s)] = future.result()
+            if verbose:
+                print(f"  {adapters[a].name} / {scenarios[s].name:30s} {_describe(metrics[(a, s)])}")
+
+    if latency == "serial":
+        if verbose:
+            print("\nLatency pass (serial)")
+        for (a, s), quality in metrics.items():
+            if quality.skipped:
+                continue
+            timed = run_scenario(adapters[a], scenarios[s], snapshots)
+            if not timed.skipped:
+                _merge_latency(quality, timed)
+            if verbose:
+                print(f"  {adapters[a].name} / {scenarios[s].name:30s} lat={quality.latency_p50_ms:.1f}ms")
+
+    results = []
+    for a, adapter in enumerate(adapters):
+        bench_result = BenchmarkResult(adapter_name=adapter.name)
+        for s, scenario in enumerate(scenarios):
+            bench_result.scenario_results[scenario.name] = metrics[(a, s)]
+        results.append(bench_result)
+    return results
@@ -0,0 +1,185 @@
+"""Scale benchmark: ingest and recall on synthetic corpora of N memories.
+
+For each corpus size a file-backed ``MemoryEngine`` is filled through the
+public API (``add`` then ``link``), then queried with known-item queries.
+Reported per size: ingest throughput, recall latency percentiles and
+hit rate, peak RSS, and on-disk size of the database and its FTS index.
+
+Each size runs in a fresh process by default so that peak RSS belongs to
+that size alone rather than to the largest size run so far.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+from .metrics import percentile
+from .scenarios.corpus import CorpusSpec, SyntheticCorpus
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_QUERIES = 200
+WARMUP_QUERIES = 10
+
+
+@dataclass
+class ScaleResult:
+    size: int
+    links: int = 0
+    ingest_seconds: float = 0.0
+    memories_per_second: float = 0.0
+    links_per_second: float = 0.0
+    queries: int = 0
+    latency_p50_ms: float = 0.0
+    latency_p95_ms: float = 0.0
+    latency_p99_ms: float = 0.0
+    hit_rate_at_10: float = 0.0
+    peak_rss_bytes: int | None = None
+    db_bytes: int = 0
+    wal_bytes: int = 0
+    fts_bytes: int = 0
+    table_bytes: dict[str, int] | None = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def peak_rss_bytes() -> int | None:
+    """High-water resident set size of this process, if the OS reports it."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def table_sizes(conn) -> dict[str, int]:
+    """Bytes per table and index, from the ``dbstat`` virtual table.
+
+    FTS5 shadow tables (``memories_fts_data`` etc.) are summed under
+    ``memories_fts``. Empty when SQLite was built without ``dbstat``.
+    """
+    import sqlite3
+
+    try:
+        rows = conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    sizes: dict[str, int] = {}
+    for name, size in rows:
+        if name.startswith("memories_fts"):
+            name = "memories_fts"
+        sizes[name] = sizes.get(name, 0) + size
+    return dict(sorted(sizes.items(), key=lambda kv: -kv[1]))
+
+
+def run_scale(
+    size: int,
+    queries: int = DEFAULT_QUERIES,
+    seed: int = 0,
+    directory: str | None = None,
+    verbose: bool = False,
+) -> ScaleResult:
+    """Ingest a ``size``-memory synthetic corpus and measure recall on it."""
+    from openmem.engine import MemoryEngine
+
+    corpus = SyntheticCorpus(CorpusSpec(size=size, seed=seed))
+    result = ScaleResult(size=size)
+
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        db_path = os.path.join(tmp, "memories.db")
+        engine = MemoryEngine(db_path=db_path)
+        # Synthetic index -> engine id; a list keeps bookkeeping small
+        ids: list[str] = []
+
+        start = time.perf_counter()
+        for memory in corpus.memories():
+            meta = memory.metadata or {}
+            ids.append(engine.add(
+                memory.text, type=meta["type"], entities=meta["entities"]
+            ).id)
+        memory_seconds = time.perf_counter() - start
+        if verbose:
+            print(f"  {size:>9,} memories  {memory_seconds:8.1f}s", file=sys.stderr)
+
+        start = time.perf_counter()
+        for link in corpus.links():
+            engine.link(
+                ids[_index(link.source_id)], ids[_index(link.target_id)],
+                rel_type=link.rel_type, weight=link.weight,
+            )
+            result.links += 1
+        link_seconds = time.perf_counter() - start
+        if verbose:
+            print(f"  {result.links:>9,} links     {link_seconds:8.1f}s", file=sys.stderr)
+
+        result.ingest_seconds = memory_seconds + link_seconds
+        result.memories_per_second = size / memory_seconds if memory_seconds else 0.0
+        result.links_per_second = result.links / link_seconds if link_seconds else 0.0
+
+        query_defs = corpus.queries(queries + WARMUP_QUERIES)
+        for query_def in query_defs[:WARMUP_QUERIES]:
+            engine.recall(query_def.query, top_k=query_def.top_k)
+
+        latencies = []
+        hits = 0
+        for query_def in query_defs[WARMUP_QUERIES:]:
+            expected = ids[_index(query_def.relevant_ids[0])]
+            start = time.perf_counter()
+            recalled = engine.recall(query_def.query, top_k=query_def.top_k, token_budget=50000)
+            latencies.append((time.perf_counter() - start) * 1000)
+            hits += any(sm.memory.id == expected for sm in recalled)
+
+        result.queries = len(latencies)
+        result.latency_p50_ms = percentile(latencies, 50)
+        result.latency_p95_ms = percentile(latencies, 95)
+        result.latency_p99_ms = percentile(latencies, 99)
+        result.hit_rate_at_10 = hits / len(latencies) if latencies else 0.0
+
+        engine.store.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        result.table_bytes = table_sizes(engine.store.conn)
+        result.fts_bytes = result.table_bytes.get("memories_fts", 0)
+        result.db_bytes = os.path.getsize(db_path)
+        wal = db_path + "-wal"
+        result.wal_bytes = os.path.getsize(wal) if os.path.exists(wal) else 0
+        engine.close()
+
+    result.peak_rss_bytes = peak_rss_bytes()
+    return result
+
+
+def _index(memory_id: str) -> int:
+    return int(memory_id.rsplit("_", 1)[1])
+
+
+def run_scales(
+    sizes: list[int],
+    queries: int = DEFAULT_QUERIES,
+    seed: int = 0,
+    directory: str | None = None,
+    isolate: bool = True,
+    verbose: bool = False,
+) -> list[ScaleResult]:
+    """Run ``run_scale`` for each size, smallest first.
+
+    With ``isolate``, each size runs in its own spawned process.
+    """
+    results = []
+    for size in sorted(sizes):
+        if verbose:
+            print(f"scale {size:,}", file=sys.stderr)
+        if isolate:
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                results.append(
+                    pool.submit(run_scale, size, queries, seed, directory, verbose).result()
+                )
+        else:
+            results.append(run_scale(size, queries, seed, directory, verbose))
+    return results
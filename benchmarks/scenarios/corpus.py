@@ -0,0 +1,180 @@
+"""Synthetic corpora for scale benchmarks.
+
+Generates N memories whose text follows a Zipfian word distribution, whose
+entities follow a (steeper) Zipfian popularity curve, and whose links form
+a power-law graph by preferential attachment. Everything is derived from
+``CorpusSpec.seed``, so the same spec always yields the same corpus.
+
+Memories and links are produced lazily, one at a time, so a 1M corpus never
+has to sit in memory as a list.
+"""
+from __future__ import annotations
+
+import itertools
+import random
+from dataclasses import dataclass
+from typing import Iterator
+
+from .scenarios import LinkDef, MemoryDef, QueryDef
+
+_CONSONANTS = "bdfgklmnprstvz"
+_VOWELS = "aeiou"
+_SYLLABLES = [c + v for c in _CONSONANTS for v in _VOWELS]
+
+MEMORY_TYPES = ("fact", "decision", "preference", "incident", "plan", "constraint")
+# Relative frequency of each type, in MEMORY_TYPES order
+_TYPE_WEIGHTS = (50, 20, 10, 10, 7, 3)
+
+REL_TYPES = ("mentions", "supports", "depends_on")
+_REL_WEIGHTS = (70, 20, 10)
+
+
+def synthetic_word(index: int) -> str:
+    """The ``index``-th word of the synthetic vocabulary (2+ syllables)."""
+    n = len(_SYLLABLES)
+    index += n  # every word has at least two syllables
+    parts = []
+    while index:
+        index, digit = divmod(index, n)
+        parts.append(_SYLLABLES[digit])
+    return "".join(reversed(parts))
+
+
+def zipf_cum_weights(n: int, exponent: float) -> list[float]:
+    """Cumulative weights for ranks ``1..n`` with ``p(r) ∝ r^-exponent``."""
+    return list(itertools.accumulate(1.0 / rank**exponent for rank in range(1, n + 1)))
+
+
+@dataclass
+class CorpusSpec:
+    """Shape of a synthetic corpus.
+
+    ``entity_count`` defaults to one entity per 50 memories (at least 20).
+    Each memory links to ``edges_per_memory`` earlier memories picked in
+    proportion to their degree, which gives a power-law degree
+    distribution with a few hubs.
+    """
+
+    size: int
+    vocab_size: int = 20_000
+    zipf_exponent: float = 1.07
+    min_words: int = 8
+    max_words: int = 40
+    entity_count: int | None = None
+    entity_exponent: float = 1.2
+    max_entities: int = 3
+    edges_per_memory: int = 2
+    seed: int | str = 0
+
+    @property
+    def entities(self) -> int:
+        if self.entity_count is not None:
+            return self.entity_count
+        return max(20, self.size // 50)
+
+
+class SyntheticCorpus:
+    """A deterministic synthetic corpus described by a ``CorpusSpec``."""
+
+    def __init__(self, spec: CorpusSpec):
+        self.spec = spec
+        self.vocabulary = [synthetic_word(i) for i in range(spec.vocab_size)]
+        # Entity names come from a disjoint slice of the word space
+        self.entity_names = [
+            f"{synthetic_word(spec.vocab_size + 2 * i).capitalize()} "
+            f"{synthetic_word(spec.vocab_size + 2 * i + 1).capitalize()}"
+            for i in range(spec.entities)
+        ]
+        self._word_weights = zipf_cum_weights(spec.vocab_size, spec.zipf_exponent)
+        self._entity_weights = zipf_cum_weights(spec.entities, spec.entity_exponent)
+
+    def memory_id(self, index: int) -> str:
+        return f"syn_{self.spec.size}_{index}"
+
+    def _memory(self, index: int, rng: random.Random) -> MemoryDef:
+        spec = self.spec
+        words = rng.choices(
+            self.vocabulary,
+            cum_weights=self._word_weights,
+            k=rng.randint(spec.min_words, spec.max_words),
+        )
+        entities = sorted(set(rng.choices(
+            self.entity_names,
+            cum_weights=self._entity_weights,
+            k=rng.randint(0, spec.max_entities),
+        )))
+        for name in entities:
+            words.insert(rng.randrange(len(words) + 1), name)
+        memory_type = rng.choices(MEMORY_TYPES, weights=_TYPE_WEIGHTS)[0]
+        return MemoryDef(
+            id=self.memory_id(index),
+            text=" ".join(words),
+            metadata={"type": memory_type, "entities": entities},
+        )
+
+    def memories(self) -> Iterator[MemoryDef]:
+        rng = random.Random(f"{self.spec.seed}:memories")
+        for index in range(self.spec.size):
+            yield self._memory(index, rng)
+
+    def links(self) -> Iterator[LinkDef]:
+        """Preferential-attachment edges from each memory to earlier ones."""
+        spec = self.spec
+        rng = random.Random(f"{spec.seed}:links")
+        # Every endpoint of every edge so far: sampling from this list
+        # picks a memory with probability proportional to its degree
+        endpoints: list[int] = []
+        for index in range(1, spec.size):
+            m = min(spec.edges_per_memory, index)
+            targets: set[int] = set()
+            while len(targets) < m:
+                if endpoints and rng.random() < 0.9:
+                    targets.add(rng.choice(endpoints))
+                else:
+                    targets.add(rng.randrange(index))
+            for target in sorted(targets):
+                endpoints.extend((index, target))
+                yield LinkDef(
+                    source_id=self.memory_id(index),
+                    target_id=self.memory_id(target),
+                    rel_type=rng.choices(REL_TYPES, weights=_REL_WEIGHTS)[0],
+                    weight=round(rng.uniform(0.3, 0.9), 2),
+                )
+
+    def queries(self, count: int, words: int = 3) -> list[QueryDef]:
+        """Known-item queries: a few of a memory's rarer words.
+
+        Each query is relevant to the memory it was drawn from, so recall
+        quality can be tracked alongside latency.
+        """
+        rng = random.Random(f"{self.spec.seed}:queries")
+        rank = {word: i for i, word in enumerate(self.vocabulary)}
+        picks = sorted(rng.sample(range(self.spec.size), min(count, self.spec.size)))
+        queries = []
+        wanted = iter(picks)
+        target = next(wanted, None)
+        for index, memory in enumerate(self.memories()):
+            if target is None:
+                break
+            if index != target:
+                continue
+            terms = sorted(
+                {w for w in memory.text.split() if w in rank},
+                key=lambda w: -rank[w],
+            )[:words]
+            queries.append(QueryDef(query=" ".join(terms), relevant_ids=[memory.id]))
+            target = next(wanted, None)
+        rng.shuffle(queries)
+        return queries
+
+
+def degree_histogram(links: Iterator[LinkDef]) -> dict[int, int]:
+    """``degree -> number of memories`` with that many incident edges."""
+    degrees: dict[str, int] = {}
+    for link in links:
+        degrees[link.source_id] = degrees.get(link.source_id, 0) + 1
+        degrees[link.target_id] = degrees.get(link.target_id, 0) + 1
+    histogram: dict[int, int] = {}
+    for degree in degrees.values():
+        histogram[degree] = histogram.get(degree, 0) + 1
+    return dict(sorted(histogram.items()))
@@ -0,0 +1,161 @@
+"""Populated scenario databases, built once and cloned for every run.
+
+Populating a scenario (storing every memory, backdating it, adding links
+and applying operations) costs far more than its queries once corpora
+get large, and ``--repeat``, the storage and cache modes and the serial
+latency pass of ``--jobs`` all rebuild the same database. The first run
+of a scenario on an adapter class saves the populated database with the
+``sqlite3`` backup API, together with the benchmark-to-engine id map.
+Later runs clone it: a backup into ``:memory:``, or a file copy for file
+storage (see ``EngineStorage.open``).
+
+Keys combine the scenario name, the adapter class and a digest of the
+scenario's memories, links and operations, so a directory of snapshots
+can be reused across invocations and goes stale safely when a scenario
+changes. The id map and build time are stored in a table inside the
+snapshot database, which is written under a temporary name and published
+with a hard link. Publishing never replaces an existing snapshot: when
+processes sharing a directory (``--jobs``) build the same key, the first
+one wins and the others keep it, so every process sees one database
+together with its own id map.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+
+# Holds the snapshot's id map and build time; dropped from clones
+META_TABLE = "benchmark_snapshot"
+
+
+@dataclass
+class Snapshot:
+    path: str
+    id_map: dict[str, str] = field(default_factory=dict)  # benchmark_id -> engine id
+    built_at: float = 0.0
+
+
+def scenario_digest(scenario) -> str:
+    content = {
+        "memories": [asdict(m) for m in scenario.memories],
+        "links": [asdict(link) for link in scenario.links],
+        "operations": [asdict(op) for op in scenario.operations],
+    }
+    encoded = json.dumps(content, sort_keys=True, default=str).encode()
+    return hashlib.sha1(encoded).hexdigest()[:12]
+
+
+def clone_snapshot(snapshot: Snapshot, conn: sqlite3.Connection) -> None:
+    """Replace the database behind ``conn`` with a copy of ``snapshot``."""
+    source = sqlite3.connect(snapshot.path)
+    try:
+        source.backup(conn)
+    finally:
+        source.close()
+    drop_metadata(conn)
+
+
+def drop_metadata(conn: sqlite3.Connection) -> None:
+    """Remove the snapshot's own table from a clone."""
+    conn.execute(f"DROP TABLE IF EXISTS {META_TABLE}")
+    conn.commit()
+
+
+def shift_timestamps(conn: sqlite3.Connection, seconds: float) -> None:
+    """Move every memory and edge timestamp forward, so a snapshot built
+    earlier has the same ages now as when it was built."""
+    conn.execute(
+        """UPDATE memories SET created_at = created_at + ?, updated_at = updated_at + ?,
+           last_accessed = last_accessed + ?""",
+        (seconds, seconds, seconds),
+    )
+    conn.execute("UPDATE edges SET created_at = created_at + ?", (seconds,))
+    conn.commit()
+
+
+class SnapshotCache:
+    """Snapshots in ``directory``; a temporary one, removed on ``close``,
+    when none is given."""
+
+    def __init__(self, directory: str | None = None):
+        self._owned = directory is None
+        self.directory = directory or tempfile.mkdtemp(prefix="openmem-snapshots-")
+        os.makedirs(self.directory, exist_ok=True)
+        self._loaded: dict[str, Snapshot] = {}
+
+    def __enter__(self) -> SnapshotCache:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def key(self, adapter_kind: str, scenario) -> str:
+        return f"{scenario.name}-{adapter_kind}-{scenario_digest(scenario)}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".db")
+
+    def get(self, key: str) -> Snapshot | None:
+        if key in self._loaded:
+            return self._loaded[key]
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        conn = sqlite3.connect(path)
+        try:
+            row = conn.execute(f"SELECT id_map, built_at FROM {META_TABLE}").fetchone()
+        except sqlite3.Error:
+            return None  # not a snapshot, or from an older layout
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        snapshot = Snapshot(path=path, id_map=json.loads(row[0]), built_at=row[1])
+        self._loaded[key] = snapshot
+        return snapshot
+
+    def save(self, key: str, conn: sqlite3.Connection, id_map: dict[str, str]) -> Snapshot:
+        """Back up the database behind ``conn`` as ``key``, with ``id_map``.
+
+        Returns the published snapshot, which is another process's when one
+        saved ``key`` first.
+        """
+        path = self._path(key)
+        snapshot = Snapshot(path=path, id_map=dict(id_map), built_at=time.time())
+        tmp = f"{path}.{os.getpid()}.tmp"
+        dest = sqlite3.connect(tmp)
+        try:
+            conn.backup(dest)
+            # A single self-contained file, whatever the source's journal mode
+            dest.execute("PRAGMA journal_mode=DELETE")
+            dest.execute(f"CREATE TABLE {META_TABLE} (id_map TEXT NOT NULL, built_at REAL NOT NULL)")
+            dest.execute(
+                f"INSERT INTO {META_TABLE} VALUES (?, ?)",
+                (json.dumps(snapshot.id_map), snapshot.built_at),
+            )
+            dest.commit()
+        finally:
+            dest.close()
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            existing = self.get(key)
+            if existing is not None:
+                os.remove(tmp)
+                return existing
+            os.replace(tmp, path)  # an unreadable leftover; nobody can be using it
+        else:
+            os.remove(tmp)
+        self._loaded[key] = snapshot
+        return snapshot
+
+    def close(self) -> None:
+        self._loaded.clear()
+        if self._owned:
+            shutil.rmtree(self.directory, ignore_errors=True)
@@ -1,12 +1,30 @@
 from __future__ import annotations
 
+import json
+import sqlite3
+
 import pytest
 
 from .adapters.base import MemoryAdapter
 from .adapters.openmem_adapter import OpenMemAdapter
 from .adapters.bm25_only_adapter import BM25OnlyAdapter
-from .runner import run_scenario
+from .agent.cassette import Cassette, CassetteClient
+from .agent.harness import AgentHarness
+from .agent.runner import run_agent_benchmark
+from .agent.scenarios import build_fact_retrieval
+from .load import LoadConfig, run_load
+from .mcp_roundtrip import run_mcp_benchmark
+from .micro import measure
+from .micro_suite import CASES, build_fixture, run_micro_suite
+from .display import print_comparison
+from .results import Tolerances, compare, regressions, results_document, run_metadata
+from .runner import run_all, run_scenario
+from .scale import run_scale
+from .snapshots import SnapshotCache, clone_snapshot
+from .topologies import run_topologies
+from .scenarios.corpus import CorpusSpec, SyntheticCorpus, degree_histogram
 from .scenarios.scenarios import (
+    all_scenarios,
     build_basic_recall,
     build_contradiction,
     build_graph_boosted,
@@ -98,3 +116,266 @@ class TestMultiHop:
         assert metrics.avg_recall >= 0.3, (
             f"OpenMem recall {metrics.avg_recall:.3f} < 0.3 on multi-hop scenario"
         )
+
+
+class _BM25SeededOpenMem(OpenMemAdapter):
+    """OpenMem seeded from BM25 alone, the baseline for channel fusion."""
+
+    name = "OpenMem (BM25 seeds)"
+
+    def setup(self) -> None:
+        super().setup()
+        self._storage.close(self._engine)
+        self._engine = self._storage.open(seed_channels=("bm25",))
+
+
+class TestSeedFusion:
+    def test_fusion_does_not_regress_bm25_seeding(self):
+        """Entity and vector seeds may add hits but must not cost ranking quality."""
+        for scenario in all_scenarios():
+            fused = run_scenario(OpenMemAdapter(), scenario)
+            bm25 = run_scenario(_BM25SeededOpenMem(), scenario)
+            for metric in ("avg_recall", "avg_ndcg", "avg_mrr"):
+                assert getattr(fused, metric) >= getattr(bm25, metric) - 1e-9, (
+                    f"{scenario.name}: fused {metric} {getattr(fused, metric):.3f} "
+                    f"< BM25-seeded {getattr(bm25, metric):.3f}"
+                )
+
+
+class TestStorageModes:
+    def test_file_backed_cold_cache(self):
+        scenario = build_basic_recall()
+        adapter = OpenMemAdapter(storage="file", cache="cold")
+        metrics = run_scenario(adapter, scenario)
+        assert adapter.name.endswith("[file/cold]")
+        assert len(metrics.per_query) == len(scenario.queries)
+        assert metrics.avg_mrr >= 0.5
+        assert adapter._storage.db_path == ":memory:"  # temp dir removed
+
+    def test_cold_cache_needs_file_storage(self):
+        with pytest.raises(ValueError):
+            OpenMemAdapter(storage="memory", cache="cold")
+
+
+class TestScale:
+    def test_corpus_is_deterministic(self):
+        spec = CorpusSpec(size=200, seed=7)
+        first = [m.text for m in SyntheticCorpus(spec).memories()]
+        second = [m.text for m in SyntheticCorpus(spec).memories()]
+        assert first == second
+        assert len(set(first)) == 200
+
+    def test_link_graph_has_hubs(self):
+        corpus = SyntheticCorpus(CorpusSpec(size=2000))
+        histogram = degree_histogram(corpus.links())
+        mean = sum(d * n for d, n in histogram.items()) / sum(histogram.values())
+        assert max(histogram) > 10 * mean
+
+    def test_run_scale_reports_sizes_and_latency(self, tmp_path):
+        result = run_scale(300, queries=20, directory=str(tmp_path))
+        assert result.links == 2 * 300 - 3
+        assert result.queries == 20
+        assert result.latency_p99_ms >= result.latency_p50_ms > 0
+        assert result.hit_rate_at_10 >= 0.8
+        assert result.db_bytes > result.fts_bytes > 0
+
+
+class TestLoad:
+    def test_mixed_workload_on_shared_file(self):
+        config = LoadConfig(
+            readers=1, writers=1, duration_s=0.5, seed_size=100, use_threads=True
+        )
+        result = run_load(config)
+        assert set(result.operations) <= {"recall", "store", "reinforce"}
+        assert result.operations["store"].count > 0
+        assert result.operations["recall"].count > 0
+
+
+class TestRegressionGate:
+    def _document(self, latency: float, ndcg: float) -> dict:
+        return {
+            "metadata": {},
+            "scenarios": {"openmem": {
+                "basic_recall": {"latency_p50_ms": latency, "ndcg_at_k": ndcg},
+                "graph_boosted": {"skipped": True, "reason": "n/a"},
+            }},
+        }
+
+    def test_within_tolerance_passes(self):
+        comparisons = compare(self._document(10.0, 0.80), self._document(12.0, 0.79))
+        assert len(comparisons) == 2
+        assert not regressions(comparisons)
+
+    def test_latency_and_quality_regressions(self):
+        tolerances = Tolerances(latency=0.1, latency_slack_ms=0.0, quality=0.02)
+        comparisons = compare(
+            self._document(10.0, 0.80), self._document(12.0, 0.70), tolerances
+        )
+        assert {c.metric for c in regressions(comparisons)} == {"latency_p50_ms", "ndcg_at_k"}
+
+    def test_scenario_clock_mismatch_is_flagged(self, capsys):
+        baseline, current = self._document(10.0, 0.7468), self._document(10.0, 0.7314)
+        current["metadata"] = run_metadata()
+        print_comparison(compare(baseline, current), baseline["metadata"], current["metadata"])
+        assert "different clocks" in capsys.readouterr().out
+        print_comparison(compare(current, current), current["metadata"], current["metadata"])
+        assert "different clocks" not in capsys.readouterr().out
+
+    def test_scale_entries_compared_by_size(self):
+        baseline = {"scale": [{"size": 1000, "latency_p99_ms": 5.0, "hit_rate_at_10": 1.0}]}
+        current = {"scale": [{"size": 1000, "latency_p99_ms": 50.0, "hit_rate_at_10": 1.0}]}
+        (regression,) = regressions(compare(baseline, current))
+        assert regression.scenario == "scale_1000"
+        assert regression.metric == "latency_p99_ms"
+
+
+class TestMicro:
+    def test_setup_is_outside_the_timed_region(self):
+        import time
+
+        result = measure("noop", lambda x: x, setup=lambda: (time.sleep(0.005),), repeat=5)
+        assert len(result.samples_ns) == 5
+        assert result.mean_ns < 5_000_000
+        assert result.ci95_ns >= 0
+
+    def test_stage_suite(self):
+        fixture = build_fixture(size=300, queries=5)
+        results = run_micro_suite(fixture, warmup=1, repeat=5, track_allocations=True)
+        assert [r.name for r in results] == list(CASES)
+        for r in results:
+            assert r.median_ns > 0
+            assert r.peak_bytes is not None
+
+
+class TestTopologies:
+    def test_small_topologies(self):
+        results = run_topologies(
+            {"hub": [20], "chain": [10], "clique": [5]}, repeat=2, track_allocations=False
+        )
+        by_name = {r.name: r for r in results}
+        hub = by_name["hub_20"]
+        assert hub.activated == 21  # every leaf within two hops of any other
+        assert hub.spread.median_ns > 0
+        chain = by_name["chain_10"]
+        assert chain.memories == 10 and chain.edges == 9
+        clique = by_name["clique_5"]
+        assert clique.edges == 10
+        assert clique.demoted > 0
+
+
+class TestAgentCassettes:
+    def _cassette(self, scenario) -> Cassette:
+        cassette = Cassette(scenario.name, scenario.task, model="gpt-4o-mini")
+        cassette.append("agent", {
+            "content": None,
+            "tool_calls": [
+                {"id": "call_1", "name": "memory_recall", "arguments": '{"query": "database engine"}'},
+                {"id": "call_2", "name": "memory_recall", "arguments": '{"query": "WAL mode", "top_k": 3}'},
+            ],
+        })
+        cassette.append("agent", {"content": "SQLite in WAL mode with FTS5 at ~/.openmem/memory.db"})
+        cassette.append("judge", {"content": json.dumps({
+            "correctness": 1.0, "completeness": 1.0, "no_hallucination": 1.0,
+            "key_facts_found": scenario.key_facts, "key_facts_missing": [], "reasoning": "",
+        })})
+        return cassette
+
+    def test_replay_against_any_adapter(self, tmp_path):
+        scenario = build_fact_retrieval()
+        self._cassette(scenario).save(str(tmp_path))
+        results = run_agent_benchmark(
+            [OpenMemAdapter(), BM25OnlyAdapter()], [scenario], AgentHarness(),
+            cassette_dir=str(tmp_path),
+        )
+        for result in results:
+            sr = result.scenario_results[scenario.name]
+            assert not sr.skipped, sr.skip_reason
+            assert sr.agent_result.recall_calls == 2
+            assert len(sr.agent_result.recall_latencies_ms) == 2
+            assert sr.judge_result.overall == 1.0
+
+    def test_record_round_trip_and_missing_cassette(self, tmp_path):
+        scenario = build_fact_retrieval()
+        source = self._cassette(scenario)
+        recording = Cassette(scenario.name, scenario.task)
+        agent = CassetteClient(recording, "agent", real=CassetteClient(source, "agent"))
+        adapter = BM25OnlyAdapter()
+        adapter.setup()
+        try:
+            for mem in scenario.memories:
+                adapter.store(mem.id, mem.text, mem.metadata)
+            result = AgentHarness().run(adapter, scenario.task, client=agent)
+        finally:
+            adapter.teardown()
+        assert result.error is None
+        assert recording.responses["agent"] == source.responses["agent"]
+
+        results = run_agent_benchmark(
+            [BM25OnlyAdapter()], [scenario], AgentHarness(), cassette_dir=str(tmp_path / "none"),
+        )
+        assert results[0].scenario_results[scenario.name].skipped
+
+
+class TestParallelRun:
+    def test_parallel_quality_matches_serial(self):
+        scenarios = [build_basic_recall(), build_multi_hop()]
+        adapters = [OpenMemAdapter(), BM25OnlyAdapter()]
+        serial = run_all(adapters, scenarios)
+        parallel = run_all(adapters, scenarios, jobs=2)
+        assert [r.adapter_name for r in parallel] == [r.adapter_name for r in serial]
+        for s_result, p_result in zip(serial, parallel):
+            for name, expected in s_result.scenario_results.items():
+                got = p_result.scenario_results[name]
+                assert got.skipped == expected.skipped
+                if not got.skipped:
+                    assert (got.avg_precision, got.avg_recall, got.avg_ndcg, got.avg_mrr) == (
+                        expected.avg_precision, expected.avg_recall,
+                        expected.avg_ndcg, expected.avg_mrr,
+                    )
+                    assert got.latency_p50_ms > 0
+
+
+class TestSnapshots:
+    def test_clones_match_a_fresh_build(self, tmp_path):
+        scenario = build_temporal_recency()
+        fresh = run_scenario(OpenMemAdapter(), scenario)
+        with SnapshotCache(str(tmp_path)) as snapshots:
+            built = run_scenario(OpenMemAdapter(), scenario, snapshots)
+            key = snapshots.key("OpenMemAdapter", scenario)
+            assert snapshots.get(key) is not None
+            cloned = run_scenario(OpenMemAdapter(), scenario, snapshots)
+            cloned_file = run_scenario(OpenMemAdapter(storage="file"), scenario, snapshots)
+        for metrics in (built, cloned, cloned_file):
+            assert (metrics.avg_ndcg, metrics.avg_mrr) == (fresh.avg_ndcg, fresh.avg_mrr)
+        # A directory passed in is kept for the next invocation
+        assert sorted(p.suffix for p in tmp_path.iterdir()) == [".db"]
+
+    def test_first_saved_snapshot_wins(self, tmp_path):
+        scenario = build_temporal_recency()
+        mine, theirs = SnapshotCache(str(tmp_path)), SnapshotCache(str(tmp_path))
+        key = mine.key("OpenMemAdapter", scenario)
+        source = sqlite3.connect(":memory:")
+        source.execute("CREATE TABLE memories (id TEXT)")
+        first = theirs.save(key, source, {"m1": "engine-a"})
+        second = mine.save(key, source, {"m1": "engine-b"})
+        assert second.id_map == first.id_map == {"m1": "engine-a"}
+        assert SnapshotCache(str(tmp_path)).get(key).id_map == {"m1": "engine-a"}
+        # The id map travels inside the database and is dropped from clones
+        clone = sqlite3.connect(":memory:")
+        clone_snapshot(second, clone)
+        tables = [r[0] for r in clone.execute("SELECT name FROM sqlite_master")]
+        assert tables == ["memories"]
+
+
+class TestMcpRoundTrip:
+    def test_tool_calls_over_stdio(self):
+        pytest.importorskip("mcp")
+        result = run_mcp_benchmark(seed_size=200, calls=40, cold_starts=1)
+        assert len(result.first_call_ms) == 1
+        assert result.first_call_ms[0] >= result.startup_ms[0] > 0
+        recall = result.tools["memory_recall"]
+        assert recall.count > 0 and recall.errors == 0
+        assert sum(s.errors for s in result.tools.values()) == 0
+        assert result.direct_recall.count == recall.count
+        document = results_document(mcp_result=result)
+        assert compare(document, document)
@@ -0,0 +1,188 @@
+"""Adversarial graph topologies for spreading activation and conflicts.
+
+Real stores grow shapes the hand-written scenarios never have:
+
+- ``hub``: one "project overview" memory linked to ``degree`` others.
+  Spreading from any leaf reaches the hub in one hop and every other
+  leaf in two.
+- ``chain``: ``depth`` memories, each superseding the previous one, so a
+  long run of ``same_as`` edges with one active memory at the end.
+- ``clique``: ``size`` memories that all contradict each other, so the
+  conflict pass sees ``size * (size - 1) / 2`` contradicts edges.
+
+Each topology is built in its own in-memory engine and timed with the
+micro-benchmark harness: ``spread_activation`` from the worst-placed seed,
+then ``detect_and_resolve_conflicts`` on everything it activated. The
+activated-set size, neighbor links scanned and Python heap peak are
+reported alongside the latencies.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from .micro import MicroResult, measure
+
+TOPOLOGIES = ("hub", "chain", "clique")
+
+DEFAULT_PARAMS = {
+    "hub": (10, 100, 1000, 10_000),
+    "chain": (10, 100, 1000),
+    "clique": (5, 20, 50, 100),
+}
+
+DEFAULT_REPEAT = 10
+
+
+@dataclass
+class TopologyResult:
+    topology: str
+    param: int
+    memories: int = 0
+    edges: int = 0
+    max_hops: int = 2
+    activated: int = 0
+    edges_scanned: int = 0
+    scored: int = 0
+    demoted: int = 0
+    spread: MicroResult | None = None
+    conflicts: MicroResult | None = None
+    build_seconds: float = 0.0
+
+    @property
+    def name(self) -> str:
+        return f"{self.topology}_{self.param}"
+
+    def to_dict(self) -> dict:
+        return {
+            "topology": self.topology,
+            "param": self.param,
+            "memories": self.memories,
+            "edges": self.edges,
+            "max_hops": self.max_hops,
+            "activated": self.activated,
+            "edges_scanned": self.edges_scanned,
+            "scored": self.scored,
+            "demoted": self.demoted,
+            "spread": self.spread.to_dict() if self.spread else None,
+            "conflicts": self.conflicts.to_dict() if self.conflicts else None,
+        }
+
+
+def _text(kind: str, i: int) -> str:
+    return f"{kind} memory {i} about the deployment pipeline and release process"
+
+
+def build_hub(engine, degree: int) -> str:
+    """Hub linked to ``degree`` leaves; returns a leaf to seed from."""
+    hub = engine.add("Project overview: architecture, owners and conventions").id
+    leaves = [engine.add(_text("leaf", i)).id for i in range(degree)]
+    for leaf in leaves:
+        engine.link(hub, leaf, rel_type="mentions", weight=0.7)
+    return leaves[0]
+
+
+def build_chain(engine, depth: int) -> str:
+    """Supersession chain of ``depth`` memories; returns the newest."""
+    previous = engine.add(_text("version", 0)).id
+    for i in range(1, depth):
+        current = engine.add(_text("version", i)).id
+        engine.supersede(previous, current)
+        previous = current
+    return previous
+
+
+def build_clique(engine, size: int) -> str:
+    """``size`` mutually contradicting memories; returns one of them."""
+    ids = [engine.add(_text("claim", i), confidence=0.5 + i / (2 * size)).id for i in range(size)]
+    for i, a in enumerate(ids):
+        for b in ids[i + 1:]:
+            engine.contradict(a, b)
+    return ids[0]
+
+
+_BUILDERS = {"hub": build_hub, "chain": build_chain, "clique": build_clique}
+
+
+def run_topology(
+    topology: str,
+    param: int,
+    max_hops: int = 2,
+    repeat: int = DEFAULT_REPEAT,
+    track_allocations: bool = True,
+) -> TopologyResult:
+    from openmem.activation import spread_activation
+    from openmem.conflict import detect_and_resolve_conflicts
+    from openmem.engine import MemoryEngine
+    from openmem.scoring import compete
+    from openmem.trace import RecallTrace
+
+    if topology not in _BUILDERS:
+        raise ValueError(f"unknown topology: {topology!r}")
+    result = TopologyResult(topology=topology, param=param, max_hops=max_hops)
+
+    start = time.perf_counter()
+    engine = MemoryEngine(db_path=":memory:", max_hops=max_hops)
+    seed = _BUILDERS[topology](engine, param)
+    result.build_seconds = time.perf_counter() - start
+    store = engine.store
+    result.memories = store.conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+    result.edges = store.conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0]
+
+    def spread():
+        return spread_activation(
+            {seed: 1.0},
+            store,
+            max_hops=max_hops,
+            decay_per_hop=engine.decay_per_hop,
+            entity_weight=engine.entity_weight,
+            max_entity_fan=engine.max_entity_fan,
+        )
+
+    trace = RecallTrace()
+    activations = spread_activation(
+        {seed: 1.0},
+        store,
+        max_hops=max_hops,
+        decay_per_hop=engine.decay_per_hop,
+        entity_weight=engine.entity_weight,
+        max_entity_fan=engine.max_entity_fan,
+        trace=trace,
+    )
+    result.activated = len(activations)
+    result.edges_scanned = trace.counts.get("edges_scanned", 0)
+    result.spread = measure(
+        f"{result.name}:spread", spread, warmup=1, repeat=repeat,
+        track_allocations=track_allocations,
+    )
+
+    now = time.time()
+    memories = {mid: m for mid in activations if (m := store.get_memory(mid)) is not None}
+    scored = compete(activations, memories, now=now)
+    result.scored = len(scored)
+    resolved = detect_and_resolve_conflicts(scored, store, now=now)
+    result.demoted = sum(1 for sm in resolved if sm.components.get("conflict_demoted"))
+    result.conflicts = measure(
+        f"{result.name}:conflicts",
+        lambda: detect_and_resolve_conflicts(scored, store, now=now),
+        warmup=1, repeat=repeat, track_allocations=track_allocations,
+    )
+    engine.close()
+    return result
+
+
+def run_topologies(
+    params: dict[str, list[int]] | None = None,
+    max_hops: int = 2,
+    repeat: int = DEFAULT_REPEAT,
+    track_allocations: bool = True,
+    verbose: bool = False,
+) -> list[TopologyResult]:
+    params = params if params is not None else {k: list(v) for k, v in DEFAULT_PARAMS.items()}
+    results = []
+    for topology in TOPOLOGIES:
+        for param in params.get(topology, ()):
+            if verbose:
+                print(f"  {topology} {param}...", flush=True)
+            results.append(run_topology(topology, param, max_hops, repeat, track_allocations))
+    return results
@@ -1,4 +1,5 @@
 from .engine import MemoryEngine
-from .models import Edge, Memory, ScoredMemory
+from .models import Edge, Memory, MemoryFilter, ScoredMemory
+from .trace import RecallTrace
 
-__all__ = ["MemoryEngine", "Memory", "Edge", "ScoredMemory"]
+__all__ = ["MemoryEngine", "Memory", "Edge", "MemoryFilter", "ScoredMemory", "RecallTrace"]
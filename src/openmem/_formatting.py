@@ -72,6 +72,34 @@ def format_stats(stats: dict) -> str:
         f"  Active: {stats['active_count']}",
         f"  Superseded: {stats['superseded_count']}",
         f"  Contradicted: {stats['contradicted_count']}",
+        f"  Deleted (pending gc): {stats['deleted_count']}",
+        f"  Archived: {stats['archived_count']}",
         f"  Total edges: {stats['edge_count']}",
         f"  Average strength: {stats['avg_strength']:.2f}",
     ])
+
+
+def format_metrics(snapshot: dict) -> str:
+    """Format a ``MetricsRegistry.snapshot()``."""
+    lines = ["Engine Metrics:"]
+    operations = snapshot["operations"]
+    if not operations:
+        lines.append("  No operations recorded yet.")
+    for op, m in operations.items():
+        quantiles = ", ".join(
+            f"{key[:-3]}={m[key]:.2f}ms" for key in ("p50_ms", "p95_ms", "p99_ms")
+            if m[key] is not None
+        )
+        line = f"  {op}: {m['count']} calls, mean {m['mean_ms']:.2f}ms"
+        lines.append(f"{line} (last minute: {quantiles})" if quantiles else line)
+    for op, m in snapshot.get("lock_waits", {}).items():
+        lines.append(
+            f"  {op} lock wait: mean {m['mean_ms']:.2f}ms over {m['count']} calls"
+            + (f", p99={m['p99_ms']:.2f}ms" if m["p99_ms"] is not None else "")
+        )
+    for cache, rate in snapshot["cache_hit_rates"].items():
+        lines.append(f"  cache {cache}: {rate:.1%} hit rate")
+    for name, value in snapshot["counters"].items():
+        if not name.startswith(("cache_hits", "cache_misses")):
+            lines.append(f"  {name}: {value:g}")
+    return "\n".join(lines)
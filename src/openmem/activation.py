@@ -1,9 +1,36 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import math
+from typing import TYPE_CHECKING, Iterator
 
 if TYPE_CHECKING:
+    from .deadline import Deadline
+    from .models import MemoryFilter
     from .store import SQLiteStore
+    from .trace import RecallTrace
+
+
+def entity_link_weight(entity_weight: float, fan: int) -> float:
+    """Weight of the implicit memory → entity → memory link.
+
+    Shrinks with the entity's fan (number of memories mentioning it), so
+    specific entities associate strongly and common ones barely at all.
+    """
+    return entity_weight / (1.0 + math.log(fan))
+
+
+def _neighbor_weights(
+    store: SQLiteStore,
+    node_id: str,
+    filters: MemoryFilter | None,
+    entity_weight: float,
+    max_entity_fan: int,
+) -> Iterator[tuple[str, float]]:
+    for edge, neighbor in store.get_neighbors(node_id, filters):
+        yield neighbor.id, edge.weight
+    if entity_weight > 0:
+        for neighbor_id, fan in store.get_entity_neighbors(node_id, filters, max_entity_fan):
+            yield neighbor_id, entity_link_weight(entity_weight, fan)
 
 
 def spread_activation(
@@ -11,25 +38,52 @@ def spread_activation(
     store: SQLiteStore,
     max_hops: int = 2,
     decay_per_hop: float = 0.5,
+    filters: MemoryFilter | None = None,
+    entity_weight: float = 0.0,
+    max_entity_fan: int = 50,
+    deadline: Deadline | None = None,
+    trace: RecallTrace | None = None,
 ) -> dict[str, float]:
     """Spreading activation over the memory graph.
 
     Starting from seed nodes (typically BM25 hits), propagates activation
-    along edges with decay per hop. Returns memory_id → activation_score.
+    along edges with decay per hop. Neighbors outside ``filters`` are never
+    activated, so they cannot relay activation either.
+
+    With ``entity_weight > 0`` shared entities act as implicit hub nodes
+    (a bipartite memory–entity graph): a memory → entity → memory path
+    counts as one hop, weighted by ``entity_link_weight``.
+
+    Each hop expands its strongest nodes first. When ``deadline`` expires
+    spreading stops where it is (possibly before the first hop, leaving
+    just the seeds) and the ``"spread"`` stage is marked truncated.
+    With a ``trace``, the neighbor links examined are counted as
+    ``edges_scanned``.
+    Returns memory_id → activation_score.
     """
     activations = dict(seed_activations)
     frontier = set(seed_activations.keys())
+    scanned = 0
 
     for hop in range(max_hops):
         next_frontier: dict[str, float] = {}
-        for node_id in frontier:
-            for edge, neighbor in store.get_neighbors(node_id):
-                spread = activations[node_id] * edge.weight * (decay_per_hop ** (hop + 1))
-                if spread > activations.get(neighbor.id, 0):
-                    next_frontier[neighbor.id] = spread
-                    activations[neighbor.id] = spread
+        for node_id in sorted(frontier, key=activations.__getitem__, reverse=True):
+            if deadline is not None and deadline.expired():
+                deadline.truncate("spread")
+                next_frontier = {}
+                break
+            for neighbor_id, weight in _neighbor_weights(
+                store, node_id, filters, entity_weight, max_entity_fan
+            ):
+                scanned += 1
+                spread = activations[node_id] * weight * (decay_per_hop ** (hop + 1))
+                if spread > activations.get(neighbor_id, 0):
+                    next_frontier[neighbor_id] = spread
+                    activations[neighbor_id] = spread
         frontier = set(next_frontier.keys())
         if not frontier:
             break
 
+    if trace is not None:
+        trace.count("edges_scanned", scanned)
     return activations
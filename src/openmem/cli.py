@@ -11,6 +11,9 @@ from pathlib import Path
 
 
 DEFAULT_DB = os.path.join(Path.home(), ".openmem", "memories.db")
+DEFAULT_ARCHIVE_DB = os.path.join(Path.home(), ".openmem", "archive.db")
+DEFAULT_ENTITIES = os.path.join(Path.home(), ".openmem", "entities.txt")
+DEFAULT_SLOWLOG = os.path.join(Path.home(), ".openmem", "slow.jsonl")
 SETTINGS_PATH = os.path.join(Path.home(), ".claude", "settings.json")
 
 
@@ -25,6 +28,33 @@ def _get_db_path() -> str:
     return os.environ.get("OPENMEM_DB", DEFAULT_DB)
 
 
+def _get_archive_path() -> str:
+    return os.environ.get("OPENMEM_ARCHIVE_DB", DEFAULT_ARCHIVE_DB)
+
+
+def _existing_archive_path() -> str | None:
+    """The archive to attach for reading: only one that was asked for
+    explicitly or already exists, so reads never create an archive."""
+    if os.environ.get("OPENMEM_ARCHIVE_DB"):
+        return os.environ["OPENMEM_ARCHIVE_DB"]
+    return DEFAULT_ARCHIVE_DB if os.path.exists(DEFAULT_ARCHIVE_DB) else None
+
+
+def _get_slowlog_path() -> str:
+    path = os.environ.get("OPENMEM_SLOWLOG", "")
+    if path in ("", "0", "false", "off"):
+        return DEFAULT_SLOWLOG
+    return os.path.expanduser(path)
+
+
+def _get_entity_dictionary() -> list[str]:
+    """Entity names from the user dictionary file, if there is one."""
+    from openmem.entities import load_entity_dictionary
+
+    path = os.environ.get("OPENMEM_ENTITIES", DEFAULT_ENTITIES)
+    return load_entity_dictionary(path) if os.path.exists(path) else []
+
+
 def _find_project_root() -> str | None:
     """If running from a local source tree, return the project root path."""
     pkg_dir = Path(__file__).resolve().parent  # src/openmem/
@@ -243,6 +273,13 @@ def uninstall() -> None:
     print("Done. OpenMem has been removed from Claude Code.")
 
 
+def _format_size(num_bytes: int) -> str:
+    size_kb = num_bytes / 1024
+    if size_kb < 1024:
+        return f"{size_kb:.0f} KB"
+    return f"{size_kb / 1024:.1f} MB"
+
+
 def status() -> None:
     """Show memory store status and statistics."""
     from openmem import MemoryEngine
@@ -253,20 +290,19 @@ def status() -> None:
         print("Store memories via Claude Code or the Python API to get started.")
         return
 
-    engine = MemoryEngine(db_path=db_path)
+    engine = MemoryEngine(db_path=db_path, archive_path=_existing_archive_path())
     stats = engine.stats()
 
     print(f"Database: {db_path}")
-    size_kb = os.path.getsize(db_path) / 1024
-    if size_kb < 1024:
-        print(f"Size:     {size_kb:.0f} KB")
-    else:
-        print(f"Size:     {size_kb / 1024:.1f} MB")
+    print(f"Size:     {_format_size(os.path.getsize(db_path))}")
     print()
     print(f"Memories: {stats['memory_count']}")
     print(f"  Active:       {stats['active_count']}")
     print(f"  Superseded:   {stats['superseded_count']}")
     print(f"  Contradicted: {stats['contradicted_count']}")
+    if stats["deleted_count"]:
+        print(f"  Deleted:      {stats['deleted_count']} (run 'openmem-engine gc' to purge)")
+    print(f"Archived: {stats['archived_count']}")
     print(f"Edges:    {stats['edge_count']}")
     print(f"Avg strength: {stats['avg_strength']:.2f}")
 
@@ -413,7 +449,7 @@ def search() -> None:
         print(f"No memory store found at {db_path}")
         return
 
-    engine = MemoryEngine(db_path=db_path)
+    engine = MemoryEngine(db_path=db_path, archive_path=_existing_archive_path())
     results = engine.recall(query, top_k=10, token_budget=4000)
 
     if not results:
@@ -427,6 +463,130 @@ def search() -> None:
         print()
 
 
+def gc() -> None:
+    """Purge deleted memories, enforce capacity, and compact the database."""
+    from openmem import MemoryEngine
+
+    db_path = _get_db_path()
+    if not os.path.exists(db_path):
+        print(f"No memory store found at {db_path}")
+        return
+
+    max_memories = None
+    superseded_days = None
+    for i, arg in enumerate(sys.argv):
+        if arg == "--max-memories" and i + 1 < len(sys.argv):
+            max_memories = int(sys.argv[i + 1])
+        elif arg == "--superseded-days" and i + 1 < len(sys.argv):
+            superseded_days = float(sys.argv[i + 1])
+
+    engine = MemoryEngine(db_path=db_path)
+    result = engine.gc(max_memories=max_memories, superseded_days=superseded_days)
+
+    if superseded_days is not None:
+        print(f"Expired superseded: {result['superseded_expired']}")
+    if max_memories is not None:
+        print(f"Evicted (capacity): {result['evicted']}")
+    print(f"Purged memories:    {result['purged']}")
+    print(f"Purged edges:       {result['edges_purged']}")
+    if result["vector_rows_dropped"]:
+        print(f"Dead vector rows:   {result['vector_rows_dropped']}")
+    print(
+        f"Size:               {_format_size(result['size_before'])} -> "
+        f"{_format_size(result['size_after'])}"
+    )
+
+
+def archive() -> None:
+    """Move weak or stale memories to the archive tier."""
+    from openmem import MemoryEngine
+
+    db_path = _get_db_path()
+    if not os.path.exists(db_path):
+        print(f"No memory store found at {db_path}")
+        return
+
+    min_strength = 0.05
+    idle_days = None
+    for i, arg in enumerate(sys.argv):
+        if arg == "--min-strength" and i + 1 < len(sys.argv):
+            min_strength = float(sys.argv[i + 1])
+        elif arg == "--idle-days" and i + 1 < len(sys.argv):
+            idle_days = float(sys.argv[i + 1])
+
+    archive_path = _get_archive_path()
+    engine = MemoryEngine(db_path=db_path, archive_path=archive_path)
+    result = engine.archive(min_strength=min_strength, idle_days=idle_days)
+    print(f"Archived {result['archived']} memories and {result['edges_archived']} edges")
+    print(f"Archive: {archive_path} ({engine.store.archived_count()} memories)")
+
+
+def slowlog() -> None:
+    """Summarize the slow-recall log."""
+    from datetime import datetime
+
+    from openmem.slowlog import read_slow_log, summarize_slow_log
+
+    top = 10
+    plans = "--plans" in sys.argv
+    for i, arg in enumerate(sys.argv):
+        if arg == "--top" and i + 1 < len(sys.argv):
+            top = int(sys.argv[i + 1])
+
+    path = _get_slowlog_path()
+    if not os.path.exists(path):
+        print(f"No slow-recall log at {path}")
+        print("The MCP server writes one when started with OPENMEM_SLOWLOG=<path>.")
+        return
+    entries = read_slow_log(path)
+    summary = summarize_slow_log(entries, top=top)
+    if not summary["count"]:
+        print(f"Slow-recall log at {path} is empty")
+        return
+
+    def fmt_ts(ts: float | None) -> str:
+        return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M") if ts else "?"
+
+    print(f"Log:     {path}")
+    print(
+        f"Entries: {summary['count']} "
+        f"({fmt_ts(summary['first_ts'])} .. {fmt_ts(summary['last_ts'])})"
+    )
+    print(
+        f"Latency: p50 {summary['p50_ms']:.0f} ms, p95 {summary['p95_ms']:.0f} ms, "
+        f"max {summary['max_ms']:.0f} ms"
+    )
+    print()
+    print("Time by stage:")
+    for stage, share in summary["stage_share"].items():
+        print(f"  {stage:<10} {share:6.1%}")
+    if summary["full_scans"]:
+        print()
+        print("Scans in query plans (entries affected):")
+        for step, count in summary["full_scans"].items():
+            print(f"  {count:>5}  {step}")
+    print()
+    print(f"Slowest {len(summary['slowest'])}:")
+    for e in summary["slowest"]:
+        counts = e["counts"]
+        print(
+            f"  {e['total_ms']:8.0f} ms  {fmt_ts(e['ts'])}  "
+            f"slowest stage: {e['slowest_stage']}  "
+            f"bm25={counts.get('bm25_hits', 0)} activated={counts.get('activated', 0)} "
+            f"edges={counts.get('edges_scanned', 0)} hydrated={counts.get('hydrated', 0)}"
+        )
+        print(f"           query: {e['query']}")
+        print(f"           fts:   {e['fts_query']}")
+    if plans:
+        slowest = max(entries, key=lambda e: e["total_ms"])
+        print()
+        print("Query plans of the slowest recall:")
+        for plan in slowest.get("plans", []):
+            print(f"  [{plan['count']}x] {plan['sql']}")
+            for step in plan["plan"]:
+                print(f"      {step}")
+
+
 def _parse_transcript(transcript_path: str) -> list[dict]:
     """Parse a Claude Code JSONL transcript into a list of messages.
 
@@ -637,7 +797,7 @@ def digest() -> None:
 
     db_path = _get_db_path()
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    engine = MemoryEngine(db_path=db_path)
+    engine = MemoryEngine(db_path=db_path, entity_dictionary=_get_entity_dictionary())
 
     stored = 0
     for mem_data in memories:
@@ -677,6 +837,9 @@ def main() -> None:
         print("  get        Get full details of a memory by ID")
         print("  search     Search memories by query")
         print("  digest     Extract and store memories from a session transcript")
+        print("  gc         Purge deleted memories and compact the database")
+        print("  archive    Move weak or stale memories to the archive tier")
+        print("  slowlog    Summarize the slow-recall log")
         print("  ui         Launch web UI for browsing memories")
         print("  serve      Start the MCP server (used by Claude Code)")
         sys.exit(0)
@@ -697,6 +860,12 @@ def main() -> None:
         search()
     elif command == "digest":
         digest()
+    elif command == "gc":
+        gc()
+    elif command == "archive":
+        archive()
+    elif command == "slowlog":
+        slowlog()
     elif command == "ui":
         ui()
     elif command == "serve":
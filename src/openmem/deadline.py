@@ -0,0 +1,33 @@
+"""Wall-clock deadlines for anytime recall."""
+
+from __future__ import annotations
+
+import time
+
+
+class Deadline:
+    """A time budget shared by the stages of one recall.
+
+    Stages poll ``expired()`` at natural checkpoints (between BM25 windows,
+    spread hops, hydrated rows) and, when it fires, stop with what they have
+    and record themselves with ``truncate``. ``ms=None`` never expires.
+    """
+
+    def __init__(self, ms: float | None = None):
+        self.ms = ms
+        self._end = None if ms is None else time.perf_counter() + ms / 1000
+        self.truncated: list[str] = []
+
+    def remaining_ms(self) -> float | None:
+        """Milliseconds left (never negative), or ``None`` without a deadline."""
+        if self._end is None:
+            return None
+        return max(0.0, (self._end - time.perf_counter()) * 1000)
+
+    def expired(self) -> bool:
+        return self._end is not None and time.perf_counter() >= self._end
+
+    def truncate(self, stage: str) -> None:
+        """Record that ``stage`` was cut short or skipped."""
+        if stage not in self.truncated:
+            self.truncated.append(stage)
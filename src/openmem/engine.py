@@ -1,17 +1,59 @@
 from __future__ import annotations
 
+import heapq
 import math
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
 
 from .activation import spread_activation
 from .conflict import detect_and_resolve_conflicts
-from .models import Edge, Memory, ScoredMemory
-from .scoring import compete
+from .deadline import Deadline
+from .entities import EntityTagger, normalize_entity, query_entity_candidates
+from .metrics import MetricsRegistry, timed_method
+from .models import Edge, Memory, MemoryFilter, ScoredMemory
+from .scoring import compete, score_estimate, score_upper_bound, strength_value
+from .seeding import ChannelReport, ChannelStats, fuse_seeds, run_channels
+from .slowlog import DEFAULT_THRESHOLD_MS, SlowQueryLog
 from .store import SQLiteStore
+from .trace import NULL_TRACE, RecallHook, RecallTrace, _NullTrace
 
 # Rough token estimate: ~4 chars per token
 CHARS_PER_TOKEN = 4
 
+# Vector hits below this cosine similarity do not seed activation
+VECTOR_MIN_SIMILARITY = 0.25
+
+# BM25 candidates are fetched in windows that start at
+# BM25_FIRST_WINDOW * top_k and double, stopping once no unseen hit could
+# enter the top k, or at BM25_MAX_DEPTH. The first window leaves room for
+# spreading activation and normalization to reorder the head.
+BM25_FIRST_WINDOW = 2
+BM25_MAX_DEPTH = 1000
+
+# Unseen hits that could beat the k-th best estimate by no more than this
+# are not worth fetching; without it, near-ties (e.g. recency differing
+# by seconds) would stream the whole result set
+BM25_STOP_TOLERANCE = 0.01
+
+# Seed channels, in fusion order
+SEED_CHANNELS = ("bm25", "entity", "vector")
+
+# Hot-tier results scoring below this do not count as good hits when
+# deciding whether recall should also consult the archive tier
+ARCHIVE_FALLBACK_SCORE = 0.4
+
+
+def _normalize_hits(hits: list[tuple[str, float]]) -> dict[str, float]:
+    """Scale BM25 scores to [0, 1] by the best hit, for seeding activation."""
+    if not hits:
+        return {}
+    max_score = max(s for _, s in hits)
+    if max_score == 0:
+        max_score = 1.0
+    return {mid: score / max_score for mid, score in hits}
+
 
 class MemoryEngine:
     """Main entry point for the cognitive memory engine."""
@@ -22,12 +64,104 @@ class MemoryEngine:
         max_hops: int = 2,
         decay_per_hop: float = 0.5,
         weights: dict[str, float] | None = None,
+        archive_path: str | None = None,
+        entity_weight: float = 0.3,
+        max_entity_fan: int = 5,
+        auto_tag: bool = True,
+        entity_dictionary: Iterable[str] | None = None,
+        vectors: bool = False,
+        vector_weight: float = 0.5,
+        seed_channels: Iterable[str] | None = None,
+        channel_budget_ms: float | None = 200.0,
+        parallel_seeding: bool = True,
+        bm25_ranking: str = "adaptive",
+        metrics: MetricsRegistry | None = None,
+        slow_log: str | None = None,
+        slow_log_threshold_ms: float = DEFAULT_THRESHOLD_MS,
     ):
         self.store = SQLiteStore(db_path)
+        if archive_path:
+            self.store.attach_archive(archive_path)
         self.max_hops = max_hops
         self.decay_per_hop = decay_per_hop
         self.weights = weights
+        # Entity channel: exact entity mentions in the query seed activation,
+        # and shared entities act as implicit hubs while spreading. 0 disables.
+        # Entities mentioned by more than max_entity_fan memories behave like
+        # categories rather than associations and are ignored.
+        self.entity_weight = entity_weight
+        self.max_entity_fan = max_entity_fan
+        # Ingest-time tagging: memories added without entities are tagged
+        # with the known entity names found in their text. The vocabulary
+        # is every entity already in the store plus entity_dictionary, and
+        # grows as memories are added. Built on first use.
+        self.auto_tag = auto_tag
+        self._entity_dictionary = list(entity_dictionary or [])
+        self._tagger: EntityTagger | None = None
+        # Optional vector channel (needs NumPy): hashed n-gram embeddings
+        # seed memories that are similar to the query but share no token.
+        # The matrix file sits next to the database.
+        self.vector_weight = vector_weight
+        self.vectors = None
+        if vectors:
+            from .vectors import VectorIndex, matrix_path
+
+            self.vectors = VectorIndex(self.store, matrix_path(db_path))
+            self.vectors.sync()
+        # Seeding: BM25, entity and vector channels run concurrently on
+        # per-thread reader connections (file databases only). BM25 hits
+        # keep their activations; the other channels add the memories BM25
+        # missed at a weighted activation. Entity and vector
+        # channels still running after channel_budget_ms are dropped for
+        # that recall; BM25 always completes.
+        self.seed_channels = tuple(seed_channels or SEED_CHANNELS)
+        self.channel_budget_ms = channel_budget_ms
+        self._pool: ThreadPoolExecutor | None = None
+        if parallel_seeding and db_path != ":memory:":
+            self._pool = ThreadPoolExecutor(
+                max_workers=len(SEED_CHANNELS), thread_name_prefix="openmem-seed"
+            )
+        # BM25 candidate selection: "adaptive" streams hits by BM25 and stops
+        # once no deeper hit can make the top k; "competition" ranks every
+        # hit by competition score inside SQLite and takes the best.
+        if bm25_ranking not in ("adaptive", "competition"):
+            raise ValueError(f"unknown bm25_ranking: {bm25_ranking!r}")
+        self.bm25_ranking = bm25_ranking
+        self._thread_stores = threading.local()
+        self._reader_stores: list[SQLiteStore] = []
+        self._reader_lock = threading.Lock()
+        self.last_seed_report: dict[str, ChannelReport] = {}
+        self.last_truncated: list[str] = []
+        self._recall_hooks: list[RecallHook] = []
+        # Operational metrics; pass one registry to several engines to
+        # aggregate them (see metrics.MetricsRegistry)
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self._fts_cache_seen = (0, 0)
+        # Slow-recall log: recalls over the threshold are appended to a
+        # JSONL file with their stage timings and query plans. Enabling it
+        # turns on tracing for every recall.
+        self.slow_log: SlowQueryLog | None = None
+        if slow_log:
+            self.slow_log = SlowQueryLog(slow_log, self.store.conn, slow_log_threshold_ms)
+            self.add_recall_hook(self.slow_log)
+        self._channel_stats: dict[str, ChannelStats] = {}
+
+    @property
+    def tagger(self) -> EntityTagger:
+        """The entity tagger used by ``add``."""
+        if self._tagger is None:
+            self._tagger = EntityTagger(self.store.distinct_entities())
+            self._tagger.add(self._entity_dictionary)
+        return self._tagger
 
+    def add_entity_names(self, names: Iterable[str]) -> None:
+        """Teach the tagger entity names without attaching them to a memory."""
+        names = list(names)
+        self._entity_dictionary.extend(names)
+        if self._tagger is not None:
+            self._tagger.add(names)
+
+    @timed_method("add", writes=True)
     def add(
         self,
         text: str,
@@ -38,21 +172,36 @@ class MemoryEngine:
         source: str = "",
         project: str = "",
     ) -> Memory:
-        """Add a new memory."""
+        """Add a new memory.
+
+        With ``auto_tag``, a memory given no entities is tagged with the
+        known entity names its text mentions. Explicit entities are kept
+        as-is and join the tagger's vocabulary.
+        """
         now = time.time()
+        entities = list(entities or [])
+        if self.auto_tag:
+            if entities:
+                self.tagger.add(entities)
+            else:
+                entities = self.tagger.tag(text)
         mem = Memory(
             type=type,
             text=text,
             gist=gist,
-            entities=entities or [],
+            entities=entities,
             created_at=now,
             updated_at=now,
             confidence=confidence,
             source=source,
             project=project,
         )
-        return self.store.add_memory(mem)
+        mem = self.store.add_memory(mem)
+        if self.vectors is not None:
+            self.vectors.add(mem.id, f"{text} {gist or ''}")
+        return mem
 
+    @timed_method("link", writes=True)
     def link(
         self,
         source_id: str,
@@ -69,70 +218,424 @@ class MemoryEngine:
         )
         return self.store.add_edge(edge)
 
+    def update(self, memory: Memory) -> None:
+        """Write back an edited memory.
+
+        With the vector channel, a memory whose text or gist changed is
+        re-embedded.
+        """
+        old = self.store.get_memory(memory.id)
+        self.store.update_memory(memory)
+        if self.vectors is not None and old and (old.text, old.gist) != (memory.text, memory.gist):
+            self.vectors.add(memory.id, f"{memory.text} {memory.gist or ''}")
+
+    @timed_method("recall")
     def recall(
         self,
         query: str,
         top_k: int = 5,
         token_budget: int = 2000,
-    ) -> list[ScoredMemory]:
+        project: str | None = None,
+        types: list[str] | None = None,
+        sources: list[str] | None = None,
+        statuses: list[str] | None = None,
+        since: float | None = None,
+        until: float | None = None,
+        deadline_ms: float | None = None,
+        trace: bool = False,
+    ) -> list[ScoredMemory] | tuple[list[ScoredMemory], RecallTrace]:
         """Recall memories relevant to the query.
 
         Pipeline: FTS5/BM25 → seed activation → spreading activation →
         scoring competition → conflict resolution → token-budgeted output.
+
+        ``project``, ``types``, ``sources``, ``statuses`` and the
+        ``since``/``until`` creation-time window (epoch seconds) restrict
+        which memories can be seeded or activated. They are evaluated inside
+        SQLite, so scoped queries never spend candidate slots on memories
+        that would be discarded.
+
+        With ``deadline_ms`` recall returns its best ranking so far once the
+        budget is spent: seeding stops fetching, spreading stops between
+        nodes (possibly leaving only the seeds), hydration keeps the
+        strongest ``top_k`` activations, and the conflict check and archive
+        fallback are skipped. The stages cut short are listed in
+        ``last_truncated``.
+
+        With ``trace=True`` the result is a ``(results, RecallTrace)`` pair
+        with per-stage timings, row counts and SQL statement counts. Hooks
+        registered with ``add_recall_hook`` receive the same trace.
         """
+        deadline = Deadline(deadline_ms)
+        filters = MemoryFilter(
+            project=project,
+            types=types,
+            sources=sources,
+            statuses=statuses,
+            created_after=since,
+            created_before=until,
+        )
+        if not (trace or self._recall_hooks):
+            results = self._recall(query, top_k, token_budget, filters, deadline, NULL_TRACE)
+            self._finish_recall(deadline)
+            return results
+
+        recall_trace = RecallTrace(query=query)
+        start = time.perf_counter()
+        with recall_trace.sql_counter(self.store.conn):
+            results = self._recall(query, top_k, token_budget, filters, deadline, recall_trace)
+        recall_trace.total_ms = (time.perf_counter() - start) * 1000
+        recall_trace.truncated = deadline.truncated
+        recall_trace.count("returned", len(results))
+        self._finish_recall(deadline)
+        recall_trace.fts_query = self.store.plan_fts_query(query)
+        # Bookkeeping, not a recall lookup: keep it out of the cache metrics
+        self._fts_cache_seen = self.store.fts_cache_stats()
+        for hook in list(self._recall_hooks):
+            hook(recall_trace)
+        return (results, recall_trace) if trace else results
+
+    def _finish_recall(self, deadline: Deadline) -> None:
+        self.last_truncated = deadline.truncated
+        if deadline.truncated:
+            self.metrics.inc("recall_truncated")
+        hits, misses = self.store.fts_cache_stats()
+        seen_hits, seen_misses = self._fts_cache_seen
+        if hits > seen_hits:
+            self.metrics.inc("cache_hits", hits - seen_hits, cache="fts_stats")
+        if misses > seen_misses:
+            self.metrics.inc("cache_misses", misses - seen_misses, cache="fts_stats")
+        self._fts_cache_seen = (hits, misses)
+
+    def add_recall_hook(self, hook: RecallHook) -> None:
+        """Call ``hook(trace)`` with the ``RecallTrace`` of every recall.
+
+        Tracing costs a few microseconds per stage plus a callback per SQL
+        statement, and is only switched on while hooks are registered.
+        """
+        self._recall_hooks.append(hook)
+
+    def remove_recall_hook(self, hook: RecallHook) -> None:
+        self._recall_hooks.remove(hook)
+
+    def _recall(
+        self,
+        query: str,
+        top_k: int,
+        token_budget: int,
+        filters: MemoryFilter,
+        deadline: Deadline,
+        trace: RecallTrace | _NullTrace,
+    ) -> list[ScoredMemory]:
         now = time.time()
 
-        # Step 1: Lexical trigger via BM25
-        bm25_hits = self.store.search_bm25(query, limit=top_k * 4)
-        if not bm25_hits:
+        # Step 1: Seed activation from the BM25, entity and vector channels
+        with trace.stage("seed"):
+            seed_activations = self._seed(query, top_k, filters, deadline, trace)
+        trace.count("seeds", len(seed_activations))
+
+        activations: dict[str, float] = {}
+        memories: dict[str, Memory] = {}
+        scored: list[ScoredMemory] = []
+        if seed_activations:
+
+            # Step 2: Spreading activation
+            with trace.stage("spread"):
+                activations = spread_activation(
+                    seed_activations,
+                    self.store,
+                    max_hops=self.max_hops,
+                    decay_per_hop=self.decay_per_hop,
+                    filters=filters,
+                    entity_weight=self.entity_weight,
+                    max_entity_fan=self.max_entity_fan,
+                    deadline=deadline,
+                    trace=trace,
+                )
+            trace.count("activated", len(activations))
+
+            # Step 3: Load activated memories, strongest first
+            with trace.stage("hydrate"):
+                for mid in sorted(activations, key=activations.__getitem__, reverse=True):
+                    if len(memories) >= top_k and deadline.expired():
+                        deadline.truncate("hydrate")
+                        break
+                    mem = self.store.get_memory(mid)
+                    if mem:
+                        memories[mid] = mem
+            trace.count("hydrated", len(memories))
+
+            # Step 4: Competition scoring
+            with trace.stage("compete"):
+                scored = compete(activations, memories, weights=self.weights, now=now)
+
+            # Step 5: Conflict resolution
+            if deadline.expired():
+                deadline.truncate("conflicts")
+            else:
+                with trace.stage("conflicts"):
+                    scored = detect_and_resolve_conflicts(scored, self.store, now=now)
+
+        # Step 5b: Consult the archive tier only when the hot tier is thin
+        # and the archive holds anything. Archived hits compete as seeds;
+        # they are not spread from.
+        archived: set[str] = set()
+        good_hits = sum(1 for sm in scored if sm.score >= ARCHIVE_FALLBACK_SCORE)
+        if good_hits < top_k and not self.store.archive_is_empty():
+            if deadline.expired():
+                deadline.truncate("archive")
+            else:
+                with trace.stage("archive"):
+                    archive_hits = self.store.search_archive_bm25(
+                        query, limit=top_k * 4, filters=filters
+                    )
+                    for mid, activation in _normalize_hits(archive_hits).items():
+                        mem = self.store.get_archived_memory(mid)
+                        if mem and mid not in memories:
+                            memories[mid] = mem
+                            activations[mid] = activation
+                            archived.add(mid)
+                    if archived:
+                        scored = compete(activations, memories, weights=self.weights, now=now)
+                        if deadline.expired():
+                            deadline.truncate("conflicts")
+                        else:
+                            scored = detect_and_resolve_conflicts(scored, self.store, now=now)
+                trace.count("archive_hits", len(archived))
+
+        if not scored:
             return []
 
-        # Normalize BM25 scores to [0, 1] for seeding
-        max_score = max(s for _, s in bm25_hits) if bm25_hits else 1.0
-        if max_score == 0:
-            max_score = 1.0
-        seed_activations = {mid: score / max_score for mid, score in bm25_hits}
+        # Step 6: Token-budget packing
+        with trace.stage("pack"):
+            char_budget = token_budget * CHARS_PER_TOKEN
+            packed: list[ScoredMemory] = []
+            used_chars = 0
+            for sm in scored:
+                text_len = len(sm.memory.text)
+                if used_chars + text_len > char_budget and packed:
+                    break
+                packed.append(sm)
+                used_chars += text_len
+                if len(packed) >= top_k:
+                    break
+
+        # Step 7: Promote recalled archive memories back to the hot tier,
+        # then update access stats for returned memories
+        with trace.stage("update"):
+            self.store.promote_memories(
+                [sm.memory.id for sm in packed if sm.memory.id in archived]
+            )
+            for sm in packed:
+                self.store.update_access(sm.memory.id)
+
+        return packed
+
+    def _seed(
+        self,
+        query: str,
+        top_k: int,
+        filters: MemoryFilter | None,
+        deadline: Deadline | None = None,
+        trace: RecallTrace | _NullTrace = NULL_TRACE,
+    ) -> dict[str, float]:
+        """Run the seed channels and combine their hits into activations.
+
+        When a single channel has hits its own activations are used as-is;
+        when several do, the other channels add the memories BM25 missed
+        (see ``seeding.fuse_seeds``).
+        """
+        deadline = deadline or Deadline()
+        channels = {}
+        for name in self.seed_channels:
+            if name == "bm25":
+                channels[name] = lambda store: self._bm25_seeds(
+                    query, top_k, filters, store, deadline
+                )
+            elif name == "entity" and self.entity_weight > 0:
+                channels[name] = lambda store: self._entity_seeds(query, filters, store)
+            elif name == "vector" and self.vectors is not None and self.vector_weight > 0:
+                channels[name] = lambda store: self._vector_seeds(
+                    query, top_k * 4, filters, store
+                )
+
+        budget_ms = self.channel_budget_ms
+        remaining_ms = deadline.remaining_ms()
+        if remaining_ms is not None:
+            budget_ms = remaining_ms if budget_ms is None else min(budget_ms, remaining_ms)
+        pool = self._pool if len(channels) > 1 else None
+        if trace.enabled and pool is not None:
+            # Worker connections count their statements into the trace too
+            def counted(channel):
+                def run(store):
+                    with trace.sql_counter(store.conn):
+                        return channel(store)
+                return run
 
-        # Step 2: Spreading activation
-        activations = spread_activation(
-            seed_activations,
+            channels = {name: counted(channel) for name, channel in channels.items()}
+        results, reports = run_channels(
+            channels,
             self.store,
-            max_hops=self.max_hops,
-            decay_per_hop=self.decay_per_hop,
+            pool=pool,
+            thread_store=self._thread_store,
+            budget_ms=budget_ms,
+            # BM25 is the primary channel and is always waited for; under
+            # a deadline it stops after its first window by itself
+            anytime=("bm25",),
+            primary=("bm25",),
         )
+        if any(report.timed_out for report in reports.values()):
+            deadline.truncate("seed")
+        for name, report in reports.items():
+            trace.count(f"{name}_hits", report.hits)
 
-        # Step 3: Load all activated memories
-        memories = {}
-        for mid in activations:
-            mem = self.store.get_memory(mid)
-            if mem:
-                memories[mid] = mem
+        rankings = {name: hits for name, hits in results.items() if hits}
+        if len(rankings) == 1:
+            (name, hits), = rankings.items()
+            seeds = dict(hits)
+            reports[name].contribution = 1.0
+        else:
+            seeds, shares = fuse_seeds(rankings, primary="bm25")
+            for name, share in shares.items():
+                reports[name].contribution = share
 
-        # Step 4: Competition scoring
-        scored = compete(activations, memories, weights=self.weights, now=now)
+        self.last_seed_report = reports
+        for name, report in reports.items():
+            self._channel_stats.setdefault(name, ChannelStats()).record(report)
+        return seeds
 
-        # Step 5: Conflict resolution
-        scored = detect_and_resolve_conflicts(scored, self.store, now=now)
+    def _bm25_seeds(
+        self,
+        query: str,
+        top_k: int,
+        filters: MemoryFilter | None,
+        store: SQLiteStore | None = None,
+        deadline: Deadline | None = None,
+    ) -> list[tuple[str, float]]:
+        """BM25 hits as seed activations, fetched only as deep as needed.
 
-        # Step 6: Token-budget packing
-        char_budget = token_budget * CHARS_PER_TOKEN
-        packed: list[ScoredMemory] = []
-        used_chars = 0
-        for sm in scored:
-            text_len = len(sm.memory.text)
-            if used_chars + text_len > char_budget and packed:
-                break
-            packed.append(sm)
-            used_chars += text_len
-            if len(packed) >= top_k:
-                break
-
-        # Step 7: Update access stats for returned memories
-        for sm in packed:
-            self.store.update_access(sm.memory.id)
+        Threshold-algorithm early termination: hits stream from one FTS5
+        cursor in growing windows. After each window, the k-th best score
+        estimate seen so far is compared with the best score an unseen hit
+        could reach (its activation is at most the last one seen; its
+        recency, strength and confidence at most the store-wide maxima).
+        Once no unseen hit can enter the top k, fetching stops.
 
-        return packed
+        With ``bm25_ranking="competition"`` the hits are instead ranked by
+        competition score in SQL and the best ``2 * top_k`` are returned.
+        """
+        store = store or self.store
+        if self.bm25_ranking == "competition":
+            hits = store.search_competition(
+                query, top_k * BM25_FIRST_WINDOW, filters, weights=self.weights
+            )
+            return [(mid, activation) for mid, activation, _ in hits]
+        cursor = store.open_bm25_cursor(query, filters)
+        if cursor is None:
+            return []
+        now = time.time()
+        hits: list[tuple[str, float]] = []
+        best: list[float] = []  # min-heap of the top_k estimates
+        top_score = None
+        window = top_k * BM25_FIRST_WINDOW
+        try:
+            while len(hits) < BM25_MAX_DEPTH:
+                rows = cursor.fetchmany(min(window, BM25_MAX_DEPTH - len(hits)))
+                for row in rows:
+                    if top_score is None:
+                        top_score = row["score"] if row["score"] > 0 else 1.0
+                    activation = row["score"] / top_score
+                    hits.append((row["id"], activation))
+                    estimate = score_estimate(
+                        activation,
+                        row["ref_time"],
+                        row["strength"],
+                        row["access_count"],
+                        row["created_at"],
+                        row["confidence"],
+                        row["status"],
+                        weights=self.weights,
+                        now=now,
+                    )
+                    if len(best) < top_k:
+                        heapq.heappush(best, estimate)
+                    elif estimate > best[0]:
+                        heapq.heapreplace(best, estimate)
+                if len(rows) < window:
+                    break  # cursor exhausted
+                if deadline is not None and deadline.expired():
+                    deadline.truncate("seed")
+                    break
+                if len(best) == top_k:
+                    bound = score_upper_bound(
+                        hits[-1][1], store.score_bounds(), weights=self.weights, now=now
+                    )
+                    if best[0] + BM25_STOP_TOLERANCE >= bound:
+                        break
+                window *= 2
+        finally:
+            cursor.close()
+        return hits
+
+    def _thread_store(self) -> SQLiteStore:
+        """This worker thread's reader connection, opened on first use."""
+        store = getattr(self._thread_stores, "store", None)
+        if store is None:
+            store = self.store.reader()
+            self._thread_stores.store = store
+            with self._reader_lock:
+                self._reader_stores.append(store)
+        return store
+
+    def seed_report(self) -> dict[str, dict]:
+        """Per-channel latency, hit and contribution totals since startup.
 
+        ``mean_contribution`` is the channel's average share of the fused
+        seed activation; a channel that costs latency but contributes
+        little is a candidate for removal from ``seed_channels``.
+        """
+        return {name: stats.as_dict() for name, stats in self._channel_stats.items()}
+
+    def _entity_seeds(
+        self, query: str, filters: MemoryFilter | None, store: SQLiteStore | None = None
+    ) -> list[tuple[str, float]]:
+        """Seed memories whose entities the query names exactly.
+
+        Seeds shrink with the entity's fan; entities above ``max_entity_fan``
+        are too generic to seed from.
+        """
+        store = store or self.store
+        fans = store.entity_fans(query_entity_candidates(query))
+        seeds: dict[str, float] = {}
+        for entity, fan in fans.items():
+            if fan > self.max_entity_fan:
+                continue
+            activation = 1.0 / (1.0 + math.log(fan))
+            for mid in store.memories_for_entity(entity, filters):
+                if activation > seeds.get(mid, 0.0):
+                    seeds[mid] = activation
+        return sorted(seeds.items(), key=lambda kv: -kv[1])
+
+    def _vector_seeds(
+        self,
+        query: str,
+        limit: int,
+        filters: MemoryFilter | None,
+        store: SQLiteStore | None = None,
+    ) -> list[tuple[str, float]]:
+        """Seed memories whose embedding is close to the query's."""
+        return [
+            (mid, self.vector_weight * sim)
+            for mid, sim in self.vectors.search(query, limit=limit, filters=filters, store=store)
+            if sim >= VECTOR_MIN_SIMILARITY
+        ]
+
+    def memories_with_entity(self, entity: str) -> list[Memory]:
+        """All live memories tagged with ``entity`` (case-insensitive)."""
+        ids = self.store.memories_for_entity(normalize_entity(entity))
+        return [m for m in (self.store.get_memory(mid) for mid in ids) if m]
+
+    @timed_method("reinforce", writes=True)
     def reinforce(self, memory_id: str) -> None:
         """Explicitly boost a memory's strength."""
         mem = self.store.get_memory(memory_id)
@@ -148,17 +651,106 @@ class MemoryEngine:
         old = self.store.get_memory(old_id)
         if old:
             old.status = "superseded"
-            self.store.update_memory(old)
+            self.update(old)
         self.link(new_id, old_id, rel_type="same_as", weight=0.3)
 
     def contradict(self, id_a: str, id_b: str) -> None:
         """Mark two memories as contradicting each other."""
         self.link(id_a, id_b, rel_type="contradicts", weight=0.8)
 
+    def delete(self, memory_id: str) -> None:
+        """Tombstone a memory.
+
+        It leaves the FTS index and the activation graph immediately;
+        ``gc()`` removes the row and its edges for good.
+        """
+        self.store.mark_deleted([memory_id])
+
+    def gc(
+        self,
+        max_memories: int | None = None,
+        superseded_days: float | None = None,
+    ) -> dict:
+        """Purge tombstones, optionally enforce a capacity limit, and compact.
+
+        ``superseded_days`` tombstones memories that have been superseded
+        for longer than that. ``max_memories`` evicts the memories with the
+        lowest effective strength until at most that many remain. The
+        vector matrix, if the database has one, is rewritten without the
+        rows of purged and re-embedded memories, whether or not this engine
+        has the vector channel enabled.
+        """
+        now = time.time()
+        size_before = self.store.size_bytes()
+
+        expired = 0
+        if superseded_days is not None:
+            stale = self.store.superseded_before(now - superseded_days * 86400)
+            expired = self.store.mark_deleted(stale)
+
+        evicted = 0
+        if max_memories is not None:
+            rows = self.store.strength_inputs()
+            excess = len(rows) - max_memories
+            if excess > 0:
+                weakest = heapq.nsmallest(
+                    excess,
+                    rows,
+                    key=lambda r: strength_value(r[1], r[2], r[3], now),
+                )
+                evicted = self.store.mark_deleted([r[0] for r in weakest])
+
+        purged, edges_purged = self.store.purge_deleted()
+        if self.vectors is not None:
+            vector_rows = self.vectors.compact()
+        else:
+            from .vectors import compact_matrix, matrix_path
+
+            path = matrix_path(self.store.db_path)
+            vector_rows = compact_matrix(self.store, path) if path else 0
+        self.store.compact()
+
+        return {
+            "superseded_expired": expired,
+            "evicted": evicted,
+            "purged": purged,
+            "edges_purged": edges_purged,
+            "vector_rows_dropped": vector_rows,
+            "size_before": size_before,
+            "size_after": self.store.size_bytes(),
+        }
+
+    def archive(
+        self,
+        min_strength: float = 0.05,
+        idle_days: float | None = None,
+    ) -> dict:
+        """Move weak or stale memories, with their edges, to the archive tier.
+
+        A memory is archived when its effective strength is below
+        ``min_strength`` or, if ``idle_days`` is given, it has been neither
+        accessed nor created for that long. Requires ``archive_path``.
+        """
+        if not self.store.has_archive:
+            raise RuntimeError("MemoryEngine was created without an archive_path")
+        now = time.time()
+        ids = {
+            r[0]
+            for r in self.store.strength_inputs()
+            if strength_value(r[1], r[2], r[3], now) < min_strength
+        }
+        if idle_days is not None:
+            ids.update(self.store.idle_before(now - idle_days * 86400))
+        archived, edges = self.store.archive_memories(sorted(ids))
+        return {"archived": archived, "edges_archived": edges}
+
+    @timed_method("decay", writes=True)
     def decay_all(self) -> None:
         """Run a decay pass over all memories, reducing strength by natural decay."""
         now = time.time()
         for mem in self.store.all_memories():
+            if mem.status == "deleted":
+                continue
             days = (now - mem.updated_at) / 86400.0
             if days < 0.01:
                 continue
@@ -166,6 +758,17 @@ class MemoryEngine:
             mem.strength = max(0.0, min(1.0, mem.strength * decay))
             self.store.update_memory(mem)
 
+    def close(self) -> None:
+        """Stop the seeding threads and close every connection."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        with self._reader_lock:
+            for store in self._reader_stores:
+                store.close()
+            self._reader_stores.clear()
+        self.store.close()
+
     def stats(self) -> dict:
         """Return summary statistics about the memory store."""
         memories = self.store.all_memories()
@@ -183,4 +786,6 @@ class MemoryEngine:
             "active_count": sum(1 for m in memories if m.status == "active"),
             "superseded_count": sum(1 for m in memories if m.status == "superseded"),
             "contradicted_count": sum(1 for m in memories if m.status == "contradicted"),
+            "deleted_count": sum(1 for m in memories if m.status == "deleted"),
+            "archived_count": self.store.archived_count(),
         }
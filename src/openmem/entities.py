@@ -0,0 +1,172 @@
+"""Entity normalization shared by the entity index and query matching."""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Iterable
+
+# Characters stripped from the ends of query tokens before entity lookup.
+# Interior punctuation is kept so that names like "node.js" or "/api/users"
+# still match.
+_EDGE_PUNCTUATION = "\"'`()[]{}<>,;:!?."
+
+# Longest entity name, in words, that query matching will try
+MAX_ENTITY_WORDS = 3
+
+
+def normalize_entity(name: str) -> str:
+    """Normalize an entity name to its index key.
+
+    Mirrors the ``lower(trim(value))`` used by the SQLite triggers that
+    maintain ``memory_entities``: ASCII-only case folding, spaces trimmed.
+    """
+    return "".join(c.lower() if c.isascii() else c for c in name.strip(" "))
+
+
+def query_entity_candidates(query: str) -> list[str]:
+    """Normalized word n-grams of ``query`` that could name an entity."""
+    words = [w.strip(_EDGE_PUNCTUATION) for w in query.split()]
+    words = [w for w in words if w]
+    candidates: list[str] = []
+    seen: set[str] = set()
+    for n in range(1, MAX_ENTITY_WORDS + 1):
+        for i in range(len(words) - n + 1):
+            key = normalize_entity(" ".join(words[i:i + n]))
+            if key not in seen:
+                seen.add(key)
+                candidates.append(key)
+    return candidates
+
+
+def _words(text: str) -> list[str]:
+    """Whitespace tokens with edge punctuation stripped, empties dropped."""
+    words = (w.strip(_EDGE_PUNCTUATION) for w in text.split())
+    return [w for w in words if w]
+
+
+class EntityTagger:
+    """Finds known entity names in free text.
+
+    Patterns are compiled into a word-level Aho–Corasick automaton, so
+    tagging a text costs one pass over its words regardless of vocabulary
+    size, and matches always fall on word boundaries.
+
+    New names are matched from a small pending set (hash lookups over word
+    n-grams) and folded into the automaton once the pending set outgrows a
+    fraction of the compiled vocabulary, keeping the amortized cost of
+    ``add`` constant during bulk imports.
+    """
+
+    # Rebuild once pending names exceed this share of the compiled vocabulary
+    REBUILD_FRACTION = 0.125
+    MIN_PENDING_REBUILD = 64
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._compiled: set[tuple[str, ...]] = set()
+        self._pending: set[tuple[str, ...]] = set()
+        self._pending_max_words = 0
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[int, ...]] = [()]
+        self.add(names)
+        self._rebuild()
+
+    def __len__(self) -> int:
+        return len(self._compiled) + len(self._pending)
+
+    @staticmethod
+    def _key(name: str) -> tuple[str, ...]:
+        return tuple(normalize_entity(w) for w in _words(name))
+
+    def add(self, names: Iterable[str]) -> None:
+        """Add entity names to the vocabulary."""
+        for name in names:
+            key = self._key(name)
+            if not key or len(" ".join(key)) < 2:
+                continue
+            if key in self._compiled or key in self._pending:
+                continue
+            self._pending.add(key)
+            self._pending_max_words = max(self._pending_max_words, len(key))
+        threshold = max(self.MIN_PENDING_REBUILD, len(self._compiled) * self.REBUILD_FRACTION)
+        if len(self._pending) > threshold:
+            self._rebuild()
+
+    def _rebuild(self) -> None:
+        """Compile every known name into a fresh automaton."""
+        self._compiled |= self._pending
+        self._pending = set()
+        self._pending_max_words = 0
+
+        goto: list[dict[str, int]] = [{}]
+        out: list[tuple[int, ...]] = [()]
+        for key in self._compiled:
+            node = 0
+            for word in key:
+                nxt = goto[node].get(word)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][word] = nxt
+                    goto.append({})
+                    out.append(())
+                node = nxt
+            out[node] = (len(key),)
+
+        # Breadth-first failure links; outputs inherit along the fail chain
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for word, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and word not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(word, 0)
+                out[child] = out[child] + out[fail[child]]
+
+        self._goto, self._fail, self._out = goto, fail, out
+
+    def tag(self, text: str) -> list[str]:
+        """Entity mentions in ``text``, as written, in order of appearance."""
+        words = _words(text)
+        if not words:
+            return []
+        keys = [normalize_entity(w) for w in words]
+        spans: list[tuple[int, int]] = []
+
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for end, word in enumerate(keys, 1):
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+            for length in out[node]:
+                spans.append((end - length, end))
+
+        if self._pending:
+            for n in range(1, self._pending_max_words + 1):
+                for start in range(len(keys) - n + 1):
+                    if tuple(keys[start:start + n]) in self._pending:
+                        spans.append((start, start + n))
+
+        found: list[str] = []
+        seen: set[str] = set()
+        for start, end in sorted(spans):
+            surface = " ".join(words[start:end])
+            norm = normalize_entity(surface)
+            if norm not in seen:
+                seen.add(norm)
+                found.append(surface)
+        return found
+
+
+def load_entity_dictionary(path: str) -> list[str]:
+    """Read entity names from a text file, one per line; ``#`` starts a comment."""
+    names = []
+    with open(path, "r") as f:
+        for line in f:
+            name = line.split("#", 1)[0].strip()
+            if name:
+                names.append(name)
+    return names
@@ -0,0 +1,187 @@
+"""FTS5 query planning: turn a raw query into a selective MATCH expression.
+
+Queries are parsed into terms: bare words, ``"quoted phrases"`` and
+``prefix*`` terms. Each term is looked up in an ``fts5vocab`` table and
+terms that occur in too large a share of the index ("the", "we",
+"about") are dropped, so a long conversational query only walks the
+posting lists of its selective terms.
+
+Document frequencies are cached per term and refreshed after enough
+content writes or after ``STATS_TTL`` seconds, whichever comes first.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+
+# Terms found in more than this share of documents are dropped...
+MAX_DF_RATIO = 0.25
+
+# ...but only once the index is big enough for the ratio to be meaningful
+MIN_DOCS_FOR_PRUNING = 1000
+
+# Cached statistics survive this many content writes (or 1/20 of the
+# document count, if larger) and this many seconds
+STATS_WRITES = 100
+STATS_TTL = 300.0
+
+_QUERY_RE = re.compile(r'"([^"]*)"?|(\S+)')
+
+# Mirrors the unicode61 tokenizer closely enough for statistics:
+# letters and digits are token characters, everything else separates,
+# and case and diacritics are folded.
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+@dataclass
+class QueryTerm:
+    """One term of a parsed query."""
+
+    text: str
+    kind: str = "word"  # "word", "phrase" or "prefix"
+
+    @property
+    def tokens(self) -> list[str]:
+        return _TOKEN_RE.findall(_fold(self.text))
+
+    def to_fts(self) -> str:
+        quoted = '"' + self.text.replace('"', '""') + '"'
+        return quoted + "*" if self.kind == "prefix" else quoted
+
+
+def parse_query(query: str) -> list[QueryTerm]:
+    """Split a raw query into words, quoted phrases and prefix terms."""
+    terms: list[QueryTerm] = []
+    for match in _QUERY_RE.finditer(query):
+        phrase, word = match.groups()
+        if phrase is not None:
+            if _TOKEN_RE.search(phrase):
+                terms.append(QueryTerm(phrase.strip(), "phrase"))
+        elif word.endswith("*") and _TOKEN_RE.search(word.rstrip("*")):
+            terms.append(QueryTerm(word.rstrip("*"), "prefix"))
+        elif _TOKEN_RE.search(word):
+            terms.append(QueryTerm(word))
+    return terms
+
+
+class FTSQueryPlanner:
+    """Plans MATCH expressions for ``schema.memories_fts``.
+
+    One planner is shared by every connection of a store; statistics are
+    read through whichever connection is planning.
+    """
+
+    def __init__(
+        self,
+        schema: str = "main",
+        max_df_ratio: float = MAX_DF_RATIO,
+        min_docs: int = MIN_DOCS_FOR_PRUNING,
+    ):
+        self.schema = schema
+        self.max_df_ratio = max_df_ratio
+        self.min_docs = min_docs
+        self._lock = threading.Lock()
+        self._df: dict[str, int] = {}
+        self._docs: int | None = None
+        self._writes = 0
+        self._filled_at = 0.0
+        # Term statistics lookups served from / missing the cache
+        self.hits = 0
+        self.misses = 0
+
+    def note_writes(self, count: int = 1) -> None:
+        """Record content writes; enough of them invalidate the statistics."""
+        self._writes += count
+
+    def _fresh(self) -> bool:
+        if self._docs is None:
+            return False
+        if time.monotonic() - self._filled_at > STATS_TTL:
+            return False
+        return self._writes < max(STATS_WRITES, self._docs // 20)
+
+    def _vocab_table(self, conn: sqlite3.Connection) -> str:
+        name = f"{self.schema}_fts_vocab"
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS temp.{name} "
+            f"USING fts5vocab({self.schema}, memories_fts, row)"
+        )
+        return f"temp.{name}"
+
+    def doc_count(self, conn: sqlite3.Connection) -> int:
+        with self._lock:
+            if not self._fresh():
+                self._df.clear()
+                self._docs = conn.execute(
+                    f"SELECT COUNT(*) FROM {self.schema}.memories WHERE status != 'deleted'"
+                ).fetchone()[0]
+                self._writes = 0
+                self._filled_at = time.monotonic()
+            return self._docs
+
+    def doc_frequency(self, conn: sqlite3.Connection, term: QueryTerm) -> int:
+        """Documents containing ``term``, or an upper bound for it.
+
+        Phrases and multi-token words are bounded by their rarest token;
+        prefix terms by the summed frequency of their expansions.
+        """
+        self.doc_count(conn)  # refresh the cache if stale
+        tokens = term.tokens
+        if not tokens:
+            return 0
+        keys = list(tokens)
+        if term.kind == "prefix":
+            keys[-1] = keys[-1] + "*"
+        missing = [k for k in keys if k not in self._df]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            vocab = self._vocab_table(conn)
+            for key in missing:
+                if key.endswith("*"):
+                    stem = key[:-1]
+                    row = conn.execute(
+                        f"SELECT SUM(doc) FROM {vocab} WHERE term >= ? AND term < ?",
+                        (stem, stem + "\U0010ffff"),
+                    ).fetchone()
+                else:
+                    row = conn.execute(
+                        f"SELECT doc FROM {vocab} WHERE term = ?", (key,)
+                    ).fetchone()
+                self._df[key] = (row[0] or 0) if row else 0
+        return min(self._df[k] for k in keys)
+
+    def plan(self, conn: sqlite3.Connection, query: str) -> str:
+        """Return the MATCH expression for ``query`` ("" if nothing can match)."""
+        terms = parse_query(query)
+        if not terms:
+            return ""
+        docs = self.doc_count(conn)
+        if docs >= self.min_docs:
+            scored = [(self.doc_frequency(conn, t), t) for t in terms]
+            limit = docs * self.max_df_ratio
+            terms = [t for df, t in scored if df <= limit]
+            # If no selective term can match (df 0 may also mean the
+            # statistics are stale), keep the rarest term that can
+            matchable = [(df, t) for df, t in scored if df > 0]
+            if matchable and not any(0 < df <= limit for df, _ in scored):
+                terms.append(min(matchable, key=lambda ft: ft[0])[1])
+
+        seen: set[str] = set()
+        parts = []
+        for term in terms:
+            fts = term.to_fts()
+            if fts not in seen:
+                seen.add(fts)
+                parts.append(fts)
+        return " OR ".join(parts)
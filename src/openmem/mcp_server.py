@@ -1,9 +1,9 @@
 """OpenMem MCP server — persistent memory tools for Claude Code.
 
-Exposes 7 tools via FastMCP (stdio transport):
+Exposes 9 tools via FastMCP (stdio transport):
   memory_store, memory_recall, memory_link,
   memory_reinforce, memory_supersede, memory_contradict,
-  memory_stats
+  memory_stats, memory_metrics, memory_profile
 
 Run directly:
   python -m openmem.mcp_server
@@ -15,13 +15,17 @@ Or via the console script:
 from __future__ import annotations
 
 import os
+import time
 from pathlib import Path
 
 from mcp.server.fastmcp import FastMCP
 
 from openmem import MemoryEngine
+from openmem.entities import load_entity_dictionary
+from openmem.profiling import DEFAULT_KEEP, ToolProfiler
 from openmem._formatting import (
     format_memory,
+    format_metrics,
     format_recall_results,
     format_stats,
 )
@@ -31,12 +35,44 @@ from openmem._formatting import (
 # ---------------------------------------------------------------------------
 
 DEFAULT_DB = os.path.join(Path.home(), ".openmem", "memories.db")
+DEFAULT_ARCHIVE_DB = os.path.join(Path.home(), ".openmem", "archive.db")
+DEFAULT_ENTITIES = os.path.join(Path.home(), ".openmem", "entities.txt")
+DEFAULT_PROFILES = os.path.join(Path.home(), ".openmem", "profiles")
 db_path = os.environ.get("OPENMEM_DB", DEFAULT_DB)
+# The archive tier is opt-in: attached when OPENMEM_ARCHIVE_DB is set or
+# `openmem-engine archive` has created the default archive
+archive_path = os.environ.get("OPENMEM_ARCHIVE_DB") or (
+    DEFAULT_ARCHIVE_DB if os.path.exists(DEFAULT_ARCHIVE_DB) else None
+)
+entities_path = os.environ.get("OPENMEM_ENTITIES", DEFAULT_ENTITIES)
+# Opt-in: with OPENMEM_SLOWLOG set to a file path, recalls slower than
+# OPENMEM_SLOW_MS are logged there. The log traces every recall.
+slowlog_path = os.environ.get("OPENMEM_SLOWLOG", "off")
+slowlog_ms = float(os.environ.get("OPENMEM_SLOW_MS", "250"))
+
+# Tool calls are profiled when OPENMEM_PROFILE is set (or after
+# memory_profile("start")); the OPENMEM_PROFILE_KEEP slowest are kept.
+# stdout is the protocol channel, so profiles only go to files.
+profiler = ToolProfiler(
+    os.environ.get("OPENMEM_PROFILE_DIR", DEFAULT_PROFILES),
+    keep=int(os.environ.get("OPENMEM_PROFILE_KEEP", DEFAULT_KEEP)),
+    enabled=os.environ.get("OPENMEM_PROFILE", "") not in ("", "0", "false", "off"),
+)
 
 # Ensure the DB directory exists
 os.makedirs(os.path.dirname(db_path), exist_ok=True)
 
-engine = MemoryEngine(db_path=db_path)
+engine = MemoryEngine(
+    db_path=db_path,
+    archive_path=archive_path,
+    entity_dictionary=(
+        load_entity_dictionary(entities_path) if os.path.exists(entities_path) else None
+    ),
+    slow_log=(
+        None if slowlog_path in ("", "0", "false", "off") else os.path.expanduser(slowlog_path)
+    ),
+    slow_log_threshold_ms=slowlog_ms,
+)
 
 # Run decay pass on startup so stale memories lose strength naturally
 engine.decay_all()
@@ -52,6 +88,7 @@ mcp = FastMCP(
 
 
 @mcp.tool()
+@profiler.wrap
 def memory_store(
     text: str,
     type: str = "fact",
@@ -84,10 +121,15 @@ def memory_store(
 
 
 @mcp.tool()
+@profiler.wrap
 def memory_recall(
     query: str,
     top_k: int = 5,
     token_budget: int = 2000,
+    project_only: bool = False,
+    types: list[str] | None = None,
+    days: float | None = None,
+    deadline_ms: float | None = None,
 ) -> str:
     """Recall memories relevant to a query.
 
@@ -98,15 +140,32 @@ def memory_recall(
         query: The search query — what you want to remember.
         top_k: Maximum number of memories to return.
         token_budget: Approximate token budget for returned memories.
+        project_only: Only recall memories stored from the current project directory.
+        types: Only recall these memory types (e.g. ["decision", "constraint"]).
+        days: Only recall memories created within the last N days.
+        deadline_ms: Return the best results found within this many
+            milliseconds, skipping the remaining recall stages.
 
     Returns:
         Formatted list of matching memories ranked by relevance.
     """
-    results = engine.recall(query=query, top_k=top_k, token_budget=token_budget)
-    return format_recall_results(results)
+    results = engine.recall(
+        query=query,
+        top_k=top_k,
+        token_budget=token_budget,
+        project=os.getcwd() if project_only else None,
+        types=types,
+        since=time.time() - days * 86400 if days else None,
+        deadline_ms=deadline_ms,
+    )
+    output = format_recall_results(results)
+    if engine.last_truncated:
+        output += f"\n\n(Deadline reached; truncated stages: {', '.join(engine.last_truncated)})"
+    return output
 
 
 @mcp.tool()
+@profiler.wrap
 def memory_link(
     source_id: str,
     target_id: str,
@@ -136,6 +195,7 @@ def memory_link(
 
 
 @mcp.tool()
+@profiler.wrap
 def memory_reinforce(memory_id: str) -> str:
     """Reinforce a memory, boosting its strength.
 
@@ -156,6 +216,7 @@ def memory_reinforce(memory_id: str) -> str:
 
 
 @mcp.tool()
+@profiler.wrap
 def memory_supersede(old_id: str, new_id: str) -> str:
     """Mark an old memory as superseded by a newer one.
 
@@ -174,6 +235,7 @@ def memory_supersede(old_id: str, new_id: str) -> str:
 
 
 @mcp.tool()
+@profiler.wrap
 def memory_contradict(id_a: str, id_b: str) -> str:
     """Mark two memories as contradicting each other.
 
@@ -192,6 +254,7 @@ def memory_contradict(id_a: str, id_b: str) -> str:
 
 
 @mcp.tool()
+@profiler.wrap
 def memory_stats() -> str:
     """Get summary statistics about the memory store.
 
@@ -205,6 +268,51 @@ def memory_stats() -> str:
     return format_stats(stats)
 
 
+@mcp.tool()
+@profiler.wrap
+def memory_metrics() -> str:
+    """Get operational metrics for this server's memory engine.
+
+    Returns call counts, mean latency and last-minute p50/p95/p99 latency
+    for recall, store, link, reinforce and decay, plus cache hit rates,
+    SQLite lock errors and deadline truncations since the server started.
+
+    Returns:
+        Formatted metrics summary.
+    """
+    return format_metrics(engine.metrics.snapshot())
+
+
+@mcp.tool()
+def memory_profile(action: str = "status") -> str:
+    """Control profiling of this server's tool calls.
+
+    While profiling is on, every tool call runs under cProfile and the
+    slowest calls are saved to disk as .pstats, .collapsed (flame graph)
+    and .txt files.
+
+    Args:
+        action: "start" to turn profiling on, "stop" to turn it off,
+            "status" to list the saved profiles.
+
+    Returns:
+        Profiling state and the saved profiles, slowest first.
+    """
+    if action == "start":
+        profiler.enabled = True
+    elif action == "stop":
+        profiler.enabled = False
+    elif action != "status":
+        return f"Unknown action: {action} (use start, stop or status)"
+    lines = [
+        f"Profiling: {'on' if profiler.enabled else 'off'}",
+        f"Directory: {profiler.directory} (keeping the {profiler.keep} slowest calls)",
+    ]
+    for elapsed_ms, path in profiler.kept():
+        lines.append(f"  {elapsed_ms:8.1f} ms  {os.path.basename(path)}")
+    return "\n".join(lines)
+
+
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
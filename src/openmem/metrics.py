@@ -0,0 +1,295 @@
+"""In-process operational metrics: latency histograms and counters.
+
+Latencies are kept twice: in fixed cumulative buckets for Prometheus, and
+in HDR-style log-linear buckets (8 per power of two, so about 12% relative
+error at any magnitude) over a rolling window, from which p50/p95/p99 are
+read. Recording costs a few microseconds and needs no external service.
+"""
+
+from __future__ import annotations
+
+import bisect
+import functools
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+# Cumulative histogram bucket bounds, in seconds
+PROMETHEUS_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# Rolling window: WINDOW_SLOTS slots of SLOT_SECONDS each
+SLOT_SECONDS = 10.0
+WINDOW_SLOTS = 6
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Sub-buckets per power of two, as a bit count
+_SUB_BITS = 3
+_SUB_COUNT = 1 << _SUB_BITS
+
+
+def _bucket_index(micros: int) -> int:
+    if micros < 2 * _SUB_COUNT:
+        return max(micros, 0)
+    shift = micros.bit_length() - (_SUB_BITS + 1)
+    return (shift + 1) * _SUB_COUNT + (micros >> shift) - _SUB_COUNT
+
+
+def _bucket_midpoint(index: int) -> float:
+    """Midpoint of a log-linear bucket, in microseconds."""
+    if index < 2 * _SUB_COUNT:
+        return index + 0.5
+    shift = index // _SUB_COUNT - 1
+    low = (index % _SUB_COUNT + _SUB_COUNT) << shift
+    return low + (1 << shift) / 2
+
+
+class Histogram:
+    """Latency distribution: cumulative buckets plus a rolling HDR window."""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self._le_counts = [0] * (len(PROMETHEUS_BUCKETS) + 1)
+        self._slots: list[tuple[int, dict[int, int]]] = [(-1, {})] * WINDOW_SLOTS
+
+    def record(self, seconds: float, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        self.count += 1
+        self.sum += seconds
+        self._le_counts[bisect.bisect_left(PROMETHEUS_BUCKETS, seconds)] += 1
+
+        slot_id = int(now // SLOT_SECONDS)
+        position = slot_id % WINDOW_SLOTS
+        current_id, counts = self._slots[position]
+        if current_id != slot_id:
+            counts = {}
+            self._slots[position] = (slot_id, counts)
+        index = _bucket_index(int(seconds * 1_000_000))
+        counts[index] = counts.get(index, 0) + 1
+
+    def cumulative_buckets(self) -> list[tuple[float, int]]:
+        """``(upper_bound_seconds, count)`` pairs, ending with ``+Inf``."""
+        running = 0
+        result = []
+        for bound, n in zip(PROMETHEUS_BUCKETS + (float("inf"),), self._le_counts):
+            running += n
+            result.append((bound, running))
+        return result
+
+    def window_quantiles(
+        self, quantiles: tuple[float, ...] = QUANTILES, now: float | None = None
+    ) -> dict[float, float | None]:
+        """Latency quantiles (seconds) over the rolling window."""
+        now = time.monotonic() if now is None else now
+        oldest = int(now // SLOT_SECONDS) - WINDOW_SLOTS + 1
+        merged: dict[int, int] = {}
+        for slot_id, counts in self._slots:
+            if slot_id >= oldest:
+                for index, n in counts.items():
+                    merged[index] = merged.get(index, 0) + n
+        total = sum(merged.values())
+        if not total:
+            return {q: None for q in quantiles}
+        result = {}
+        ordered = sorted(merged.items())
+        for q in quantiles:
+            target = q * total
+            running = 0
+            for index, n in ordered:
+                running += n
+                if running >= target:
+                    result[q] = _bucket_midpoint(index) / 1_000_000
+                    break
+        return result
+
+
+def _label_text(labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+def _is_lock_error(error: sqlite3.OperationalError) -> bool:
+    message = str(error).lower()
+    return "locked" in message or "busy" in message
+
+
+def _summary(h: Histogram) -> dict:
+    """Count, mean and rolling quantiles of ``h``, in milliseconds."""
+    return {
+        "count": h.count,
+        "mean_ms": round(h.sum / h.count * 1000, 3) if h.count else None,
+        **{
+            f"p{int(q * 100)}_ms": None if v is None else round(v * 1000, 3)
+            for q, v in h.window_quantiles().items()
+        },
+    }
+
+
+class MetricsRegistry:
+    """Latency histograms per operation and labelled counters.
+
+    Besides each operation's latency, write operations record how long
+    they waited for SQLite's write lock (``observe_lock_wait``); a wait
+    that runs out the busy timeout is counted in ``sqlite_lock_errors``.
+
+    Thread-safe. One registry can be shared by several engines (the web
+    UI opens one engine per request) so their numbers add up.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: dict[str, Histogram] = {}
+        self._lock_waits: dict[str, Histogram] = {}
+        self._counters: dict[tuple[str, tuple[tuple[str, str], ...]], float] = {}
+
+    def observe(self, op: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(op)
+            if histogram is None:
+                histogram = self._histograms[op] = Histogram()
+            histogram.record(seconds)
+
+    def observe_lock_wait(self, op: str, seconds: float) -> None:
+        """Record time ``op`` spent waiting for the database write lock."""
+        with self._lock:
+            histogram = self._lock_waits.get(op)
+            if histogram is None:
+                histogram = self._lock_waits[op] = Histogram()
+            histogram.record(seconds)
+
+    def inc(self, name: str, n: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + n
+
+    @contextmanager
+    def timed(self, op: str) -> Iterator[None]:
+        """Record the block's latency under ``op``; count its errors."""
+        start = time.perf_counter()
+        try:
+            yield
+        except sqlite3.OperationalError as e:
+            if _is_lock_error(e):
+                self.inc("sqlite_lock_errors", op=op)
+            self.inc("operation_errors", op=op)
+            raise
+        except Exception:
+            self.inc("operation_errors", op=op)
+            raise
+        finally:
+            self.observe(op, time.perf_counter() - start)
+
+    def snapshot(self) -> dict:
+        """Plain-dict view: per-operation count, mean and rolling quantiles
+        (milliseconds), the same for write-lock waits, counters keyed
+        ``name{label="value"}`` and cache hit rates."""
+        with self._lock:
+            operations = {op: _summary(h) for op, h in sorted(self._histograms.items())}
+            lock_waits = {op: _summary(h) for op, h in sorted(self._lock_waits.items())}
+            counters = {
+                name + _label_text(labels): value
+                for (name, labels), value in sorted(self._counters.items())
+            }
+            lookups: dict[str, list[float]] = {}
+            for (name, labels), value in self._counters.items():
+                if name in ("cache_hits", "cache_misses"):
+                    cache = dict(labels).get("cache", "")
+                    entry = lookups.setdefault(cache, [0, 0])
+                    entry[name == "cache_misses"] += value
+            hit_rates = {
+                cache: round(hits / (hits + misses), 4)
+                for cache, (hits, misses) in sorted(lookups.items())
+                if hits + misses
+            }
+        return {
+            "operations": operations,
+            "lock_waits": lock_waits,
+            "counters": counters,
+            "cache_hit_rates": hit_rates,
+        }
+
+    def to_prometheus(self, prefix: str = "openmem") -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            if histograms:
+                name = f"{prefix}_operation_duration_seconds"
+                lines.append(f"# HELP {name} Latency of engine operations.")
+                lines.append(f"# TYPE {name} histogram")
+                for op, h in histograms:
+                    for bound, count in h.cumulative_buckets():
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f'{name}_bucket{{op="{op}",le="{le}"}} {count}')
+                    lines.append(f'{name}_sum{{op="{op}"}} {h.sum!r}')
+                    lines.append(f'{name}_count{{op="{op}"}} {h.count}')
+
+                name = f"{prefix}_operation_window_seconds"
+                lines.append(
+                    f"# HELP {name} Latency quantiles over the last "
+                    f"{int(SLOT_SECONDS * WINDOW_SLOTS)} seconds."
+                )
+                lines.append(f"# TYPE {name} gauge")
+                for op, h in histograms:
+                    for q, v in h.window_quantiles().items():
+                        if v is not None:
+                            lines.append(f'{name}{{op="{op}",quantile="{q}"}} {v!r}')
+
+            lock_waits = sorted(self._lock_waits.items())
+            if lock_waits:
+                name = f"{prefix}_sqlite_lock_wait_seconds"
+                lines.append(f"# HELP {name} Time write operations waited for the write lock.")
+                lines.append(f"# TYPE {name} histogram")
+                for op, h in lock_waits:
+                    for bound, count in h.cumulative_buckets():
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f'{name}_bucket{{op="{op}",le="{le}"}} {count}')
+                    lines.append(f'{name}_sum{{op="{op}"}} {h.sum!r}')
+                    lines.append(f'{name}_count{{op="{op}"}} {h.count}')
+
+            by_name: dict[str, list[tuple[tuple[tuple[str, str], ...], float]]] = {}
+            for (name, labels), value in sorted(self._counters.items()):
+                by_name.setdefault(name, []).append((labels, value))
+            for name, series in by_name.items():
+                full = f"{prefix}_{name}_total"
+                lines.append(f"# TYPE {full} counter")
+                for labels, value in series:
+                    lines.append(f"{full}{_label_text(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def timed_method(op: str, writes: bool = False) -> Callable:
+    """Decorate an engine method so its calls are timed in ``self.metrics``.
+
+    With ``writes``, the call takes the store's write lock before it runs
+    (``SQLiteStore.begin_write``) and the wait is recorded as a lock wait.
+    """
+
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.metrics.timed(op):
+                if not writes:
+                    return method(self, *args, **kwargs)
+                waited = self.store.begin_write()
+                if waited is None:  # inside another write operation
+                    return method(self, *args, **kwargs)
+                self.metrics.observe_lock_wait(op, waited)
+                ok = False
+                try:
+                    result = method(self, *args, **kwargs)
+                    ok = True
+                    return result
+                finally:
+                    self.store.end_write(ok)
+
+        return wrapper
+
+    return decorate
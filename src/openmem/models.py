@@ -40,3 +40,18 @@ class ScoredMemory:
     activation: float  # raw activation (seed + spread)
     components: dict = field(default_factory=dict)
     # breakdown: {activation, recency, strength, confidence}
+
+
+@dataclass
+class MemoryFilter:
+    """Restricts which memories recall may consider.
+
+    Unset fields match everything. Filters are applied inside SQLite, both
+    to BM25 candidates and to neighbors reached by spreading activation.
+    """
+    project: str | None = None
+    types: list[str] | None = None
+    sources: list[str] | None = None
+    statuses: list[str] | None = None
+    created_after: float | None = None  # epoch seconds, inclusive
+    created_before: float | None = None  # epoch seconds, exclusive
@@ -0,0 +1,158 @@
+"""Opt-in cProfile capture of MCP tool calls.
+
+The MCP server talks over stdout, so nothing here prints: profiles of the
+slowest calls are written to a directory as ``.pstats`` files (load with
+``python -m pstats`` or snakeviz), ``.collapsed`` stack files (for
+flamegraph.pl or speedscope) and a plain-text ``.txt`` summary.
+
+cProfile only follows the calling thread: seed channels that the engine
+runs on its ``openmem-seed`` pool show up as time waiting on futures.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import io
+import os
+import pstats
+import re
+import threading
+import time
+from typing import Callable
+
+DEFAULT_KEEP = 10
+
+# Collapsed stacks: deepest caller chain followed, and the smallest
+# weight (seconds) worth a line
+_MAX_STACK_DEPTH = 64
+_MIN_STACK_SECONDS = 1e-6
+
+_FILE_RE = re.compile(r"^(?P<stamp>\d+)-(?P<tool>.+)-(?P<ms>\d+)ms\.pstats$")
+
+
+def _label(func: tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == "~":
+        return name  # built-in
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapsed_stacks(stats: pstats.Stats) -> list[str]:
+    """Approximate collapsed stacks (``a;b;c weight_us``) from a profile.
+
+    cProfile records caller→callee edges, not full stacks, so each
+    function's own time is split across its callers in proportion to the
+    time each caller spent in it, recursively up to the roots.
+    """
+    raw = stats.stats  # func -> (cc, nc, tt, ct, callers)
+    weights: dict[str, float] = {}
+
+    def climb(func, path: list[str], seconds: float, seen: frozenset) -> None:
+        callers = raw[func][4]
+        total = sum(edge[3] for edge in callers.values())
+        if not callers or total <= 0 or len(path) >= _MAX_STACK_DEPTH:
+            key = ";".join(reversed(path))
+            weights[key] = weights.get(key, 0.0) + seconds
+            return
+        for caller, edge in callers.items():
+            share = seconds * edge[3] / total
+            if share < _MIN_STACK_SECONDS:
+                continue
+            if caller in seen or caller not in raw:
+                key = ";".join(reversed(path))
+                weights[key] = weights.get(key, 0.0) + share
+                continue
+            climb(caller, path + [_label(caller)], share, seen | {caller})
+
+    for func, (_, _, own, _, _) in raw.items():
+        if own >= _MIN_STACK_SECONDS:
+            climb(func, [_label(func)], own, frozenset([func]))
+    return [
+        f"{stack} {round(seconds * 1_000_000)}"
+        for stack, seconds in sorted(weights.items(), key=lambda kv: -kv[1])
+        if round(seconds * 1_000_000) > 0
+    ]
+
+
+class ToolProfiler:
+    """Profiles wrapped calls and keeps the ``keep`` slowest on disk.
+
+    Profiles already in ``directory`` count towards ``keep``, so the slowest
+    calls are retained across server restarts.
+    """
+
+    def __init__(self, directory: str, keep: int = DEFAULT_KEEP, enabled: bool = False):
+        self.directory = directory
+        self.keep = keep
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._kept: list[tuple[float, str]] = []  # (elapsed_ms, pstats path)
+        self._loaded = False
+
+    def wrap(self, fn: Callable) -> Callable:
+        """Decorate ``fn`` so that its calls are profiled while enabled."""
+        name = fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return fn(*args, **kwargs)
+            profile = cProfile.Profile()
+            start = time.perf_counter()
+            profile.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profile.disable()
+                self.record(name, (time.perf_counter() - start) * 1000, profile)
+
+        return wrapper
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.isdir(self.directory):
+            return
+        for filename in os.listdir(self.directory):
+            match = _FILE_RE.match(filename)
+            if match:
+                path = os.path.join(self.directory, filename)
+                self._kept.append((float(match["ms"]), path))
+        self._kept.sort()
+
+    def record(self, tool: str, elapsed_ms: float, profile: cProfile.Profile) -> str | None:
+        """Save ``profile`` if it is among the slowest; returns its path."""
+        with self._lock:
+            self._load()
+            if len(self._kept) >= self.keep and elapsed_ms <= self._kept[0][0]:
+                return None
+            os.makedirs(self.directory, exist_ok=True)
+            stem = os.path.join(
+                self.directory, f"{time.time_ns()}-{tool}-{round(elapsed_ms)}ms"
+            )
+            profile.dump_stats(stem + ".pstats")
+            stats = pstats.Stats(profile, stream=io.StringIO())
+            with open(stem + ".collapsed", "w", encoding="utf-8") as f:
+                f.writelines(line + "\n" for line in collapsed_stacks(stats))
+            with open(stem + ".txt", "w", encoding="utf-8") as f:
+                f.write(f"{tool}: {elapsed_ms:.1f} ms\n\n")
+                stats.stream = f
+                stats.sort_stats("cumulative").print_stats(40)
+            self._kept.append((elapsed_ms, stem + ".pstats"))
+            self._kept.sort()
+            while len(self._kept) > self.keep:
+                _, evicted = self._kept.pop(0)
+                for suffix in (".pstats", ".collapsed", ".txt"):
+                    try:
+                        os.remove(evicted[: -len(".pstats")] + suffix)
+                    except FileNotFoundError:
+                        pass
+            return stem + ".pstats"
+
+    def kept(self) -> list[tuple[float, str]]:
+        """``(elapsed_ms, pstats_path)`` of the retained profiles, slowest first."""
+        with self._lock:
+            self._load()
+            return sorted(self._kept, reverse=True)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+import sqlite3
 import time
 
 from .models import Memory, ScoredMemory
@@ -25,6 +26,7 @@ STATUS_PENALTY = {
     "active": 1.0,
     "superseded": 0.5,
     "contradicted": 0.3,
+    "deleted": 0.0,
 }
 
 
@@ -41,13 +43,116 @@ def strength_score(memory: Memory, now: float | None = None) -> float:
     """Strength with reinforcement and natural decay, clamped to [0, 1]."""
     if now is None:
         now = time.time()
-    days_since_creation = (now - memory.created_at) / 86400.0
-    raw = memory.strength * (1 + memory.access_count) ** BETA_REINFORCE * math.exp(
+    return strength_value(memory.strength, memory.access_count, memory.created_at, now)
+
+
+def strength_value(
+    strength: float, access_count: int, created_at: float, now: float
+) -> float:
+    """``strength_score`` computed from raw column values."""
+    days_since_creation = (now - created_at) / 86400.0
+    raw = strength * (1 + access_count) ** BETA_REINFORCE * math.exp(
         -ALPHA_DECAY * days_since_creation
     )
     return max(0.0, min(1.0, raw))
 
 
+def recency_value(ref_time: float, now: float) -> float:
+    """``recency_score`` computed from the reference timestamp."""
+    return math.exp(-LAMBDA_RECENCY * (now - ref_time) / 86400.0)
+
+
+def score_estimate(
+    activation: float,
+    ref_time: float,
+    strength: float,
+    access_count: int,
+    created_at: float,
+    confidence: float,
+    status: str,
+    weights: dict[str, float] | None = None,
+    now: float | None = None,
+) -> float:
+    """Competition score of one candidate from raw column values.
+
+    Unlike ``compete`` nothing is normalized across candidates, so the
+    estimate can be computed row by row while candidates stream in.
+    """
+    if now is None:
+        now = time.time()
+    w = weights or DEFAULT_WEIGHTS
+    score = (
+        w["activation"] * activation
+        + w["recency"] * recency_value(ref_time, now)
+        + w["strength"] * strength_value(strength, access_count, created_at, now)
+        + w["confidence"] * confidence
+    )
+    return score * STATUS_PENALTY.get(status, 1.0)
+
+
+def score_upper_bound(
+    activation: float,
+    bounds: dict[str, float],
+    weights: dict[str, float] | None = None,
+    now: float | None = None,
+) -> float:
+    """Best ``score_estimate`` any memory with at most ``activation`` can reach.
+
+    ``bounds`` holds store-wide maxima, as returned by
+    ``SQLiteStore.score_bounds``.
+    """
+    if now is None:
+        now = time.time()
+    w = weights or DEFAULT_WEIGHTS
+    strength = min(
+        1.0, bounds["strength"] * (1 + bounds["access_count"]) ** BETA_REINFORCE
+    )
+    return (
+        w["activation"] * activation
+        + w["recency"] * min(1.0, recency_value(bounds["ref_time"], now))
+        + w["strength"] * strength
+        + w["confidence"] * bounds["confidence"]
+    )
+
+
+def weighted_score(
+    activation: float,
+    recency: float,
+    strength: float,
+    confidence: float,
+    status: str,
+    w_activation: float = DEFAULT_WEIGHTS["activation"],
+    w_recency: float = DEFAULT_WEIGHTS["recency"],
+    w_strength: float = DEFAULT_WEIGHTS["strength"],
+    w_confidence: float = DEFAULT_WEIGHTS["confidence"],
+) -> float:
+    """Competition score from already-normalized components.
+
+    The same formula ``compete`` applies; registered in SQLite as
+    ``openmem_score`` so candidates can be ranked inside the database.
+    """
+    score = (
+        w_activation * activation
+        + w_recency * recency
+        + w_strength * strength
+        + w_confidence * confidence
+    )
+    return score * STATUS_PENALTY.get(status, 1.0)
+
+
+def register_sql_functions(conn: sqlite3.Connection) -> None:
+    """Register the scoring formulas as deterministic SQLite functions.
+
+    ``openmem_recency(ref_time, now)``,
+    ``openmem_strength(strength, access_count, created_at, now)`` and
+    ``openmem_score(activation, recency, strength, confidence, status,
+    w_activation, w_recency, w_strength, w_confidence)``.
+    """
+    conn.create_function("openmem_recency", 2, recency_value, deterministic=True)
+    conn.create_function("openmem_strength", 4, strength_value, deterministic=True)
+    conn.create_function("openmem_score", 9, weighted_score, deterministic=True)
+
+
 def _normalize(values: dict[str, float]) -> dict[str, float]:
     """Min-max normalize to [0, 1]. If all values are equal, return 1.0 for all."""
     if not values:
@@ -95,15 +200,17 @@ def compete(
             "strength": norm_strength[mid],
             "confidence": mem.confidence,
         }
-        score = (
-            w["activation"] * components["activation"]
-            + w["recency"] * components["recency"]
-            + w["strength"] * components["strength"]
-            + w["confidence"] * components["confidence"]
+        score = weighted_score(
+            components["activation"],
+            components["recency"],
+            components["strength"],
+            components["confidence"],
+            mem.status,
+            w["activation"],
+            w["recency"],
+            w["strength"],
+            w["confidence"],
         )
-        # Apply status penalty
-        penalty = STATUS_PENALTY.get(mem.status, 1.0)
-        score *= penalty
 
         results.append(
             ScoredMemory(
@@ -0,0 +1,188 @@
+"""Seed channels: concurrent execution and score fusion."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from concurrent.futures import Executor, wait
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Iterable
+
+if TYPE_CHECKING:
+    from .store import SQLiteStore
+
+# Per-channel fusion weights. Entity and vector hits are corroborating
+# evidence; BM25 stays the primary signal.
+CHANNEL_WEIGHTS = {"bm25": 1.0, "entity": 0.5, "vector": 0.5}
+
+# A channel maps a store to a ranked list of (memory_id, activation)
+Channel = Callable[["SQLiteStore"], list[tuple[str, float]]]
+
+
+@dataclass
+class ChannelReport:
+    """How one seed channel did on one recall."""
+
+    name: str
+    latency_ms: float = 0.0
+    hits: int = 0
+    contribution: float = 0.0  # share of the fused seed mass
+    timed_out: bool = False
+    error: str | None = None
+
+
+@dataclass
+class ChannelStats:
+    """Running totals for one seed channel across recalls."""
+
+    calls: int = 0
+    total_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+    hits: int = 0
+    contribution: float = 0.0
+    timeouts: int = 0
+    errors: int = 0
+
+    def record(self, report: ChannelReport) -> None:
+        self.calls += 1
+        self.total_latency_ms += report.latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, report.latency_ms)
+        self.hits += report.hits
+        self.contribution += report.contribution
+        self.timeouts += report.timed_out
+        self.errors += report.error is not None
+
+    def as_dict(self) -> dict:
+        calls = self.calls or 1
+        return {
+            "calls": self.calls,
+            "mean_latency_ms": round(self.total_latency_ms / calls, 3),
+            "max_latency_ms": round(self.max_latency_ms, 3),
+            "mean_hits": round(self.hits / calls, 2),
+            "mean_contribution": round(self.contribution / calls, 3),
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+        }
+
+
+def fuse_seeds(
+    rankings: dict[str, list[tuple[str, float]]],
+    primary: str = "bm25",
+    weights: dict[str, float] | None = None,
+) -> tuple[dict[str, float], dict[str, float]]:
+    """Fuse channel hits, keeping the primary channel's activations.
+
+    Memories the ``primary`` channel found seed at its activation,
+    unchanged. The other channels only add memories it missed, each at the
+    sum of ``weight * activation`` over the channels that found it. Scores
+    keep their magnitudes: fusing by rank would flatten the BM25 score gaps
+    that spreading and competition rely on, and boosting BM25 hits that
+    another channel also matched reorders them on weaker evidence. Returns
+    the fused activations and each channel's share of the fused mass.
+    """
+    weights = CHANNEL_WEIGHTS if weights is None else weights
+    fused = dict(rankings.get(primary, []))
+    mass = {name: 0.0 for name in rankings}
+    mass[primary] = sum(fused.values())
+    found = set(fused)
+    for name, ranked in rankings.items():
+        if name == primary:
+            continue
+        weight = weights.get(name, 1.0)
+        for mid, activation in ranked:
+            if mid in found:
+                continue
+            share = weight * activation
+            fused[mid] = fused.get(mid, 0.0) + share
+            mass[name] += share
+    if primary not in rankings:
+        del mass[primary]
+    total = sum(mass.values()) or 1.0
+    return fused, {name: m / total for name, m in mass.items()}
+
+
+def run_channels(
+    channels: dict[str, Channel],
+    store: SQLiteStore,
+    pool: Executor | None = None,
+    thread_store: Callable[[], SQLiteStore] | None = None,
+    budget_ms: float | None = None,
+    anytime: Iterable[str] = (),
+    primary: Iterable[str] = (),
+) -> tuple[dict[str, list[tuple[str, float]]], dict[str, ChannelReport]]:
+    """Run seed channels and collect their ranked hits.
+
+    With a ``pool``, channels run concurrently, each on the store returned
+    by ``thread_store`` in its worker thread; channels still running after
+    ``budget_ms`` are dropped and their SQLite work interrupted. Without a
+    pool they run one after another on ``store``, and channels not yet
+    started when ``budget_ms`` has elapsed are skipped. Channels named in
+    ``anytime`` bound their own latency (they stop early and return what
+    they have), so they are always run and waited for.
+
+    A failing channel is reported and otherwise ignored. For channels named
+    in ``primary`` only SQLite errors are; anything else propagates, since
+    recall without its primary channel would silently degrade.
+    """
+    anytime = set(anytime)
+    primary = set(primary)
+    reports = {name: ChannelReport(name) for name in channels}
+    results: dict[str, list[tuple[str, float]]] = {}
+
+    def failed(name: str, error: Exception) -> None:
+        if name in primary and not isinstance(error, sqlite3.Error):
+            raise error
+        reports[name].error = f"{type(error).__name__}: {error}"
+
+    if pool is None:
+        began = time.perf_counter()
+        for name, channel in channels.items():
+            start = time.perf_counter()
+            over_budget = budget_ms is not None and (start - began) * 1000 >= budget_ms
+            if over_budget and name not in anytime:
+                reports[name].timed_out = True
+                continue
+            try:
+                results[name] = channel(store)
+            except Exception as e:
+                failed(name, e)
+            reports[name].latency_ms = (time.perf_counter() - start) * 1000
+            reports[name].hits = len(results.get(name, ()))
+        return results, reports
+
+    worker_stores: dict[str, SQLiteStore] = {}
+
+    def task(name: str, channel: Channel) -> tuple[list[tuple[str, float]], float]:
+        worker_store = thread_store() if thread_store else store
+        worker_stores[name] = worker_store
+        start = time.perf_counter()
+        hits = channel(worker_store)
+        return hits, (time.perf_counter() - start) * 1000
+
+    futures = {pool.submit(task, name, ch): name for name, ch in channels.items()}
+    done, pending = wait(futures, timeout=None if budget_ms is None else budget_ms / 1000)
+    late = [future for future in pending if futures[future] in anytime]
+    if late:
+        wait(late)
+        done |= set(late)
+        pending -= set(late)
+
+    for future in pending:
+        name = futures[future]
+        reports[name].timed_out = True
+        reports[name].latency_ms = budget_ms or 0.0
+        future.cancel()
+        if name in worker_stores:
+            worker_stores[name].conn.interrupt()
+    for future in done:
+        name = futures[future]
+        try:
+            hits, latency_ms = future.result()
+        except Exception as e:
+            failed(name, e)
+            continue
+        results[name] = hits
+        reports[name].latency_ms = latency_ms
+        reports[name].hits = len(hits)
+    # Channel order, not completion order, so fusion is deterministic
+    return {name: results[name] for name in channels if name in results}, reports
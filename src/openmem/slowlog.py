@@ -0,0 +1,190 @@
+"""Slow-recall log: recalls over a threshold, with their query plans.
+
+Each slow recall is appended to a JSONL file as one object with the
+query, the planned FTS expression, stage timings, row counts and the
+``EXPLAIN QUERY PLAN`` of every distinct statement template it ran. The file
+is bounded: once it holds ``max_entries`` lines the oldest quarter is
+dropped.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from .trace import statement_shape
+
+if TYPE_CHECKING:
+    from .trace import RecallTrace
+
+DEFAULT_THRESHOLD_MS = 250.0
+DEFAULT_MAX_ENTRIES = 1000
+
+# Statement kinds worth explaining; the rest (PRAGMA, DDL, trigger
+# bodies reported as "-- TRIGGER ...") are skipped
+_EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "INSERT", "DELETE")
+
+
+def explain_statements(
+    conn: sqlite3.Connection, statements: dict[str, int]
+) -> list[dict]:
+    """Query plans for the statement templates in ``statements``.
+
+    ``statements`` maps SQL to execution counts, as collected by
+    ``RecallTrace``. Each statement is reduced to its template (see
+    ``statement_shape``) and explained with ``NULL`` bound to every
+    placeholder, so the plan does not depend on whether the trace callback
+    expanded parameters. Returns one entry per template:
+    ``{"sql": template, "count": executions, "plan": [detail, ...]}``,
+    most executed first.
+    """
+    shapes: dict[str, dict] = {}
+    for sql, count in statements.items():
+        if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+            continue
+        shape = statement_shape(sql)
+        entry = shapes.get(shape)
+        if entry is None:
+            try:
+                rows = conn.execute(
+                    "EXPLAIN QUERY PLAN " + shape, (None,) * shape.count("?")
+                ).fetchall()
+                plan = [row[3] for row in rows]
+            except sqlite3.Error as e:
+                plan = [f"error: {e}"]
+            entry = shapes[shape] = {"sql": shape, "count": 0, "plan": plan}
+        entry["count"] += count
+    return sorted(shapes.values(), key=lambda e: -e["count"])
+
+
+class SlowQueryLog:
+    """Recall hook that appends slow recalls to a bounded JSONL file.
+
+    Register with ``MemoryEngine.add_recall_hook``, or pass ``slow_log=``
+    to the engine. ``conn`` is used to ``EXPLAIN`` the statements.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        conn: sqlite3.Connection,
+        threshold_ms: float = DEFAULT_THRESHOLD_MS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.conn = conn
+        self.threshold_ms = threshold_ms
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._lines: int | None = None
+
+    def __call__(self, trace: RecallTrace) -> None:
+        if trace.total_ms < self.threshold_ms:
+            return
+        entry = {
+            "ts": time.time(),
+            **trace.as_dict(),
+            "plans": explain_statements(self.conn, trace.statements),
+        }
+        self.append(entry)
+
+    def append(self, entry: dict) -> None:
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._lines is None:
+                self._lines = 0
+                if os.path.exists(self.path):
+                    with open(self.path, encoding="utf-8") as f:
+                        self._lines = sum(1 for _ in f)
+            if self._lines >= self.max_entries:
+                self._trim()
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+            self._lines += 1
+
+    def _trim(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.readlines()
+        keep = lines[len(lines) - self.max_entries * 3 // 4:]
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(keep)
+        os.replace(tmp, self.path)
+        self._lines = len(keep)
+
+
+def read_slow_log(path: str) -> list[dict]:
+    """Entries of a slow log, oldest first; unreadable lines are skipped."""
+    entries = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def summarize_slow_log(entries: list[dict], top: int = 10) -> dict:
+    """Aggregate slow-log entries for reporting.
+
+    Returns the entry count and time span, total-latency percentiles,
+    each stage's share of the total time, the ``top`` slowest recalls and
+    the plan steps that scan a table or materialized subquery, by how many
+    entries hit them.
+    """
+    if not entries:
+        return {"count": 0}
+    totals = sorted(e["total_ms"] for e in entries)
+
+    def percentile(q: float) -> float:
+        return totals[min(len(totals) - 1, int(q * len(totals)))]
+
+    stage_ms: dict[str, float] = {}
+    for e in entries:
+        for stage, ms in e.get("stages", {}).items():
+            stage_ms[stage] = stage_ms.get(stage, 0.0) + ms
+    grand = sum(stage_ms.values()) or 1.0
+
+    scans: dict[str, int] = {}
+    for e in entries:
+        seen = set()
+        for plan in e.get("plans", []):
+            for step in plan["plan"]:
+                # FTS5 MATCH lookups show up as virtual-table scans
+                if step.startswith("SCAN") and "VIRTUAL TABLE" not in step and step not in seen:
+                    seen.add(step)
+                    scans[step] = scans.get(step, 0) + 1
+
+    slowest = sorted(entries, key=lambda e: -e["total_ms"])[:top]
+    return {
+        "count": len(entries),
+        "first_ts": entries[0].get("ts"),
+        "last_ts": entries[-1].get("ts"),
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "max_ms": totals[-1],
+        "stage_share": {
+            stage: ms / grand
+            for stage, ms in sorted(stage_ms.items(), key=lambda kv: -kv[1])
+        },
+        "slowest": [
+            {
+                "ts": e.get("ts"),
+                "query": e.get("query", ""),
+                "fts_query": e.get("fts_query", ""),
+                "total_ms": e["total_ms"],
+                "slowest_stage": max(e["stages"], key=e["stages"].get) if e.get("stages") else None,
+                "counts": e.get("counts", {}),
+            }
+            for e in slowest
+        ],
+        "full_scans": dict(sorted(scans.items(), key=lambda kv: -kv[1])),
+    }
@@ -3,19 +3,94 @@ from __future__ import annotations
 import json
 import sqlite3
 import time
-from typing import Optional
+from typing import Callable, Optional
 
-from .models import Edge, Memory
+from .fts import FTSQueryPlanner
+from .models import Edge, Memory, MemoryFilter
+from .scoring import DEFAULT_WEIGHTS, register_sql_functions
+
+# Explicit column list shared by the hot and archive ``memories`` tables
+_MEMORY_COLUMNS = (
+    "id, type, text, gist, entities, created_at, updated_at, strength, "
+    "confidence, access_count, last_accessed, status, source, project"
+)
 
 
 class SQLiteStore:
     def __init__(self, db_path: str = ":memory:"):
+        self.db_path = db_path
         self.conn = sqlite3.connect(db_path)
         self.conn.row_factory = sqlite3.Row
+        register_sql_functions(self.conn)
+        # Must precede table creation to take effect on a new database
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
         self.conn.execute("PRAGMA journal_mode=WAL")
         self.conn.execute("PRAGMA foreign_keys=ON")
+        self.has_archive = False
+        # sqlite3.connect's default; see set_busy_timeout()
+        self.busy_timeout_ms = 5000
+        self._fts_planners = {"main": FTSQueryPlanner("main")}
+        # Upper bounds of the score inputs; see score_bounds()
+        self._score_bounds: dict[str, float] = {}
         self._create_tables()
 
+    def set_busy_timeout(self, ms: int) -> None:
+        """How long to wait on a locked database before failing.
+
+        Applies to this connection and to readers opened after the call.
+        """
+        self.conn.execute(f"PRAGMA busy_timeout = {int(ms)}")
+        self.busy_timeout_ms = int(ms)
+
+    def begin_write(self) -> float | None:
+        """Take the write lock now, with ``BEGIN IMMEDIATE``.
+
+        Waits for other writers for up to the busy timeout, then raises
+        ``sqlite3.OperationalError``. Returns the seconds spent waiting, or
+        ``None`` (taking nothing) if a transaction is already open. The
+        next ``commit`` releases the lock; ``end_write`` closes the
+        transaction if nothing committed it.
+        """
+        if self.conn.in_transaction:
+            return None
+        start = time.perf_counter()
+        self.conn.execute("BEGIN IMMEDIATE")
+        return time.perf_counter() - start
+
+    def end_write(self, ok: bool = True) -> None:
+        """Commit (or, if not ``ok``, roll back) a transaction left open."""
+        if self.conn.in_transaction:
+            if ok:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+
+    def reader(self) -> SQLiteStore:
+        """Open a second connection to the same database for read-only use.
+
+        Lets another thread query a file database concurrently (WAL mode
+        allows readers alongside the writer). Schema setup is skipped and
+        the archive is not attached, and it uses this store's busy timeout.
+        Not available for ``:memory:``.
+
+        The connection may be closed from another thread once its user is
+        done with it (``MemoryEngine.close`` does so for its seed workers).
+        """
+        if self.db_path == ":memory:":
+            raise ValueError("in-memory databases cannot be shared across connections")
+        store = SQLiteStore.__new__(SQLiteStore)
+        store.db_path = self.db_path
+        store.conn = sqlite3.connect(
+            self.db_path, timeout=self.busy_timeout_ms / 1000, check_same_thread=False
+        )
+        store.conn.row_factory = sqlite3.Row
+        register_sql_functions(store.conn)
+        store.has_archive = False
+        store.busy_timeout_ms = self.busy_timeout_ms
+        store._fts_planners = {"main": self._fts_planners["main"]}
+        store._score_bounds = self._score_bounds
+        return store
+
     def _create_tables(self) -> None:
         self.conn.executescript("""
             CREATE TABLE IF NOT EXISTS memories (
@@ -52,37 +127,230 @@ class SQLiteStore:
                 content='memories',
                 content_rowid='rowid'
             );
+        """)
+        self.conn.commit()
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Bring older databases up to the current schema.
+
+        Column additions are idempotent; later steps are gated on
+        ``PRAGMA user_version``.
+        """
+        for col in ("source TEXT DEFAULT ''", "project TEXT DEFAULT ''"):
+            try:
+                self.conn.execute(f"ALTER TABLE memories ADD COLUMN {col}")
+            except sqlite3.OperationalError:
+                pass  # column already exists
+        self.conn.commit()
+        self._create_indexes()
+
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            self._install_fts_triggers()
+            self.conn.execute("PRAGMA user_version = 1")
+        if version < 2:
+            self._install_entity_index()
+            self.conn.execute("PRAGMA user_version = 2")
+        if version < 3:
+            self._install_vector_table()
+            self.conn.execute("PRAGMA user_version = 3")
+        if version < 4:
+            self._upgrade_vector_table()
+            self.conn.execute("PRAGMA user_version = 4")
+        if version < 5:
+            self._install_vector_table()
+            self.conn.execute("PRAGMA user_version = 5")
+        self.conn.commit()
+
+    def _install_fts_triggers(self) -> None:
+        """(Re)create the triggers that keep ``memories_fts`` in sync.
+
+        Tombstoned rows (status ``deleted``) are kept out of the index, and
+        updates only touch the index when indexed content or indexed-ness
+        changes, so access bumps and decay passes do not churn FTS segments.
+        Databases created with the earlier unconditional triggers have their
+        tombstones removed from the index here.
+        """
+        self.conn.executescript("""
+            DROP TRIGGER IF EXISTS memories_ai;
+            DROP TRIGGER IF EXISTS memories_ad;
+            DROP TRIGGER IF EXISTS memories_au;
 
-            -- Triggers to keep FTS in sync
-            CREATE TRIGGER IF NOT EXISTS memories_ai AFTER INSERT ON memories BEGIN
+            INSERT INTO memories_fts(memories_fts, rowid, id, text, gist, entities)
+            SELECT 'delete', rowid, id, text, gist, entities
+            FROM memories WHERE status = 'deleted';
+
+            CREATE TRIGGER memories_ai AFTER INSERT ON memories
+            WHEN new.status != 'deleted' BEGIN
                 INSERT INTO memories_fts(rowid, id, text, gist, entities)
                 VALUES (new.rowid, new.id, new.text, new.gist, new.entities);
             END;
 
-            CREATE TRIGGER IF NOT EXISTS memories_ad AFTER DELETE ON memories BEGIN
+            CREATE TRIGGER memories_ad AFTER DELETE ON memories
+            WHEN old.status != 'deleted' BEGIN
                 INSERT INTO memories_fts(memories_fts, rowid, id, text, gist, entities)
                 VALUES ('delete', old.rowid, old.id, old.text, old.gist, old.entities);
             END;
 
-            CREATE TRIGGER IF NOT EXISTS memories_au AFTER UPDATE ON memories BEGIN
+            CREATE TRIGGER memories_au AFTER UPDATE OF text, gist, entities, status ON memories
+            WHEN old.text IS NOT new.text
+                OR old.gist IS NOT new.gist
+                OR old.entities IS NOT new.entities
+                OR (old.status = 'deleted') != (new.status = 'deleted')
+            BEGIN
                 INSERT INTO memories_fts(memories_fts, rowid, id, text, gist, entities)
-                VALUES ('delete', old.rowid, old.id, old.text, old.gist, old.entities);
+                SELECT 'delete', old.rowid, old.id, old.text, old.gist, old.entities
+                WHERE old.status != 'deleted';
                 INSERT INTO memories_fts(rowid, id, text, gist, entities)
-                VALUES (new.rowid, new.id, new.text, new.gist, new.entities);
+                SELECT new.rowid, new.id, new.text, new.gist, new.entities
+                WHERE new.status != 'deleted';
             END;
         """)
-        self.conn.commit()
-        self._migrate()
 
-    def _migrate(self) -> None:
-        """Add columns that may not exist in older databases."""
-        for col in ("source TEXT DEFAULT ''", "project TEXT DEFAULT ''"):
-            try:
-                self.conn.execute(f"ALTER TABLE memories ADD COLUMN {col}")
-            except sqlite3.OperationalError:
-                pass  # column already exists
+    def _install_entity_index(self) -> None:
+        """Create ``memory_entities`` and backfill it from ``memories.entities``.
+
+        The table maps each normalized entity name to the live memories that
+        mention it and is maintained by triggers, like the FTS index.
+        """
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS memory_entities (
+                entity TEXT NOT NULL,
+                memory_id TEXT NOT NULL,
+                PRIMARY KEY (entity, memory_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_memory_entities_memory
+                ON memory_entities(memory_id);
+
+            CREATE TRIGGER IF NOT EXISTS memory_entities_ai AFTER INSERT ON memories
+            WHEN new.status != 'deleted' BEGIN
+                INSERT OR IGNORE INTO memory_entities (entity, memory_id)
+                SELECT lower(trim(value)), new.id FROM json_each(new.entities)
+                WHERE trim(value) != '';
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS memory_entities_ad AFTER DELETE ON memories BEGIN
+                DELETE FROM memory_entities WHERE memory_id = old.id;
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS memory_entities_au AFTER UPDATE OF entities, status ON memories
+            WHEN old.entities IS NOT new.entities
+                OR (old.status = 'deleted') != (new.status = 'deleted')
+            BEGIN
+                DELETE FROM memory_entities WHERE memory_id = old.id;
+                INSERT OR IGNORE INTO memory_entities (entity, memory_id)
+                SELECT lower(trim(value)), new.id FROM json_each(new.entities)
+                WHERE trim(value) != '' AND new.status != 'deleted';
+            END;
+
+            INSERT OR IGNORE INTO memory_entities (entity, memory_id)
+            SELECT lower(trim(j.value)), m.id FROM memories m, json_each(m.entities) j
+            WHERE m.status != 'deleted' AND trim(j.value) != '';
+        """)
+
+    def _install_vector_table(self) -> None:
+        """Create ``memory_vectors``, the row map of the vector matrix file.
+
+        Each row number is the memory's row in the matrix; ``scale`` is its
+        int8 dequantization factor. Rows outlive their memory while it sits
+        in the archive and are dropped by ``purge_deleted``.
+
+        Row numbers are not reused (``AUTOINCREMENT``): other processes
+        only load rows above the highest they have seen. A memory's row is
+        dropped when its text or gist changes, since its vector no longer
+        matches; ``VectorIndex.sync`` or ``MemoryEngine.update`` re-embeds it.
+        The dead rows this leaves in the matrix are reclaimed by
+        ``renumber_vector_rows``, which bumps ``memory_vectors_state``'s
+        generation so that other processes reload the matrix.
+        """
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS memory_vectors (
+                row INTEGER PRIMARY KEY AUTOINCREMENT,
+                memory_id TEXT NOT NULL UNIQUE,
+                scale REAL NOT NULL
+            );
+
+            CREATE TABLE IF NOT EXISTS memory_vectors_state (
+                generation INTEGER NOT NULL
+            );
+            INSERT INTO memory_vectors_state (generation)
+            SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM memory_vectors_state);
+
+            CREATE TRIGGER IF NOT EXISTS memory_vectors_au AFTER UPDATE OF text, gist ON memories
+            WHEN old.text IS NOT new.text OR old.gist IS NOT new.gist BEGIN
+                DELETE FROM memory_vectors WHERE memory_id = old.id;
+            END;
+        """)
+
+    def _upgrade_vector_table(self) -> None:
+        """Rebuild a ``memory_vectors`` table created without ``AUTOINCREMENT``,
+        keeping its rows, and add the stale-vector trigger."""
+        sql = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'memory_vectors'"
+        ).fetchone()[0]
+        if "AUTOINCREMENT" in sql.upper():
+            self._install_vector_table()
+            return
+        self.conn.execute("ALTER TABLE memory_vectors RENAME TO memory_vectors_v3")
+        self._install_vector_table()
+        self.conn.executescript("""
+            INSERT INTO memory_vectors (row, memory_id, scale)
+            SELECT row, memory_id, scale FROM memory_vectors_v3;
+            DROP TABLE memory_vectors_v3;
+        """)
+
+    def _create_indexes(self) -> None:
+        """Index the columns used by recall filters and graph traversal.
+
+        Runs after ``_migrate`` because ``source`` and ``project`` may have
+        only just been added to an older database.
+        """
+        self.conn.executescript("""
+            CREATE INDEX IF NOT EXISTS idx_memories_project ON memories(project);
+            CREATE INDEX IF NOT EXISTS idx_memories_type ON memories(type);
+            CREATE INDEX IF NOT EXISTS idx_memories_source ON memories(source);
+            CREATE INDEX IF NOT EXISTS idx_memories_status ON memories(status);
+            CREATE INDEX IF NOT EXISTS idx_memories_created_at ON memories(created_at);
+            CREATE INDEX IF NOT EXISTS idx_edges_source ON edges(source_id);
+            CREATE INDEX IF NOT EXISTS idx_edges_target ON edges(target_id);
+        """)
         self.conn.commit()
 
+    @staticmethod
+    def _filter_sql(
+        filters: MemoryFilter | None, alias: str = "m"
+    ) -> tuple[str, list]:
+        """Build an ``AND ...`` clause restricting ``alias`` to ``filters``.
+
+        Returns an empty clause when there is nothing to filter on.
+        """
+        if filters is None:
+            return "", []
+        clauses: list[str] = []
+        params: list = []
+        if filters.project is not None:
+            clauses.append(f"{alias}.project = ?")
+            params.append(filters.project)
+        for column, values in (
+            ("type", filters.types),
+            ("source", filters.sources),
+            ("status", filters.statuses),
+        ):
+            if values:
+                placeholders = ", ".join("?" for _ in values)
+                clauses.append(f"{alias}.{column} IN ({placeholders})")
+                params.extend(values)
+        if filters.created_after is not None:
+            clauses.append(f"{alias}.created_at >= ?")
+            params.append(filters.created_after)
+        if filters.created_before is not None:
+            clauses.append(f"{alias}.created_at < ?")
+            params.append(filters.created_before)
+        if not clauses:
+            return "", []
+        return " AND " + " AND ".join(clauses), params
+
     def _row_to_memory(self, row: sqlite3.Row) -> Memory:
         return Memory(
             id=row["id"],
@@ -126,6 +394,13 @@ class SQLiteStore:
             ),
         )
         self.conn.commit()
+        self._fts_planners["main"].note_writes()
+        self._raise_score_bounds(
+            ref_time=memory.last_accessed or memory.created_at,
+            strength=memory.strength,
+            access_count=memory.access_count,
+            confidence=memory.confidence,
+        )
         return memory
 
     def add_edge(self, edge: Edge) -> Edge:
@@ -151,41 +426,316 @@ class SQLiteStore:
         ).fetchall()
         return [self._row_to_edge(r) for r in rows]
 
-    def get_neighbors(self, memory_id: str) -> list[tuple[Edge, Memory]]:
-        edges = self.get_edges(memory_id)
+    def get_neighbors(
+        self, memory_id: str, filters: MemoryFilter | None = None
+    ) -> list[tuple[Edge, Memory]]:
+        """Edges touching ``memory_id`` paired with the memory on the other end.
+
+        Neighbors are joined in a single query (one indexed lookup per edge
+        direction) and restricted to ``filters`` when given. Tombstoned
+        memories are never returned.
+        """
+        clause, params = self._filter_sql(filters)
+        columns = """e.id AS edge_id, e.source_id, e.target_id, e.rel_type,
+                     e.weight, e.created_at AS edge_created_at, m.*"""
+        rows = self.conn.execute(
+            f"""SELECT {columns} FROM edges e
+                JOIN memories m ON m.id = e.target_id
+                WHERE e.source_id = ? AND m.status != 'deleted'{clause}
+                UNION ALL
+                SELECT {columns} FROM edges e
+                JOIN memories m ON m.id = e.source_id
+                WHERE e.target_id = ? AND e.source_id != e.target_id
+                  AND m.status != 'deleted'{clause}""",
+            (memory_id, *params, memory_id, *params),
+        ).fetchall()
         result = []
-        for edge in edges:
-            neighbor_id = edge.target_id if edge.source_id == memory_id else edge.source_id
-            neighbor = self.get_memory(neighbor_id)
-            if neighbor:
-                result.append((edge, neighbor))
+        for row in rows:
+            edge = Edge(
+                id=row["edge_id"],
+                source_id=row["source_id"],
+                target_id=row["target_id"],
+                rel_type=row["rel_type"],
+                weight=row["weight"],
+                created_at=row["edge_created_at"],
+            )
+            result.append((edge, self._row_to_memory(row)))
         return result
 
-    def search_bm25(self, query: str, limit: int = 20) -> list[tuple[str, float]]:
-        """FTS5 MATCH with BM25 ranking. Returns (memory_id, bm25_score) pairs."""
-        # Escape special FTS5 characters in the query
-        safe_query = self._escape_fts_query(query)
-        if not safe_query.strip():
+    def distinct_entities(self) -> list[str]:
+        """Every normalized entity name in the index."""
+        rows = self.conn.execute("SELECT DISTINCT entity FROM memory_entities").fetchall()
+        return [row["entity"] for row in rows]
+
+    def entity_fans(self, entities: list[str]) -> dict[str, int]:
+        """Number of live memories mentioning each of ``entities``.
+
+        Names must already be normalized; unknown names are omitted.
+        """
+        if not entities:
+            return {}
+        placeholders = ", ".join("?" for _ in entities)
+        rows = self.conn.execute(
+            f"""SELECT entity, COUNT(*) AS fan FROM memory_entities
+                WHERE entity IN ({placeholders}) GROUP BY entity""",
+            entities,
+        ).fetchall()
+        return {row["entity"]: row["fan"] for row in rows}
+
+    def memories_for_entity(
+        self, entity: str, filters: MemoryFilter | None = None
+    ) -> list[str]:
+        """IDs of live memories mentioning ``entity`` (a normalized name),
+        oldest first, so equally seeded memories keep a stable order."""
+        clause, params = self._filter_sql(filters)
+        rows = self.conn.execute(
+            f"""SELECT me.memory_id FROM memory_entities me
+                JOIN memories m ON m.id = me.memory_id
+                WHERE me.entity = ?{clause}
+                ORDER BY m.rowid""",
+            (entity, *params),
+        ).fetchall()
+        return [row["memory_id"] for row in rows]
+
+    def get_entity_neighbors(
+        self,
+        memory_id: str,
+        filters: MemoryFilter | None = None,
+        max_fan: int = 50,
+    ) -> list[tuple[str, int]]:
+        """Memories sharing an entity with ``memory_id``.
+
+        Each entity acts as an implicit hub node. Returns
+        ``(neighbor_id, fan)`` pairs, where ``fan`` is the membership of the
+        most specific shared entity. Entities with more than ``max_fan``
+        members are skipped: they are too generic to carry association and
+        too expensive to expand.
+        """
+        clause, params = self._filter_sql(filters)
+        rows = self.conn.execute(
+            f"""WITH fans AS (
+                    SELECT entity, COUNT(*) AS fan FROM memory_entities
+                    WHERE entity IN (
+                        SELECT entity FROM memory_entities WHERE memory_id = ?
+                    )
+                    GROUP BY entity
+                    HAVING fan <= ?
+                )
+                SELECT me.memory_id, MIN(fans.fan) AS fan
+                FROM fans
+                JOIN memory_entities me ON me.entity = fans.entity
+                JOIN memories m ON m.id = me.memory_id
+                WHERE me.memory_id != ?{clause}
+                GROUP BY me.memory_id""",
+            (memory_id, max_fan, memory_id, *params),
+        ).fetchall()
+        return [(row["memory_id"], row["fan"]) for row in rows]
+
+    def search_bm25(
+        self,
+        query: str,
+        limit: int = 20,
+        filters: MemoryFilter | None = None,
+        rank: str = "bm25",
+        weights: dict[str, float] | None = None,
+        now: float | None = None,
+    ) -> list[tuple[str, float]]:
+        """FTS5 MATCH with BM25 ranking. Returns (memory_id, bm25_score) pairs.
+
+        ``filters`` are evaluated in the same statement as the MATCH, so
+        ``limit`` counts only memories that pass them.
+
+        With ``rank="competition"`` every hit is scored with the
+        competition formula inside SQLite and the pairs are
+        (memory_id, competition_score); see ``search_competition``.
+        """
+        if rank == "competition":
+            hits = self.search_competition(query, limit, filters, weights, now)
+            return [(mid, score) for mid, _, score in hits]
+        if rank != "bm25":
+            raise ValueError(f"unknown rank: {rank!r}")
+        return self._search_fts("main", query, limit, filters)
+
+    def search_competition(
+        self,
+        query: str,
+        limit: int = 20,
+        filters: MemoryFilter | None = None,
+        weights: dict[str, float] | None = None,
+        now: float | None = None,
+    ) -> list[tuple[str, float, float]]:
+        """BM25 hits ranked by competition score, best first.
+
+        Scores every hit exactly as ``scoring.compete`` would score the full
+        hit set with BM25 as activation: activation and strength are
+        min-max normalized over the hits (window ``MIN``/``MAX``), recency
+        and strength come from the ``openmem_*`` SQL functions. Only the
+        top ``limit`` rows leave SQLite.
+
+        Returns (memory_id, activation, score) triples, where activation is
+        the BM25 score divided by the best one.
+        """
+        safe_query = self.plan_fts_query(query)
+        if not safe_query:
             return []
+        if now is None:
+            now = time.time()
+        w = weights or DEFAULT_WEIGHTS
+        clause, params = self._filter_sql(filters)
         rows = self.conn.execute(
-            """SELECT id, bm25(memories_fts) as rank
-               FROM memories_fts
-               WHERE memories_fts MATCH ?
-               ORDER BY rank
-               LIMIT ?""",
-            (safe_query, limit),
+            f"""WITH hits AS (
+                    SELECT memories_fts.id AS id, -memories_fts.rank AS bm25,
+                           openmem_recency(COALESCE(m.last_accessed, m.created_at), ?)
+                               AS recency,
+                           openmem_strength(m.strength, m.access_count, m.created_at, ?)
+                               AS strength,
+                           m.confidence AS confidence, m.status AS status
+                    FROM memories_fts
+                    JOIN memories m ON m.rowid = memories_fts.rowid
+                    WHERE memories_fts MATCH ?{clause}
+                ), ranged AS (
+                    SELECT *, MIN(bm25) OVER () AS a_min, MAX(bm25) OVER () AS a_max,
+                              MIN(strength) OVER () AS s_min, MAX(strength) OVER () AS s_max
+                    FROM hits
+                )
+                SELECT id,
+                       CASE WHEN a_max > 0 THEN bm25 / a_max ELSE 1.0 END AS activation,
+                       openmem_score(
+                           CASE WHEN a_max = a_min THEN 1.0
+                                ELSE (bm25 - a_min) / (a_max - a_min) END,
+                           recency,
+                           CASE WHEN s_max = s_min THEN 1.0
+                                ELSE (strength - s_min) / (s_max - s_min) END,
+                           confidence, status, ?, ?, ?, ?
+                       ) AS score
+                FROM ranged
+                ORDER BY score DESC
+                LIMIT ?""",
+            (
+                now,
+                now,
+                safe_query,
+                *params,
+                w["activation"],
+                w["recency"],
+                w["strength"],
+                w["confidence"],
+                limit,
+            ),
         ).fetchall()
+        return [(row["id"], row["activation"], row["score"]) for row in rows]
+
+    def search_archive_bm25(
+        self,
+        query: str,
+        limit: int = 20,
+        filters: MemoryFilter | None = None,
+    ) -> list[tuple[str, float]]:
+        """``search_bm25`` against the attached archive tier."""
+        if not self.has_archive:
+            return []
+        return self._search_fts("archive", query, limit, filters)
+
+    def _search_fts(
+        self,
+        schema: str,
+        query: str,
+        limit: int,
+        filters: MemoryFilter | None,
+    ) -> list[tuple[str, float]]:
+        safe_query = self.plan_fts_query(query, schema)
+        if not safe_query:
+            return []
+        clause, params = self._filter_sql(filters)
+        if clause:
+            rows = self.conn.execute(
+                f"""SELECT memories_fts.id, bm25(memories_fts) as rank
+                    FROM {schema}.memories_fts
+                    JOIN {schema}.memories m ON m.rowid = memories_fts.rowid
+                    WHERE memories_fts MATCH ?{clause}
+                    ORDER BY rank
+                    LIMIT ?""",
+                (safe_query, *params, limit),
+            ).fetchall()
+        else:
+            rows = self.conn.execute(
+                f"""SELECT id, bm25(memories_fts) as rank
+                    FROM {schema}.memories_fts
+                    WHERE memories_fts MATCH ?
+                    ORDER BY rank
+                    LIMIT ?""",
+                (safe_query, limit),
+            ).fetchall()
         # bm25() returns negative scores (lower = better match), negate for positive scores
         return [(row["id"], -row["rank"]) for row in rows]
 
-    def _escape_fts_query(self, query: str) -> str:
-        """Turn a raw user query into a safe FTS5 query by quoting each token."""
-        tokens = query.split()
-        if not tokens:
-            return ""
-        # Quote each token to avoid FTS5 syntax errors from special chars
-        quoted = ['"' + t.replace('"', '""') + '"' for t in tokens]
-        return " OR ".join(quoted)
+    def plan_fts_query(self, query: str, schema: str = "main") -> str:
+        """Turn a raw user query into a safe, selective FTS5 MATCH expression.
+
+        Words, ``"quoted phrases"`` and ``prefix*`` terms are ORed together;
+        on large indexes, terms present in most documents are dropped.
+        """
+        return self._fts_planners[schema].plan(self.conn, query)
+
+    def fts_cache_stats(self) -> tuple[int, int]:
+        """(hits, misses) of the FTS term-statistics cache, all tiers."""
+        planners = self._fts_planners.values()
+        return sum(p.hits for p in planners), sum(p.misses for p in planners)
+
+    def score_bounds(self) -> dict[str, float]:
+        """Hot-tier maxima of the inputs to the competition score.
+
+        Keys: ``ref_time`` (latest access or creation), ``strength``,
+        ``access_count`` and ``confidence``. Computed once, then raised on
+        every write from this store, so they are always upper bounds
+        (deletions merely loosen them). Shared with ``reader()`` stores.
+        """
+        if not self._score_bounds:
+            row = self.conn.execute(
+                """SELECT MAX(COALESCE(last_accessed, created_at)), MAX(strength),
+                          MAX(access_count), MAX(confidence)
+                   FROM memories WHERE status != 'deleted'"""
+            ).fetchone()
+            self._score_bounds.update(
+                ref_time=row[0] or 0.0,
+                strength=row[1] or 0.0,
+                access_count=row[2] or 0,
+                confidence=row[3] or 0.0,
+            )
+        return dict(self._score_bounds)
+
+    def _raise_score_bounds(self, **values: float) -> None:
+        if not self._score_bounds:
+            return  # computed lazily from the table
+        for key, value in values.items():
+            if value is not None and value > self._score_bounds[key]:
+                self._score_bounds[key] = value
+
+    def open_bm25_cursor(
+        self, query: str, filters: MemoryFilter | None = None
+    ) -> sqlite3.Cursor | None:
+        """Cursor over every BM25 hit, best first, for incremental fetching.
+
+        Rows carry ``id``, ``score`` (negated BM25, higher is better) and the
+        score inputs ``ref_time``, ``strength``, ``access_count``,
+        ``created_at``, ``confidence`` and ``status``. The MATCH runs once;
+        callers ``fetchmany`` until they have enough and then ``close``.
+        Returns ``None`` when the query has no searchable terms.
+        """
+        safe_query = self.plan_fts_query(query)
+        if not safe_query:
+            return None
+        clause, params = self._filter_sql(filters)
+        return self.conn.execute(
+            f"""SELECT memories_fts.id, -memories_fts.rank AS score,
+                       COALESCE(m.last_accessed, m.created_at) AS ref_time,
+                       m.strength, m.access_count, m.created_at, m.confidence, m.status
+                FROM memories_fts
+                JOIN memories m ON m.rowid = memories_fts.rowid
+                WHERE memories_fts MATCH ?{clause}
+                ORDER BY memories_fts.rank""",
+            (safe_query, *params),
+        )
 
     def update_access(self, memory_id: str) -> None:
         now = time.time()
@@ -195,6 +745,10 @@ class SQLiteStore:
             (now, now, memory_id),
         )
         self.conn.commit()
+        if self._score_bounds:
+            self._raise_score_bounds(
+                ref_time=now, access_count=self._score_bounds["access_count"] + 1
+            )
 
     def update_memory(self, memory: Memory) -> None:
         entities_json = json.dumps(memory.entities)
@@ -210,6 +764,12 @@ class SQLiteStore:
             ),
         )
         self.conn.commit()
+        self._raise_score_bounds(
+            ref_time=memory.last_accessed or memory.created_at,
+            strength=memory.strength,
+            access_count=memory.access_count,
+            confidence=memory.confidence,
+        )
 
     def all_memories(self) -> list[Memory]:
         rows = self.conn.execute("SELECT * FROM memories").fetchall()
@@ -219,5 +779,346 @@ class SQLiteStore:
         rows = self.conn.execute("SELECT * FROM edges").fetchall()
         return [self._row_to_edge(r) for r in rows]
 
+    def mark_deleted(self, memory_ids: list[str]) -> int:
+        """Tombstone memories. Their rows leave the FTS index immediately."""
+        if not memory_ids:
+            return 0
+        now = time.time()
+        count = 0
+        for memory_id in memory_ids:
+            count += self.conn.execute(
+                """UPDATE memories SET status = 'deleted', updated_at = ?
+                   WHERE id = ? AND status != 'deleted'""",
+                (now, memory_id),
+            ).rowcount
+        self.conn.commit()
+        self._fts_planners["main"].note_writes(count)
+        return count
+
+    def superseded_before(self, cutoff: float) -> list[str]:
+        """IDs of superseded memories last updated before ``cutoff``."""
+        rows = self.conn.execute(
+            """SELECT id FROM memories
+               WHERE status = 'superseded' AND updated_at < ?""",
+            (cutoff,),
+        ).fetchall()
+        return [row["id"] for row in rows]
+
+    def strength_inputs(self) -> list[tuple[str, float, int, float]]:
+        """(id, strength, access_count, created_at) for every live memory."""
+        rows = self.conn.execute(
+            """SELECT id, strength, access_count, created_at FROM memories
+               WHERE status != 'deleted'"""
+        ).fetchall()
+        return [tuple(row) for row in rows]
+
+    def add_vector_row(
+        self, memory_id: str, scale: float, write: Callable[[int], None]
+    ) -> int:
+        """Allocate (or reallocate) a vector matrix row for ``memory_id``.
+
+        ``write(row)`` stores the vector in the matrix. It runs before the
+        row is committed, so a crash never publishes a row without a vector.
+        """
+        self.conn.execute("DELETE FROM memory_vectors WHERE memory_id = ?", (memory_id,))
+        cur = self.conn.execute(
+            "INSERT INTO memory_vectors (memory_id, scale) VALUES (?, ?)",
+            (memory_id, scale),
+        )
+        try:
+            write(cur.lastrowid)
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+        return cur.lastrowid
+
+    def vector_rows(self, after_row: int = 0) -> list[tuple[int, float]]:
+        """``(row, scale)`` for every vector row numbered above ``after_row``."""
+        rows = self.conn.execute(
+            "SELECT row, scale FROM memory_vectors WHERE row > ? ORDER BY row",
+            (after_row,),
+        ).fetchall()
+        return [(r["row"], r["scale"]) for r in rows]
+
+    def vector_state(self) -> tuple[int, int]:
+        """``(generation, max_row)`` of the vector row map."""
+        row = self.conn.execute(
+            """SELECT (SELECT generation FROM memory_vectors_state),
+                      (SELECT MAX(row) FROM memory_vectors)"""
+        ).fetchone()
+        return row[0], row[1] or 0
+
+    def renumber_vector_rows(self, move: Callable[[list[int], int], None]) -> int:
+        """Renumber the vector rows densely from 1, dropping the gaps.
+
+        ``move(rows, generation)`` must write the compacted matrix, in which
+        ``rows[i]`` becomes row ``i + 1``, for the new ``generation``. It
+        runs inside the write transaction, before the new numbering is
+        committed. Returns how many dead rows were dropped (0 when the rows
+        are already dense, in which case nothing is done).
+        """
+        count, max_row = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(MAX(row), 0) FROM memory_vectors"
+        ).fetchone()
+        if max_row == count:
+            return 0
+        # Take the write lock first, so the rows read below stay current
+        self.conn.execute("UPDATE memory_vectors_state SET generation = generation + 1")
+        try:
+            (generation,) = self.conn.execute(
+                "SELECT generation FROM memory_vectors_state"
+            ).fetchone()
+            rows = [r[0] for r in self.conn.execute("SELECT row FROM memory_vectors ORDER BY row")]
+            move(rows, generation)
+            # Ascending, so each target row is already free
+            for new, old in enumerate(rows, 1):
+                if new != old:
+                    self.conn.execute(
+                        "UPDATE memory_vectors SET row = ? WHERE row = ?", (new, old)
+                    )
+            self.conn.execute(
+                "UPDATE sqlite_sequence SET seq = ? WHERE name = 'memory_vectors'",
+                (len(rows),),
+            )
+        except BaseException:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+        return rows[-1] - len(rows) if rows else max_row
+
+    def vector_row_ids(
+        self, rows: list[int], filters: MemoryFilter | None = None
+    ) -> dict[int, str]:
+        """Map vector rows to the IDs of live hot-tier memories passing ``filters``."""
+        if not rows:
+            return {}
+        clause, params = self._filter_sql(filters)
+        placeholders = ", ".join("?" for _ in rows)
+        result = self.conn.execute(
+            f"""SELECT v.row, v.memory_id FROM memory_vectors v
+                JOIN memories m ON m.id = v.memory_id
+                WHERE v.row IN ({placeholders}) AND m.status != 'deleted'{clause}""",
+            (*rows, *params),
+        ).fetchall()
+        return {r["row"]: r["memory_id"] for r in result}
+
+    def unvectorized_memories(self) -> list[tuple[str, str, str | None]]:
+        """``(id, text, gist)`` of live memories without a vector row."""
+        rows = self.conn.execute(
+            """SELECT id, text, gist FROM memories
+               WHERE status != 'deleted'
+                 AND id NOT IN (SELECT memory_id FROM memory_vectors)"""
+        ).fetchall()
+        return [(r["id"], r["text"], r["gist"]) for r in rows]
+
+    def purge_deleted(self) -> tuple[int, int]:
+        """Hard-delete tombstoned memories and every edge touching them.
+
+        Returns ``(memories_removed, edges_removed)``.
+        """
+        self.conn.execute(
+            """DELETE FROM memory_vectors
+               WHERE memory_id IN (SELECT id FROM memories WHERE status = 'deleted')"""
+        )
+        edges = self.conn.execute(
+            """DELETE FROM edges
+               WHERE source_id IN (SELECT id FROM memories WHERE status = 'deleted')
+                  OR target_id IN (SELECT id FROM memories WHERE status = 'deleted')"""
+        ).rowcount
+        memories = self.conn.execute(
+            "DELETE FROM memories WHERE status = 'deleted'"
+        ).rowcount
+        self.conn.commit()
+        return memories, edges
+
+    def compact(self) -> None:
+        """Merge FTS5 segments and return free pages to the filesystem.
+
+        Databases created before incremental auto-vacuum was enabled are
+        converted with a one-off full VACUUM.
+        """
+        self.conn.execute("INSERT INTO memories_fts(memories_fts) VALUES ('optimize')")
+        self.conn.commit()
+        if self.conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            self.conn.execute("VACUUM")
+        else:
+            self.conn.execute("PRAGMA incremental_vacuum")
+        self.conn.commit()
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def size_bytes(self) -> int:
+        """Allocated size of the main database, excluding the WAL."""
+        page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        return page_count * page_size
+
+    # -- Archive tier ------------------------------------------------------
+
+    def attach_archive(self, archive_path: str) -> None:
+        """Attach a second database holding archived memories and their edges.
+
+        The archive has its own FTS5 index so that searching the hot tier
+        never pays for archived rows.
+        """
+        self.conn.execute("ATTACH DATABASE ? AS archive", (archive_path,))
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS archive.memories (
+                id TEXT PRIMARY KEY,
+                type TEXT NOT NULL DEFAULT 'fact',
+                text TEXT NOT NULL,
+                gist TEXT,
+                entities TEXT NOT NULL DEFAULT '[]',
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                strength REAL NOT NULL DEFAULT 1.0,
+                confidence REAL NOT NULL DEFAULT 1.0,
+                access_count INTEGER NOT NULL DEFAULT 0,
+                last_accessed REAL,
+                status TEXT NOT NULL DEFAULT 'active',
+                source TEXT DEFAULT '',
+                project TEXT DEFAULT '',
+                archived_at REAL NOT NULL
+            );
+
+            -- No foreign keys: archived edges may point at hot memories
+            CREATE TABLE IF NOT EXISTS archive.edges (
+                id TEXT PRIMARY KEY,
+                source_id TEXT NOT NULL,
+                target_id TEXT NOT NULL,
+                rel_type TEXT NOT NULL DEFAULT 'mentions',
+                weight REAL NOT NULL DEFAULT 0.5,
+                created_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS archive.idx_edges_source ON edges(source_id);
+            CREATE INDEX IF NOT EXISTS archive.idx_edges_target ON edges(target_id);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS archive.memories_fts USING fts5(
+                id UNINDEXED,
+                text,
+                gist,
+                entities,
+                content='memories',
+                content_rowid='rowid'
+            );
+
+            -- Archived rows are only ever inserted or deleted, never updated
+            CREATE TRIGGER IF NOT EXISTS archive.memories_ai AFTER INSERT ON memories BEGIN
+                INSERT INTO memories_fts(rowid, id, text, gist, entities)
+                VALUES (new.rowid, new.id, new.text, new.gist, new.entities);
+            END;
+
+            CREATE TRIGGER IF NOT EXISTS archive.memories_ad AFTER DELETE ON memories BEGIN
+                INSERT INTO memories_fts(memories_fts, rowid, id, text, gist, entities)
+                VALUES ('delete', old.rowid, old.id, old.text, old.gist, old.entities);
+            END;
+        """)
+        self.conn.commit()
+        self.has_archive = True
+        self._fts_planners["archive"] = FTSQueryPlanner("archive")
+
+    def _stage_ids(self, memory_ids: list[str]) -> None:
+        """Load ``memory_ids`` into a temp table for set-based statements."""
+        self.conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS staged_ids (id TEXT PRIMARY KEY)"
+        )
+        self.conn.execute("DELETE FROM temp.staged_ids")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO temp.staged_ids (id) VALUES (?)",
+            [(mid,) for mid in memory_ids],
+        )
+
+    def archive_memories(self, memory_ids: list[str]) -> tuple[int, int]:
+        """Move memories and every edge touching them to the archive tier.
+
+        Returns ``(memories_moved, edges_moved)``.
+        """
+        if not self.has_archive or not memory_ids:
+            return 0, 0
+        self._stage_ids(memory_ids)
+        edge_filter = """source_id IN (SELECT id FROM temp.staged_ids)
+                         OR target_id IN (SELECT id FROM temp.staged_ids)"""
+        self.conn.execute(
+            f"""INSERT OR REPLACE INTO archive.edges
+                SELECT id, source_id, target_id, rel_type, weight, created_at
+                FROM main.edges WHERE {edge_filter}"""
+        )
+        edges = self.conn.execute(f"DELETE FROM main.edges WHERE {edge_filter}").rowcount
+        self.conn.execute(
+            f"""INSERT OR REPLACE INTO archive.memories ({_MEMORY_COLUMNS}, archived_at)
+                SELECT {_MEMORY_COLUMNS}, ? FROM main.memories
+                WHERE id IN (SELECT id FROM temp.staged_ids)""",
+            (time.time(),),
+        )
+        memories = self.conn.execute(
+            "DELETE FROM main.memories WHERE id IN (SELECT id FROM temp.staged_ids)"
+        ).rowcount
+        self.conn.commit()
+        for planner in self._fts_planners.values():
+            planner.note_writes(memories)
+        return memories, edges
+
+    def promote_memories(self, memory_ids: list[str]) -> int:
+        """Move archived memories back to the hot tier.
+
+        Archived edges follow once both of their endpoints are hot again.
+        """
+        if not self.has_archive or not memory_ids:
+            return 0
+        self._stage_ids(memory_ids)
+        moved = self.conn.execute(
+            f"""INSERT OR IGNORE INTO main.memories ({_MEMORY_COLUMNS})
+                SELECT {_MEMORY_COLUMNS} FROM archive.memories
+                WHERE id IN (SELECT id FROM temp.staged_ids)"""
+        ).rowcount
+        self.conn.execute(
+            "DELETE FROM archive.memories WHERE id IN (SELECT id FROM temp.staged_ids)"
+        )
+        ready = """(source_id IN (SELECT id FROM temp.staged_ids)
+                    OR target_id IN (SELECT id FROM temp.staged_ids))
+                   AND source_id IN (SELECT id FROM main.memories)
+                   AND target_id IN (SELECT id FROM main.memories)"""
+        self.conn.execute(
+            f"""INSERT OR IGNORE INTO main.edges
+                SELECT id, source_id, target_id, rel_type, weight, created_at
+                FROM archive.edges WHERE {ready}"""
+        )
+        self.conn.execute(f"DELETE FROM archive.edges WHERE {ready}")
+        self.conn.commit()
+        for planner in self._fts_planners.values():
+            planner.note_writes(moved)
+        self._score_bounds.clear()
+        return moved
+
+    def get_archived_memory(self, memory_id: str) -> Optional[Memory]:
+        if not self.has_archive:
+            return None
+        row = self.conn.execute(
+            "SELECT * FROM archive.memories WHERE id = ?", (memory_id,)
+        ).fetchone()
+        return self._row_to_memory(row) if row else None
+
+    def idle_before(self, cutoff: float) -> list[str]:
+        """IDs of live memories neither accessed nor created since ``cutoff``."""
+        rows = self.conn.execute(
+            """SELECT id FROM memories
+               WHERE status != 'deleted'
+                 AND COALESCE(last_accessed, created_at) < ?""",
+            (cutoff,),
+        ).fetchall()
+        return [row["id"] for row in rows]
+
+    def archive_is_empty(self) -> bool:
+        """Whether the archive holds no memories (true without an archive)."""
+        if not self.has_archive:
+            return True
+        return self.conn.execute("SELECT 1 FROM archive.memories LIMIT 1").fetchone() is None
+
+    def archived_count(self) -> int:
+        if not self.has_archive:
+            return 0
+        return self.conn.execute("SELECT COUNT(*) FROM archive.memories").fetchone()[0]
+
     def close(self) -> None:
         self.conn.close()
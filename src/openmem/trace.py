@@ -0,0 +1,123 @@
+"""Recall instrumentation: per-stage timings, row counts and SQL counts."""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Callable, Iterator
+
+# Pipeline stages, in execution order
+STAGES = ("seed", "spread", "hydrate", "compete", "conflicts", "archive", "pack", "update")
+
+# Distinct SQL statements kept per trace
+MAX_STATEMENTS = 500
+
+# String and numeric literals, replaced to group statements by shape
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(sql: str) -> str:
+    """``sql`` with literals replaced by ``?`` and whitespace collapsed.
+
+    The trace callback reports statements with their parameters expanded
+    on some SQLite builds and as written on others; both reduce to the
+    same template.
+    """
+    return _SPACE_RE.sub(" ", _LITERAL_RE.sub("?", sql)).strip()
+
+
+@dataclass
+class RecallTrace:
+    """What one recall did and where its time went.
+
+    ``stages`` maps stage name to wall time in milliseconds, ``sql`` to the
+    number of SQL statements the stage executed (seed channels on worker
+    connections included). ``counts`` holds row counts: ``bm25_hits``,
+    ``seeds``, ``activated``, ``edges_scanned``, ``hydrated`` and
+    ``returned``. ``statements`` maps each distinct statement template
+    executed (see ``statement_shape``; up to ``MAX_STATEMENTS``) to how
+    often it ran.
+    """
+
+    query: str = ""
+    fts_query: str = ""
+    total_ms: float = 0.0
+    stages: dict[str, float] = field(default_factory=dict)
+    sql: dict[str, int] = field(default_factory=dict)
+    counts: dict[str, int] = field(default_factory=dict)
+    truncated: list[str] = field(default_factory=list)
+    statements: dict[str, int] = field(default_factory=dict)
+    enabled = True
+
+    def __post_init__(self):
+        self._current = ""
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as stage ``name`` and attribute its SQL."""
+        previous, self._current = self._current, name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+            self._current = previous
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] = self.counts.get(name, 0) + n
+
+    def _on_statement(self, statement: str) -> None:
+        stage = self._current or "other"
+        self.sql[stage] = self.sql.get(stage, 0) + 1
+        statement = statement_shape(statement)
+        if statement in self.statements:
+            self.statements[statement] += 1
+        elif len(self.statements) < MAX_STATEMENTS:
+            self.statements[statement] = 1
+
+    @contextmanager
+    def sql_counter(self, conn: sqlite3.Connection) -> Iterator[None]:
+        """Count statements executed on ``conn`` while the block runs."""
+        conn.set_trace_callback(self._on_statement)
+        try:
+            yield
+        finally:
+            conn.set_trace_callback(None)
+
+    def as_dict(self) -> dict:
+        return {
+            "query": self.query,
+            "fts_query": self.fts_query,
+            "total_ms": round(self.total_ms, 3),
+            "stages": {name: round(ms, 3) for name, ms in self.stages.items()},
+            "sql": dict(self.sql),
+            "counts": dict(self.counts),
+            "truncated": list(self.truncated),
+        }
+
+
+class _NullTrace:
+    """Stand-in used when tracing is off; every method is a no-op."""
+
+    enabled = False
+    _null = nullcontext()
+
+    def stage(self, name: str) -> nullcontext:
+        return self._null
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    def sql_counter(self, conn: sqlite3.Connection) -> nullcontext:
+        return self._null
+
+
+NULL_TRACE = _NullTrace()
+
+# Called with the finished trace of every recall
+RecallHook = Callable[[RecallTrace], None]
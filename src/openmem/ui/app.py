@@ -3,19 +3,30 @@
 from __future__ import annotations
 
 import os
+import time
 from pathlib import Path
 
-from flask import Flask, jsonify, request
+from flask import Flask, Response, g, jsonify, request
 
 from openmem import MemoryEngine
+from openmem.metrics import MetricsRegistry
 
 DEFAULT_DB = os.path.join(Path.home(), ".openmem", "memories.db")
+DEFAULT_ARCHIVE_DB = os.path.join(Path.home(), ".openmem", "archive.db")
 
 
 def _get_db_path() -> str:
     return os.environ.get("OPENMEM_DB", DEFAULT_DB)
 
 
+def _existing_archive_path() -> str | None:
+    """The archive to attach: only one that was asked for explicitly or
+    already exists, so browsing never creates an archive."""
+    if os.environ.get("OPENMEM_ARCHIVE_DB"):
+        return os.environ["OPENMEM_ARCHIVE_DB"]
+    return DEFAULT_ARCHIVE_DB if os.path.exists(DEFAULT_ARCHIVE_DB) else None
+
+
 def _memory_to_dict(mem) -> dict:
     return {
         "id": mem.id,
@@ -46,19 +57,38 @@ def _edge_to_dict(edge) -> dict:
     }
 
 
-def create_app(db_path: str | None = None) -> Flask:
+def create_app(db_path: str | None = None, archive_path: str | None = None) -> Flask:
     static_dir = os.path.join(os.path.dirname(__file__), "static")
     app = Flask(__name__, static_folder=static_dir, static_url_path="/static")
 
     db = db_path or _get_db_path()
+    archive_db = archive_path or _existing_archive_path()
+
+    # Engines are opened per request and closed when it ends (their seed
+    # pool threads and connections with them); metrics accumulate here
+    metrics = MetricsRegistry()
 
     def get_engine() -> MemoryEngine:
-        return MemoryEngine(db_path=db)
+        if "engine" not in g:
+            g.engine = MemoryEngine(db_path=db, archive_path=archive_db, metrics=metrics)
+        return g.engine
+
+    @app.teardown_appcontext
+    def close_engine(exc: BaseException | None) -> None:
+        engine = g.pop("engine", None)
+        if engine is not None:
+            engine.close()
 
     @app.route("/")
     def index():
         return app.send_static_file("index.html")
 
+    @app.route("/metrics")
+    def prometheus_metrics():
+        return Response(
+            metrics.to_prometheus(), mimetype="text/plain; version=0.0.4; charset=utf-8"
+        )
+
     @app.route("/api/stats")
     def api_stats():
         engine = get_engine()
@@ -131,16 +161,38 @@ def create_app(db_path: str | None = None) -> Flask:
 
         engine = get_engine()
         top_k = request.args.get("top_k", 10, type=int)
-        results = engine.recall(query, top_k=top_k, token_budget=8000)
-
-        return jsonify([
+        days = request.args.get("days", type=float)
+        trace = request.args.get("trace", "").lower() in ("1", "true", "yes")
+        results = engine.recall(
+            query,
+            top_k=top_k,
+            token_budget=8000,
+            project=request.args.get("project") or None,
+            types=request.args.getlist("type") or None,
+            sources=request.args.getlist("source") or None,
+            statuses=request.args.getlist("status") or None,
+            since=time.time() - days * 86400 if days else None,
+            deadline_ms=request.args.get("deadline_ms", type=float),
+            trace=trace,
+        )
+        if trace:
+            results, recall_trace = results
+
+        payload = [
             {
                 **_memory_to_dict(sm.memory),
                 "score": round(sm.score, 4),
                 "activation": round(sm.activation, 4),
             }
             for sm in results
-        ])
+        ]
+        if trace:
+            response = jsonify({"results": payload, "trace": recall_trace.as_dict()})
+        else:
+            response = jsonify(payload)
+        if engine.last_truncated:
+            response.headers["X-OpenMem-Truncated"] = ",".join(engine.last_truncated)
+        return response
 
     @app.route("/api/graph")
     def api_graph():
@@ -192,8 +244,7 @@ def create_app(db_path: str | None = None) -> Flask:
         if not mem:
             return jsonify({"error": "Memory not found"}), 404
 
-        mem.status = "deleted"
-        engine.store.update_memory(mem)
+        engine.delete(memory_id)
         return jsonify({"ok": True})
 
     return app
@@ -0,0 +1,316 @@
+"""Local vector channel: hashed n-gram embeddings in an int8 matrix.
+
+Embeddings are deterministic and need no model download: each word and
+each of its character trigrams is hashed to one of ``VECTOR_DIM``
+dimensions with a hashed sign, then the vector is L2-normalized. Shared
+stems and spelling variants ("deploy", "deploying", "deployment") overlap
+even when BM25 sees no common token.
+
+Vectors are quantized to int8 with a per-row scale and kept in a
+memory-mapped matrix file next to the database, so a million memories
+take 256 MB on disk and are paged in by the OS rather than loaded.
+Search is a chunked matmul followed by a top-k partition. Edits and
+deletes leave dead rows behind; ``compact_matrix`` (run by
+``MemoryEngine.gc``) rewrites the file with the live rows only.
+
+Requires NumPy (``pip install openmem-engine[vector]``).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None
+
+from .models import MemoryFilter
+from .store import SQLiteStore
+
+VECTOR_DIM = 256
+
+# Matrix file growth step, in rows
+_GROW_ROWS = 4096
+
+# Rows dequantized per matmul. The float32 scratch block (1 MB) stays in
+# cache, which matters more than BLAS call overhead at this size.
+_CHUNK_ROWS = 1024
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def matrix_path(db_path: str) -> str | None:
+    """The matrix file of the database at ``db_path`` (``None``: in RAM)."""
+    return None if db_path == ":memory:" else db_path + ".vec"
+
+
+def _pending_path(path: str, generation: int) -> str:
+    return f"{path}.{generation}"
+
+
+def _finish_compaction(path: str, generation: int) -> None:
+    """Move generation ``generation``'s compacted matrix into place.
+
+    Compaction commits the new row numbering before the file is renamed,
+    so whoever next sees the new generation (the compacting process, or
+    another one after a crash) completes the rename.
+    """
+    try:
+        os.replace(_pending_path(path, generation), path)
+    except FileNotFoundError:
+        pass  # already in place
+
+
+def compact_matrix(store: SQLiteStore, path: str) -> int:
+    """Rewrite the matrix file at ``path`` with live rows only.
+
+    Renumbers ``memory_vectors`` densely and bumps its generation, so
+    every ``VectorIndex`` on the database reloads the matrix on its next
+    search. Works on the raw file and does not need NumPy. Returns how
+    many dead rows were dropped.
+    """
+    _finish_compaction(path, store.vector_state()[0])
+    if not os.path.exists(path):
+        return 0
+
+    def move(rows: list[int], generation: int) -> None:
+        capacity = (len(rows) // _GROW_ROWS + 1) * _GROW_ROWS
+        with open(path, "rb") as src, open(_pending_path(path, generation), "wb") as dst:
+            dst.write(bytes(VECTOR_DIM))  # row 0 is never allocated
+            for row in rows:
+                src.seek(row * VECTOR_DIM)
+                dst.write(src.read(VECTOR_DIM).ljust(VECTOR_DIM, b"\0"))
+            dst.truncate(capacity * VECTOR_DIM)
+            dst.flush()
+            os.fsync(dst.fileno())
+
+    dropped = store.renumber_vector_rows(move)
+    if dropped:
+        _finish_compaction(path, store.vector_state()[0])
+    return dropped
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "The vector channel requires NumPy: pip install openmem-engine[vector]"
+        )
+
+
+def _feature_hashes(text: str) -> list[int]:
+    hashes = []
+    for word in _WORD_RE.findall(text.lower()):
+        hashes.append(zlib.crc32(word.encode()))
+        padded = f"<{word}>"
+        for i in range(len(padded) - 2):
+            hashes.append(zlib.crc32(padded[i:i + 3].encode()))
+    return hashes
+
+
+def embed(text: str, dim: int = VECTOR_DIM) -> "np.ndarray":
+    """Deterministic unit-length float32 embedding of ``text``."""
+    _require_numpy()
+    vec = np.zeros(dim, dtype=np.float32)
+    hashes = _feature_hashes(text)
+    if not hashes:
+        return vec
+    h = np.array(hashes, dtype=np.uint32)
+    signs = np.where(h >> 31, 1.0, -1.0).astype(np.float32)
+    np.add.at(vec, h % dim, signs)
+    norm = float(np.linalg.norm(vec))
+    if norm > 0:
+        vec /= norm
+    return vec
+
+
+def quantize(vec: "np.ndarray") -> tuple["np.ndarray", float]:
+    """Symmetric int8 quantization; ``vec ≈ q * scale``."""
+    peak = float(np.abs(vec).max()) if vec.size else 0.0
+    scale = peak / 127.0 if peak > 0 else 1.0
+    q = np.round(vec / scale).astype(np.int8)
+    return q, scale
+
+
+class VectorIndex:
+    """Int8 embedding matrix for the hot tier, with brute-force top-k search.
+
+    ``path`` is the matrix file; ``None`` keeps the matrix in RAM (used for
+    ``:memory:`` databases). Row numbers and scales live in the store's
+    ``memory_vectors`` table, so other processes appending to the same
+    database are picked up by ``refresh``, and a compaction (which bumps
+    the table's generation) makes it reload the whole matrix.
+
+    Searches may run on a seed worker thread, and a timed-out one keeps
+    running while the engine thread adds rows. ``_lock`` serializes changes
+    to the arrays; a search reads a snapshot of them taken under the lock.
+    Growing and compaction replace the arrays rather than changing them in
+    place, and rows are only reused after a compaction, which a search
+    detects by the generation, so a snapshot stays valid after it is
+    released.
+    """
+
+    def __init__(self, store: SQLiteStore, path: str | None = None):
+        _require_numpy()
+        self.store = store
+        self.path = path
+        self._lock = threading.Lock()
+        self._matrix = np.zeros((0, VECTOR_DIM), dtype=np.int8)
+        self._scales = np.zeros(0, dtype=np.float32)
+        self._rows = 0  # one past the highest row loaded
+        self._generation: int | None = None  # of the row numbering loaded
+        self.refresh()
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._scales))
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if rows <= len(self._matrix):
+            return
+        capacity = (rows // _GROW_ROWS + 1) * _GROW_ROWS
+        if self.path is None:
+            grown = np.zeros((capacity, VECTOR_DIM), dtype=np.int8)
+            grown[: len(self._matrix)] = self._matrix
+            self._matrix = grown
+        else:
+            self._matrix = None  # release the old mapping before resizing
+            mode = "r+b" if os.path.exists(self.path) else "w+b"
+            with open(self.path, mode) as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() < capacity * VECTOR_DIM:
+                    f.truncate(capacity * VECTOR_DIM)
+                else:
+                    capacity = f.tell() // VECTOR_DIM
+            self._matrix = np.memmap(
+                self.path, dtype=np.int8, mode="r+", shape=(capacity, VECTOR_DIM)
+            )
+        scales = np.zeros(capacity, dtype=np.float32)
+        scales[: len(self._scales)] = self._scales
+        self._scales = scales
+
+    def refresh(self, store: SQLiteStore | None = None) -> None:
+        """Load rows added since the last refresh, possibly by another process."""
+        with self._lock:
+            self._refresh(store or self.store)
+
+    def _refresh(self, store: SQLiteStore) -> None:
+        generation, max_row = store.vector_state()
+        if generation != self._generation:
+            self._reload(generation)
+        elif max_row < self._rows:
+            return
+        new = store.vector_rows(after_row=self._rows - 1)
+        if not new:
+            return
+        self._ensure_capacity(new[-1][0] + 1)
+        for row, scale in new:
+            self._scales[row] = scale
+        self._rows = new[-1][0] + 1
+
+    def _reload(self, generation: int) -> None:
+        """Drop the loaded rows; ``_refresh`` then loads generation ``generation``."""
+        if self.path is not None:
+            _finish_compaction(self.path, generation)
+            self._matrix = np.zeros((0, VECTOR_DIM), dtype=np.int8)
+            self._scales = np.zeros(0, dtype=np.float32)
+            self._rows = 0
+        self._generation = generation
+
+    def add(self, memory_id: str, text: str) -> None:
+        """Embed ``text`` and store it as ``memory_id``'s vector."""
+        q, scale = quantize(embed(text))
+
+        def write(row: int) -> None:
+            # The row was numbered under the current generation, which a
+            # compaction by another process may have moved on
+            self._refresh(self.store)
+            self._ensure_capacity(row + 1)
+            self._matrix[row] = q
+            self._scales[row] = scale
+            self._rows = max(self._rows, row + 1)
+
+        with self._lock:
+            self.store.add_vector_row(memory_id, scale, write)
+
+    def compact(self) -> int:
+        """Drop dead rows from the matrix; returns how many were dropped."""
+        with self._lock:
+            if self.path is not None:
+                dropped = compact_matrix(self.store, self.path)
+                self._refresh(self.store)
+                return dropped
+            compacted = {}
+
+            def move(rows: list[int], generation: int) -> None:
+                capacity = (len(rows) // _GROW_ROWS + 1) * _GROW_ROWS
+                matrix = np.zeros((capacity, VECTOR_DIM), dtype=np.int8)
+                scales = np.zeros(capacity, dtype=np.float32)
+                matrix[1 : len(rows) + 1] = self._matrix[rows]
+                scales[1 : len(rows) + 1] = self._scales[rows]
+                compacted.update(matrix=matrix, scales=scales, rows=len(rows) + 1)
+
+            dropped = self.store.renumber_vector_rows(move)
+            if dropped:
+                self._matrix = compacted["matrix"]
+                self._scales = compacted["scales"]
+                self._rows = compacted["rows"]
+            self._refresh(self.store)
+            return dropped
+
+    def sync(self) -> int:
+        """Embed live memories that have no vector yet; returns how many."""
+        missing = self.store.unvectorized_memories()
+        for memory_id, text, gist in missing:
+            self.add(memory_id, f"{text} {gist or ''}")
+        if missing and isinstance(self._matrix, np.memmap):
+            self._matrix.flush()
+        return len(missing)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        filters: MemoryFilter | None = None,
+        store: SQLiteStore | None = None,
+    ) -> list[tuple[str, float]]:
+        """Return ``(memory_id, cosine)`` pairs, best first, cosine > 0.
+
+        ``store`` overrides the index's own store for the SQL lookups, so
+        the search can run on another thread's connection.
+        """
+        store = store or self.store
+        with self._lock:
+            self._refresh(store)
+            matrix, scales, n = self._matrix, self._scales, self._rows
+            generation = self._generation
+        q = embed(query)
+        if n == 0 or not q.any():
+            return []
+
+        # Over-fetch: some rows belong to deleted, archived or filtered memories
+        fetch = limit * 4
+        sims = np.empty(n, dtype=np.float32)
+        scratch = np.empty((_CHUNK_ROWS, VECTOR_DIM), dtype=np.float32)
+        for start in range(0, n, _CHUNK_ROWS):
+            end = min(start + _CHUNK_ROWS, n)
+            block = scratch[: end - start]
+            block[...] = matrix[start:end]
+            np.dot(block, q, out=sims[start:end])
+        sims *= scales[:n]
+
+        if n > fetch:
+            rows = np.argpartition(sims, -fetch)[-fetch:]
+        else:
+            rows = np.arange(n)
+        rows = rows[np.argsort(-sims[rows])]
+        rows = rows[sims[rows] > 0]
+
+        ids = store.vector_row_ids([int(r) for r in rows], filters)
+        if store.vector_state()[0] != generation:
+            # A compaction renumbered the rows under this search
+            return self.search(query, limit, filters, store)
+        hits = [(ids[int(r)], float(sims[r])) for r in rows if int(r) in ids]
+        return hits[:limit]
@@ -61,3 +61,18 @@ def test_empty_seeds():
     store = make_graph()
     result = spread_activation({}, store, max_hops=2)
     assert result == {}
+
+
+def test_entity_hub_spreading():
+    store = SQLiteStore(":memory:")
+    a = Memory(id="a", text="node A", entities=["Kafka"])
+    b = Memory(id="b", text="node B", entities=["Kafka"])
+    c = Memory(id="c", text="node C", entities=["Redis"])
+    for m in [a, b, c]:
+        store.add_memory(m)
+
+    assert spread_activation({"a": 1.0}, store, max_hops=1) == {"a": 1.0}
+
+    result = spread_activation({"a": 1.0}, store, max_hops=1, entity_weight=0.5)
+    assert set(result) == {"a", "b"}
+    assert 0 < result["b"] < 0.5
@@ -158,3 +158,277 @@ def test_full_pipeline_smoke():
     # Scores should be descending
     for i in range(len(results) - 1):
         assert results[i].score >= results[i + 1].score
+
+
+def test_recall_filters_by_project_and_type():
+    e = MemoryEngine()
+    mine = e.add("Cache invalidation uses Redis pub/sub", type="decision", project="/work/api")
+    e.add("Cache invalidation uses a TTL sweep", type="decision", project="/work/web")
+    e.add("Cache invalidation caused an outage", type="incident", project="/work/api")
+
+    results = e.recall("cache invalidation", project="/work/api", types=["decision"])
+    assert [r.memory.id for r in results] == [mine.id]
+
+
+def test_recall_filters_by_time_window():
+    e = MemoryEngine()
+    old = e.add("Release checklist lives in the wiki")
+    new = e.add("Release checklist moved to the repo")
+    e.store.conn.execute(
+        "UPDATE memories SET created_at = ? WHERE id = ?",
+        (time.time() - 90 * 86400, old.id),
+    )
+
+    results = e.recall("release checklist", since=time.time() - 30 * 86400)
+    assert [r.memory.id for r in results] == [new.id]
+
+
+def test_spreading_activation_respects_filters():
+    e = MemoryEngine()
+    seed = e.add("Billing service owns invoices", project="/work/billing")
+    inside = e.add("Ledger totals are reconciled nightly", project="/work/billing")
+    outside = e.add("Marketing emails are batched", project="/work/marketing")
+    e.link(seed.id, inside.id, "supports", weight=0.9)
+    e.link(seed.id, outside.id, "supports", weight=0.9)
+
+    results = e.recall("billing invoices", project="/work/billing", top_k=10)
+    ids = {r.memory.id for r in results}
+    assert inside.id in ids
+    assert outside.id not in ids
+
+
+def test_deleted_memory_not_recalled():
+    e = MemoryEngine()
+    m = e.add("Secret rotation happens monthly")
+    e.delete(m.id)
+    assert e.recall("secret rotation") == []
+
+
+def test_gc_purges_and_enforces_capacity():
+    e = MemoryEngine()
+    gone = e.add("Temporary note to delete")
+    e.delete(gone.id)
+    weak = e.add("Weak memory nobody recalls")
+    strong = e.add("Strong memory everyone recalls")
+    mem = e.store.get_memory(weak.id)
+    mem.strength = 0.1
+    e.store.update_memory(mem)
+
+    result = e.gc(max_memories=1)
+    assert result["purged"] == 2
+    assert result["evicted"] == 1
+    assert e.store.get_memory(gone.id) is None
+    assert e.store.get_memory(weak.id) is None
+    assert e.store.get_memory(strong.id) is not None
+
+
+def test_gc_expires_long_superseded():
+    e = MemoryEngine()
+    old = e.add("API v1 is current")
+    new = e.add("API v2 is current")
+    e.supersede(old.id, new.id)
+    e.store.conn.execute(
+        "UPDATE memories SET updated_at = ? WHERE id = ?",
+        (time.time() - 200 * 86400, old.id),
+    )
+
+    result = e.gc(superseded_days=90)
+    assert result["superseded_expired"] == 1
+    assert e.store.get_memory(old.id) is None
+    assert e.store.all_edges() == []
+
+
+def test_archive_moves_weak_memories_with_edges():
+    e = MemoryEngine(archive_path=":memory:")
+    weak = e.add("Legacy build used Makefiles")
+    strong = e.add("Current build uses Bazel")
+    e.link(strong.id, weak.id)
+    mem = e.store.get_memory(weak.id)
+    mem.strength = 0.01
+    e.store.update_memory(mem)
+
+    result = e.archive(min_strength=0.05)
+    assert result == {"archived": 1, "edges_archived": 1}
+    assert e.store.get_memory(weak.id) is None
+    assert e.store.get_archived_memory(weak.id) is not None
+    assert e.store.search_bm25("Makefiles") == []
+    assert e.store.all_edges() == []
+
+
+def test_recall_falls_back_to_archive_and_promotes():
+    e = MemoryEngine(archive_path=":memory:")
+    weak = e.add("Legacy build used Makefiles")
+    strong = e.add("Current build uses Bazel")
+    e.link(strong.id, weak.id)
+    mem = e.store.get_memory(weak.id)
+    mem.strength = 0.01
+    e.store.update_memory(mem)
+    e.archive(min_strength=0.05)
+
+    results = e.recall("Makefiles legacy build")
+    assert weak.id in [r.memory.id for r in results]
+    # Recalled archive memories move back to the hot tier with their edges
+    promoted = e.store.get_memory(weak.id)
+    assert promoted is not None
+    assert promoted.access_count == 1
+    assert e.store.get_archived_memory(weak.id) is None
+    assert len(e.store.all_edges()) == 1
+
+
+def test_recall_skips_archive_when_hot_tier_suffices():
+    e = MemoryEngine(archive_path=":memory:")
+    old = e.add("Deploys run on Fridays")
+    mem = e.store.get_memory(old.id)
+    mem.strength = 0.01
+    e.store.update_memory(mem)
+    e.archive(min_strength=0.05)
+    e.add("Deploys run on Tuesdays")
+
+    results = e.recall("deploys", top_k=1)
+    assert [r.memory.text for r in results] == ["Deploys run on Tuesdays"]
+    assert e.store.get_archived_memory(old.id) is not None
+
+
+def test_recall_skips_empty_archive():
+    e = MemoryEngine(archive_path=":memory:")
+    e.add("Deploys run on Fridays")
+    _, trace = e.recall("deploys", top_k=5, trace=True)
+    assert "archive" not in trace.stages
+
+
+def test_entity_mention_seeds_and_spreads():
+    e = MemoryEngine()
+    decision = e.add("We picked Kafka for the event bus", entities=["Kafka"])
+    ops = e.add("Brokers need three replicas in production", entities=["Kafka"])
+    e.add("Brokers at the stock exchange close at four", entities=["finance"])
+
+    results = e.recall("Kafka", top_k=5)
+    ids = [r.memory.id for r in results]
+    assert decision.id in ids
+    # Reached through the shared entity, without a text match or explicit link
+    assert ops.id in ids
+
+
+def test_memories_with_entity():
+    e = MemoryEngine()
+    m1 = e.add("first", entities=["Postgres"])
+    m2 = e.add("second", entities=["postgres", "SQL"])
+    e.add("third", entities=["SQL"])
+    assert {m.id for m in e.memories_with_entity("POSTGRES")} == {m1.id, m2.id}
+
+
+def test_add_auto_tags_known_entities():
+    e = MemoryEngine(entity_dictionary=["event bus"])
+    e.add("Postgres is the primary store", entities=["Postgres"])
+    m = e.add("The event bus writes audit rows to postgres")
+    assert m.entities == ["event bus", "postgres"]
+    assert m.id in [x.id for x in e.memories_with_entity("Postgres")]
+
+    # Explicit entities are kept as given
+    m2 = e.add("postgres replica lag", entities=["replication"])
+    assert m2.entities == ["replication"]
+
+    off = MemoryEngine(auto_tag=False, entity_dictionary=["event bus"])
+    assert off.add("The event bus is down").entities == []
+
+
+def test_tagger_vocabulary_loads_from_store(tmp_path):
+    db = str(tmp_path / "m.db")
+    MemoryEngine(db_path=db).add("Kafka is our log", entities=["Kafka"])
+    e = MemoryEngine(db_path=db)
+    e.add_entity_names(["consumer group"])
+    m = e.add("Every kafka consumer group commits offsets")
+    assert m.entities == ["kafka", "consumer group"]
+
+
+def test_bm25_depth_adapts_to_penalized_head():
+    e = MemoryEngine()
+    for i in range(30):
+        m = e.add(f"alpha alpha alpha note {i}")
+        m.status = "contradicted"
+        e.store.update_memory(m)
+    live = [e.add(f"alpha with a long tail of other words number {i}") for i in range(3)]
+
+    seeds = e._bm25_seeds("alpha", 2, None)
+    assert len(seeds) > 2 * 4  # deeper than the old fixed top_k * 4
+    results = e.recall("alpha", top_k=2)
+    assert {r.memory.id for r in results} <= {m.id for m in live}
+
+
+def test_bm25_depth_stops_early_on_uniform_store():
+    e = MemoryEngine()
+    for i in range(200):
+        e.add(f"shared topic memory {i}")
+    assert len(e._bm25_seeds("shared topic", 5, None)) == 10
+
+
+def test_competition_ranking_selects_live_candidates():
+    e = MemoryEngine(bm25_ranking="competition")
+    for i in range(30):
+        m = e.add(f"alpha alpha alpha note {i}")
+        m.status = "contradicted"
+        e.store.update_memory(m)
+    live = [e.add(f"alpha with a long tail of other words number {i}") for i in range(3)]
+
+    seeds = e._bm25_seeds("alpha", 2, None)
+    assert len(seeds) == 4
+    assert {mid for mid, _ in seeds[:3]} == {m.id for m in live}
+    results = e.recall("alpha", top_k=2)
+    assert {r.memory.id for r in results} <= {m.id for m in live}
+
+
+def test_recall_deadline_returns_seeds_only():
+    e = MemoryEngine()
+    hit = e.add("the deploy script runs migrations")
+    neighbor = e.add("database backups happen nightly")
+    e.link(hit.id, neighbor.id, "supports", weight=0.9)
+
+    full = e.recall("deploy script", top_k=5)
+    assert {r.memory.id for r in full} == {hit.id, neighbor.id}
+    assert e.last_truncated == []
+
+    results = e.recall("deploy script", top_k=5, deadline_ms=0)
+    assert [r.memory.id for r in results] == [hit.id]
+    assert "spread" in e.last_truncated
+    assert "conflicts" in e.last_truncated
+
+
+def test_recall_generous_deadline_is_not_truncated():
+    e = MemoryEngine()
+    e.add("the deploy script runs migrations")
+    assert e.recall("deploy", deadline_ms=60_000)
+    assert e.last_truncated == []
+
+
+def test_recall_trace_reports_stages_and_counts():
+    e = MemoryEngine()
+    hit = e.add("the deploy script runs migrations")
+    neighbor = e.add("database backups happen nightly")
+    e.link(hit.id, neighbor.id, "supports", weight=0.9)
+
+    results, trace = e.recall("deploy script", top_k=5, trace=True)
+    assert len(results) == 2
+    assert {"seed", "spread", "hydrate", "compete", "conflicts", "pack", "update"} <= set(trace.stages)
+    assert trace.counts["bm25_hits"] == 1
+    assert trace.counts["seeds"] == 1
+    assert trace.counts["activated"] == 2
+    assert trace.counts["hydrated"] == 2
+    assert trace.counts["edges_scanned"] >= 1
+    assert trace.counts["returned"] == 2
+    assert trace.sql["seed"] >= 1
+    assert trace.sql["update"] >= 2
+    assert trace.total_ms >= sum(trace.stages.values()) * 0.5
+
+
+def test_recall_hooks_receive_traces():
+    e = MemoryEngine()
+    e.add("the deploy script runs migrations")
+    traces = []
+    e.add_recall_hook(traces.append)
+    results = e.recall("deploy")
+    assert isinstance(results, list) and len(results) == 1
+    assert len(traces) == 1 and traces[0].query == "deploy"
+
+    e.remove_recall_hook(traces.append)
+    e.recall("deploy")
+    assert len(traces) == 1
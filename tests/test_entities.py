@@ -0,0 +1,44 @@
+from openmem.entities import EntityTagger, load_entity_dictionary, normalize_entity
+
+
+def test_normalize_entity():
+    assert normalize_entity("  Postgres ") == "postgres"
+    assert normalize_entity("Événement") == "Événement"
+
+
+def test_tagger_finds_multiword_and_overlapping_names():
+    t = EntityTagger(["Postgres", "event bus", "bus", "node.js"])
+    found = t.tag("We moved the Event Bus off Postgres (and node.js).")
+    assert found == ["Event Bus", "Bus", "Postgres", "node.js"]
+
+
+def test_tagger_matches_whole_words_only():
+    t = EntityTagger(["go", "redis"])
+    assert t.tag("A good design uses redistribution") == []
+    assert t.tag("Go talks to Redis") == ["Go", "Redis"]
+
+
+def test_tagger_failure_links():
+    t = EntityTagger(["a b c", "b c d", "c d"])
+    assert t.tag("a b c d") == ["a b c", "b c d", "c d"]
+
+
+def test_tagger_incremental_add():
+    t = EntityTagger(["postgres"])
+    t.add(["Kafka"])
+    assert t.tag("kafka feeds postgres") == ["kafka", "postgres"]
+    # Enough new names to force a rebuild; all remain matchable
+    t.add([f"svc{i}" for i in range(200)])
+    assert not t._pending
+    assert t.tag("svc7 and Kafka") == ["svc7", "Kafka"]
+
+
+def test_tagger_ignores_single_character_names():
+    t = EntityTagger(["x", "C"])
+    assert len(t) == 0
+
+
+def test_load_entity_dictionary(tmp_path):
+    path = tmp_path / "entities.txt"
+    path.write_text("Postgres\n# comment\n\nevent bus  # inline\n")
+    assert load_entity_dictionary(str(path)) == ["Postgres", "event bus"]
@@ -0,0 +1,54 @@
+from openmem.fts import FTSQueryPlanner, parse_query
+from openmem.models import Memory
+from openmem.store import SQLiteStore
+
+
+def _add(store, text):
+    store.add_memory(Memory(text=text, created_at=0, updated_at=0))
+
+
+def test_parse_query_terms():
+    terms = parse_query('the "event bus" deploy* node.js ?')
+    assert [(t.text, t.kind) for t in terms] == [
+        ("the", "word"),
+        ("event bus", "phrase"),
+        ("deploy", "prefix"),
+        ("node.js", "word"),
+    ]
+    assert terms[3].tokens == ["node", "js"]
+    assert parse_query('"Café"')[0].tokens == ["cafe"]
+
+
+def test_phrase_and_prefix_search():
+    s = SQLiteStore()
+    _add(s, "The event bus fans out to workers")
+    _add(s, "A bus event was logged")
+    _add(s, "Deployment finished")
+    assert len(s.search_bm25('"event bus"')) == 1
+    assert len(s.search_bm25("deploy*")) == 1
+    assert s.search_bm25("deploy") == []
+
+
+def test_planner_drops_common_terms():
+    s = SQLiteStore()
+    s._fts_planners["main"] = FTSQueryPlanner(min_docs=10)
+    for i in range(20):
+        _add(s, f"the team noted item{i}")
+    plan = s.plan_fts_query("what did the team decide about item7")
+    assert '"the"' not in plan and '"team"' not in plan
+    assert '"item7"' in plan
+    # Only common terms: the rarest matchable one is kept
+    assert s.plan_fts_query("the team") in ('"the"', '"team"')
+    assert len(s.search_bm25("the team", limit=50)) == 20
+
+
+def test_planner_statistics_refresh_after_writes():
+    s = SQLiteStore()
+    planner = FTSQueryPlanner(min_docs=10)
+    s._fts_planners["main"] = planner
+    for i in range(10):
+        _add(s, f"alpha note {i}")
+    assert planner.doc_count(s.conn) == 10
+    for i in range(150):
+        _add(s, f"beta note {i}")
+    assert planner.doc_count(s.conn) == 160
@@ -0,0 +1,96 @@
+import sqlite3
+import threading
+
+import pytest
+
+from openmem import MemoryEngine
+from openmem._formatting import format_metrics
+from openmem.fts import FTSQueryPlanner
+from openmem.metrics import Histogram, MetricsRegistry, SLOT_SECONDS, WINDOW_SLOTS
+
+
+def test_histogram_quantiles_within_bucket_error():
+    h = Histogram()
+    for i in range(1, 1001):
+        h.record(i / 1000, now=0.0)  # 1 ms .. 1 s
+    q = h.window_quantiles(now=0.0)
+    assert q[0.5] == pytest.approx(0.5, rel=0.07)
+    assert q[0.99] == pytest.approx(0.99, rel=0.07)
+    assert h.cumulative_buckets()[-1] == (float("inf"), 1000)
+
+
+def test_histogram_window_rolls_over():
+    h = Histogram()
+    h.record(0.5, now=0.0)
+    later = SLOT_SECONDS * WINDOW_SLOTS + 1
+    h.record(0.001, now=later)
+    assert h.window_quantiles(now=later)[0.99] == pytest.approx(0.001, rel=0.07)
+    assert h.count == 2
+
+
+def test_timed_counts_lock_errors():
+    registry = MetricsRegistry()
+    with pytest.raises(sqlite3.OperationalError):
+        with registry.timed("add"):
+            raise sqlite3.OperationalError("database is locked")
+    counters = registry.snapshot()["counters"]
+    assert counters['sqlite_lock_errors{op="add"}'] == 1
+    assert counters['operation_errors{op="add"}'] == 1
+    assert registry.snapshot()["operations"]["add"]["count"] == 1
+
+
+def test_engines_share_a_registry():
+    registry = MetricsRegistry()
+    for _ in range(2):
+        e = MemoryEngine(metrics=registry)
+        m = e.add("the deploy script runs migrations")
+        e.reinforce(m.id)
+        e.recall("deploy")
+    ops = registry.snapshot()["operations"]
+    assert ops["add"]["count"] == 2
+    assert ops["recall"]["count"] == 2
+    assert ops["reinforce"]["count"] == 2
+    assert ops["recall"]["p50_ms"] is not None
+
+
+def test_prometheus_text_format():
+    e = MemoryEngine()
+    e.add("the deploy script runs migrations")
+    e.recall("deploy", deadline_ms=0)
+    text = e.metrics.to_prometheus()
+    assert "# TYPE openmem_operation_duration_seconds histogram" in text
+    assert 'openmem_operation_duration_seconds_bucket{op="recall",le="+Inf"} 1' in text
+    assert 'openmem_operation_duration_seconds_count{op="add"} 1' in text
+    assert "openmem_recall_truncated_total 1" in text
+    assert text.endswith("\n")
+
+
+def test_traced_recall_counts_cache_lookups_once():
+    plain, traced = MemoryEngine(), MemoryEngine()
+    traced.add_recall_hook(lambda trace: None)
+    for e in (plain, traced):
+        e.store._fts_planners["main"] = FTSQueryPlanner(min_docs=1)
+        e.add("the deploy script runs migrations")
+        e.recall("deploy script")
+        e.recall("deploy script")
+    assert traced.metrics.snapshot()["counters"] == plain.metrics.snapshot()["counters"]
+
+
+def test_write_lock_wait_is_measured(tmp_path):
+    db = str(tmp_path / "m.db")
+    e = MemoryEngine(db_path=db)
+    holder = sqlite3.connect(db, check_same_thread=False)
+    holder.execute("BEGIN IMMEDIATE")
+    timer = threading.Timer(0.2, holder.commit)
+    timer.start()
+    try:
+        e.add("the deploy script runs migrations")
+    finally:
+        timer.join()
+    waits = e.metrics.snapshot()["lock_waits"]
+    assert waits["add"]["count"] == 1
+    assert waits["add"]["mean_ms"] >= 150
+    assert 'openmem_sqlite_lock_wait_seconds_count{op="add"} 1' in e.metrics.to_prometheus()
+    assert "add lock wait" in format_metrics(e.metrics.snapshot())
+    holder.close()
+    e.close()
@@ -0,0 +1,41 @@
+import os
+import time
+
+from openmem.profiling import ToolProfiler
+
+
+def _work(delay):
+    time.sleep(delay)
+    return sum(i * i for i in range(2000))
+
+
+def test_disabled_profiler_writes_nothing(tmp_path):
+    profiler = ToolProfiler(str(tmp_path / "profiles"))
+    assert profiler.wrap(_work)(0) == _work(0)
+    assert not (tmp_path / "profiles").exists()
+
+
+def test_keeps_only_the_slowest_calls(tmp_path, capsys):
+    directory = str(tmp_path / "profiles")
+    profiler = ToolProfiler(directory, keep=2, enabled=True)
+    work = profiler.wrap(_work)
+    assert work.__name__ == "_work"
+    for delay in (0.03, 0.0, 0.02, 0.001):
+        work(delay)
+
+    kept = profiler.kept()
+    assert len(kept) == 2
+    assert kept[0][0] >= 25 and kept[1][0] >= 15
+    files = sorted(os.listdir(directory))
+    assert len(files) == 6  # .pstats, .collapsed and .txt per profile
+    collapsed = next(f for f in files if f.endswith(".collapsed"))
+    with open(os.path.join(directory, collapsed)) as f:
+        line = f.readline()
+    assert ";" in line and line.rsplit(" ", 1)[1].strip().isdigit()
+    assert capsys.readouterr().out == ""
+
+    # A new profiler picks the retained profiles up from disk
+    again = ToolProfiler(directory, keep=2, enabled=True)
+    assert [ms for ms, _ in again.kept()] == [round(ms) for ms, _ in kept]
+    again.wrap(_work)(0)
+    assert len(os.listdir(directory)) == 6
@@ -1,7 +1,9 @@
+import random
 import time
 
 from openmem.models import Memory, ScoredMemory
 from openmem.scoring import compete, recency_score, strength_score
+from openmem.store import SQLiteStore
 
 
 def test_recency_fresh():
@@ -99,3 +101,40 @@ def test_scored_memory_components():
     assert "recency" in c
     assert "strength" in c
     assert "confidence" in c
+
+
+def test_sql_competition_matches_compete():
+    """search_bm25(rank="competition") orders hits exactly as compete does."""
+    rng = random.Random(7)
+    now = time.time()
+    store = SQLiteStore(":memory:")
+    words = ["deploy", "cache", "schema", "review", "latency"]
+    for i in range(60):
+        created = now - rng.uniform(0, 90) * 86400
+        store.add_memory(Memory(
+            id=f"m{i:02d}",
+            text=" ".join(rng.choices(words, k=rng.randint(2, 8))) + f" note {i}",
+            strength=rng.uniform(0.2, 1.0),
+            confidence=rng.uniform(0.3, 1.0),
+            access_count=rng.randint(0, 20),
+            created_at=created,
+            last_accessed=created + rng.uniform(0, now - created),
+            status=rng.choice(["active", "active", "active", "superseded", "contradicted"]),
+        ))
+    weights = {"activation": 0.4, "recency": 0.3, "strength": 0.2, "confidence": 0.1}
+
+    hits = store.search_bm25("deploy cache", limit=1000)
+    memories = {mid: store.get_memory(mid) for mid, _ in hits}
+    expected = compete(dict(hits), memories, weights=weights, now=now)
+
+    ranked = store.search_bm25(
+        "deploy cache", limit=1000, rank="competition", weights=weights, now=now
+    )
+    assert [mid for mid, _ in ranked] == [s.memory.id for s in expected]
+    for (_, score), reference in zip(ranked, expected):
+        assert abs(score - reference.score) < 1e-9
+
+    top = store.search_bm25(
+        "deploy cache", limit=5, rank="competition", weights=weights, now=now
+    )
+    assert [mid for mid, _ in top] == [s.memory.id for s in expected[:5]]
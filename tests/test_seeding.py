@@ -0,0 +1,125 @@
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from openmem import MemoryEngine
+from openmem.seeding import fuse_seeds, run_channels
+from openmem.store import SQLiteStore
+
+
+def test_fusion_adds_only_what_bm25_missed():
+    fused, shares = fuse_seeds(
+        {
+            "bm25": [("a", 1.0), ("b", 0.01)],
+            "entity": [("b", 1.0), ("c", 0.6)],
+            "vector": [("c", 0.4)],
+        },
+        weights={"entity": 0.5, "vector": 0.5},
+    )
+    assert fused == {"a": 1.0, "b": 0.01, "c": 0.5}
+    assert abs(sum(shares.values()) - 1.0) < 1e-9
+    assert shares["bm25"] > shares["entity"] > shares["vector"]
+
+
+def test_fusion_preserves_bm25_gaps():
+    hits = [(f"m{i}", 10.0 ** -i) for i in range(6)]
+    fused, _ = fuse_seeds({"bm25": hits, "vector": [("other", 0.4)]})
+    assert [fused[mid] for mid, _ in hits] == [score for _, score in hits]
+
+
+def test_run_channels_drops_slow_channels():
+    store = SQLiteStore()
+
+    def slow(_store):
+        time.sleep(0.5)
+        return [("late", 1.0)]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        results, reports = run_channels(
+            {"fast": lambda _store: [("x", 1.0)], "slow": slow},
+            store,
+            pool=pool,
+            budget_ms=50,
+        )
+    assert results == {"fast": [("x", 1.0)]}
+    assert reports["slow"].timed_out
+    assert reports["fast"].hits == 1 and not reports["fast"].timed_out
+
+
+def test_parallel_seeding_matches_serial(tmp_path):
+    db = str(tmp_path / "m.db")
+    parallel = MemoryEngine(db_path=db)
+    parallel.add("Postgres handles our billing ledger", entities=["Postgres"])
+    parallel.add("The ledger is reconciled nightly", entities=["ledger"])
+    parallel.add("Redis caches session tokens", entities=["Redis"])
+    serial = MemoryEngine(db_path=db, parallel_seeding=False)
+
+    query = "postgres ledger"
+    got = [(r.memory.id, round(r.score, 6)) for r in parallel.recall(query)]
+    want = [(r.memory.id, round(r.score, 6)) for r in serial.recall(query)]
+    assert [g[0] for g in got] == [w[0] for w in want]
+
+    report = parallel.seed_report()
+    assert set(report) == {"bm25", "entity"}
+    assert report["bm25"]["calls"] == 1
+    assert 0 < report["bm25"]["mean_contribution"] <= 1
+    parallel.close()
+    serial.close()
+
+
+def test_seed_channels_can_be_disabled():
+    e = MemoryEngine(seed_channels=["bm25"])
+    e.add("Kafka topic retention is seven days", entities=["Kafka"])
+    e.recall("kafka")
+    assert set(e.seed_report()) == {"bm25"}
+    assert e.last_seed_report["bm25"].contribution == 1.0
+
+
+def test_slow_bm25_is_waited_for_without_deadline(tmp_path, monkeypatch):
+    e = MemoryEngine(db_path=str(tmp_path / "m.db"), channel_budget_ms=20)
+    m = e.add("Nightly backups go to cold storage")
+    bm25_seeds = e._bm25_seeds
+
+    def slow_bm25(*args, **kwargs):
+        time.sleep(0.1)
+        return bm25_seeds(*args, **kwargs)
+
+    monkeypatch.setattr(e, "_bm25_seeds", slow_bm25)
+    assert [r.memory.id for r in e.recall("backups")] == [m.id]
+    assert not e.last_seed_report["bm25"].timed_out
+    assert "seed" not in e.last_truncated
+    e.close()
+
+
+def test_failing_secondary_channel_is_dropped():
+    store = SQLiteStore()
+
+    def broken(_store):
+        raise ValueError("matrix shape mismatch")
+
+    for pool in (None, ThreadPoolExecutor(max_workers=2)):
+        results, reports = run_channels(
+            {"bm25": lambda _store: [("x", 1.0)], "vector": broken},
+            store,
+            pool=pool,
+            primary=("bm25",),
+        )
+        assert results == {"bm25": [("x", 1.0)]}
+        assert reports["vector"].error == "ValueError: matrix shape mismatch"
+        if pool is not None:
+            pool.shutdown()
+
+
+def test_close_closes_seed_reader_connections(tmp_path):
+    e = MemoryEngine(db_path=str(tmp_path / "m.db"))
+    e.add("Postgres handles our billing ledger", entities=["Postgres"])
+    e.recall("postgres ledger")
+    readers = list(e._reader_stores)
+    assert readers
+    e.close()
+    assert e._reader_stores == []
+    for store in readers:
+        with pytest.raises(sqlite3.ProgrammingError):
+            store.conn.execute("SELECT 1")
@@ -0,0 +1,70 @@
+import json
+
+from openmem import MemoryEngine
+from openmem.slowlog import (
+    SlowQueryLog,
+    explain_statements,
+    read_slow_log,
+    statement_shape,
+    summarize_slow_log,
+)
+from openmem.store import SQLiteStore
+
+
+def test_statement_shape_groups_literals():
+    a = statement_shape("SELECT * FROM memories WHERE id = 'abc'  AND strength > 0.5")
+    b = statement_shape("SELECT * FROM memories WHERE id = 'x''y' AND strength > 12")
+    assert a == b == "SELECT * FROM memories WHERE id = ? AND strength > ?"
+
+
+def test_expanded_and_template_statements_share_a_plan():
+    store = SQLiteStore()
+    expanded = "SELECT id FROM memories_fts WHERE memories_fts MATCH 'deploy' LIMIT 10"
+    template = "SELECT id FROM memories_fts WHERE memories_fts MATCH ? LIMIT ?"
+    (entry,) = explain_statements(store.conn, {expanded: 2, template: 3})
+    assert entry["sql"] == template
+    assert entry["count"] == 5
+    assert any("VIRTUAL TABLE" in step for step in entry["plan"])
+
+
+def test_slow_recalls_are_logged_with_plans(tmp_path):
+    path = str(tmp_path / "slow.jsonl")
+    e = MemoryEngine(slow_log=path, slow_log_threshold_ms=0)
+    hit = e.add("the deploy script runs migrations")
+    e.link(hit.id, e.add("database backups happen nightly").id, "supports")
+    e.recall("deploy script")
+
+    (entry,) = read_slow_log(path)
+    assert entry["query"] == "deploy script"
+    assert entry["fts_query"] == '"deploy" OR "script"'
+    assert entry["counts"]["bm25_hits"] == 1
+    assert "spread" in entry["stages"]
+    plans = {p["sql"]: p for p in entry["plans"]}
+    (match,) = [p for sql, p in plans.items() if "memories_fts MATCH" in sql]
+    assert "'" not in match["sql"]  # recorded as a template, not expanded
+    assert any("VIRTUAL TABLE" in step for step in match["plan"])
+    assert not any(step.startswith("error") for p in plans.values() for step in p["plan"])
+
+    summary = summarize_slow_log(read_slow_log(path))
+    assert summary["count"] == 1
+    assert summary["slowest"][0]["query"] == "deploy script"
+
+
+def test_fast_recalls_are_not_logged(tmp_path):
+    path = tmp_path / "slow.jsonl"
+    e = MemoryEngine(slow_log=str(path), slow_log_threshold_ms=60_000)
+    e.add("the deploy script runs migrations")
+    e.recall("deploy")
+    assert not path.exists()
+
+
+def test_slow_log_is_bounded(tmp_path):
+    path = str(tmp_path / "slow.jsonl")
+    log = SlowQueryLog(path, conn=None, max_entries=8)
+    for i in range(20):
+        log.append({"total_ms": float(i)})
+    entries = read_slow_log(path)
+    assert len(entries) <= 8
+    assert entries[-1]["total_ms"] == 19.0
+    with open(path) as f:
+        assert all(json.loads(line) for line in f)
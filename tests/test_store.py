@@ -1,6 +1,6 @@
 import time
 
-from openmem.models import Edge, Memory
+from openmem.models import Edge, Memory, MemoryFilter
 from openmem.store import SQLiteStore
 
 
@@ -139,3 +139,144 @@ def test_fts5_stays_in_sync_after_update():
     # Should find by new text
     results = store.search_bm25("beta")
     assert len(results) == 1
+
+
+def test_search_bm25_with_filters():
+    store = make_store()
+    a = Memory(text="deploy pipeline uses Docker", type="decision", project="/repo/a")
+    b = Memory(text="deploy pipeline uses Podman", type="fact", project="/repo/b")
+    c = Memory(text="deploy pipeline is slow", type="fact", project="/repo/a",
+               created_at=time.time() - 60 * 86400)
+    for m in (a, b, c):
+        store.add_memory(m)
+
+    ids = {mid for mid, _ in store.search_bm25("deploy", filters=MemoryFilter(project="/repo/a"))}
+    assert ids == {a.id, c.id}
+
+    ids = {mid for mid, _ in store.search_bm25("deploy", filters=MemoryFilter(types=["fact"]))}
+    assert ids == {b.id, c.id}
+
+    recent = MemoryFilter(project="/repo/a", created_after=time.time() - 30 * 86400)
+    ids = {mid for mid, _ in store.search_bm25("deploy", filters=recent)}
+    assert ids == {a.id}
+
+
+def test_search_bm25_filter_limit_counts_matching_rows_only():
+    store = make_store()
+    for i in range(10):
+        store.add_memory(Memory(text=f"shared keyword {i}", project="/other"))
+    target = Memory(text="shared keyword target", project="/mine")
+    store.add_memory(target)
+
+    results = store.search_bm25("shared", limit=1, filters=MemoryFilter(project="/mine"))
+    assert [mid for mid, _ in results] == [target.id]
+
+
+def test_get_neighbors_with_filters():
+    store = make_store()
+    center = Memory(text="center", project="/p")
+    same = Memory(text="same project", project="/p")
+    other = Memory(text="other project", project="/q")
+    for m in (center, same, other):
+        store.add_memory(m)
+    store.add_edge(Edge(source_id=center.id, target_id=same.id))
+    store.add_edge(Edge(source_id=other.id, target_id=center.id))
+
+    neighbors = store.get_neighbors(center.id, MemoryFilter(project="/p"))
+    assert [n.id for _, n in neighbors] == [same.id]
+
+
+def test_deleted_memories_leave_fts_index():
+    store = make_store()
+    mem = Memory(text="tombstone candidate gamma")
+    store.add_memory(mem)
+    assert len(store.search_bm25("gamma")) == 1
+
+    store.mark_deleted([mem.id])
+    assert store.search_bm25("gamma") == []
+    fts_rows = store.conn.execute(
+        "SELECT COUNT(*) FROM memories_fts WHERE memories_fts MATCH 'gamma'"
+    ).fetchone()[0]
+    assert fts_rows == 0
+
+
+def test_access_bump_does_not_reindex():
+    store = make_store()
+    mem = Memory(text="frequently recalled delta")
+    store.add_memory(mem)
+    store.update_access(mem.id)
+    store.update_access(mem.id)
+    assert len(store.search_bm25("delta")) == 1
+
+
+def test_purge_deleted_removes_rows_and_edges():
+    store = make_store()
+    keep = Memory(text="keep")
+    drop = Memory(text="drop")
+    store.add_memory(keep)
+    store.add_memory(drop)
+    store.add_edge(Edge(source_id=keep.id, target_id=drop.id))
+
+    store.mark_deleted([drop.id])
+    assert store.get_neighbors(keep.id) == []
+    assert store.purge_deleted() == (1, 1)
+    assert store.get_memory(drop.id) is None
+    assert store.all_edges() == []
+    store.compact()
+    assert store.get_memory(keep.id) is not None
+
+
+def test_entity_index_tracks_memories():
+    store = make_store()
+    mem = Memory(text="we use it", entities=["Postgres", " Redis "])
+    store.add_memory(mem)
+    assert store.entity_fans(["postgres", "redis", "mysql"]) == {"postgres": 1, "redis": 1}
+    assert store.memories_for_entity("postgres") == [mem.id]
+
+    mem.entities = ["MySQL"]
+    store.update_memory(mem)
+    assert store.entity_fans(["postgres", "mysql"]) == {"mysql": 1}
+
+    store.mark_deleted([mem.id])
+    assert store.memories_for_entity("mysql") == []
+
+
+def test_memories_for_entity_in_storage_order():
+    store = make_store()
+    mems = [Memory(text=f"m{i}", entities=["Kafka"]) for i in range(8)]
+    for m in mems:
+        store.add_memory(m)
+    assert store.memories_for_entity("kafka") == [m.id for m in mems]
+
+
+def test_get_entity_neighbors_skips_generic_entities():
+    store = make_store()
+    a = Memory(text="a", entities=["Kafka", "infra"])
+    b = Memory(text="b", entities=["Kafka"])
+    others = [Memory(text=f"o{i}", entities=["infra"]) for i in range(5)]
+    for m in (a, b, *others):
+        store.add_memory(m)
+
+    assert store.get_entity_neighbors(a.id, max_fan=3) == [(b.id, 2)]
+    assert len(store.get_entity_neighbors(a.id, max_fan=10)) == 6
+
+
+def test_score_bounds_are_raised_by_writes():
+    s = SQLiteStore()
+    s.add_memory(Memory(text="a", created_at=100.0, updated_at=100.0, confidence=0.5))
+    assert s.score_bounds()["confidence"] == 0.5
+    s.add_memory(Memory(text="b", created_at=200.0, updated_at=200.0, confidence=0.9))
+    bounds = s.score_bounds()
+    assert bounds["confidence"] == 0.9 and bounds["ref_time"] == 200.0
+    s.update_access(s.all_memories()[0].id)
+    assert s.score_bounds()["access_count"] >= 1
+    assert s.score_bounds()["ref_time"] > 200.0
+
+
+def test_reader_inherits_busy_timeout(tmp_path):
+    store = SQLiteStore(str(tmp_path / "m.db"))
+    store.set_busy_timeout(250)
+    reader = store.reader()
+    assert reader.conn.execute("PRAGMA busy_timeout").fetchone()[0] == 250
+    reader.close()
+    store.close()
@@ -0,0 +1,42 @@
+from openmem import MemoryEngine
+from openmem.ui.app import create_app
+
+
+def test_request_engines_are_closed(tmp_path, monkeypatch):
+    db = str(tmp_path / "m.db")
+    seeded = MemoryEngine(db_path=db)
+    seeded.add("Postgres handles our billing ledger", entities=["Postgres"])
+    seeded.close()
+
+    opened, closed = [], []
+    init, close = MemoryEngine.__init__, MemoryEngine.close
+
+    def tracking_init(self, *args, **kwargs):
+        opened.append(self)
+        init(self, *args, **kwargs)
+
+    def tracking_close(self):
+        closed.append(self)
+        close(self)
+
+    monkeypatch.setattr(MemoryEngine, "__init__", tracking_init)
+    monkeypatch.setattr(MemoryEngine, "close", tracking_close)
+
+    client = create_app(db_path=db, archive_path=str(tmp_path / "archive.db")).test_client()
+    for _ in range(3):
+        assert client.get("/api/search?q=postgres").status_code == 200
+        assert client.get("/api/stats").status_code == 200
+    assert len(opened) == 6
+    assert closed == opened
+    assert 'op="recall"' in client.get("/metrics").get_data(as_text=True)
+
+
+def test_ui_does_not_create_an_archive(tmp_path, monkeypatch):
+    archive = tmp_path / "archive.db"
+    monkeypatch.delenv("OPENMEM_ARCHIVE_DB", raising=False)
+    monkeypatch.setattr("openmem.ui.app.DEFAULT_ARCHIVE_DB", str(archive))
+
+    client = create_app(db_path=str(tmp_path / "m.db")).test_client()
+    assert client.get("/api/search?q=postgres").status_code == 200
+    assert client.get("/api/stats").status_code == 200
+    assert not archive.exists()
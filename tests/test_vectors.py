@@ -0,0 +1,193 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from openmem import MemoryEngine
+from openmem.models import MemoryFilter
+from openmem.store import SQLiteStore
+from openmem.vectors import VECTOR_DIM, VectorIndex, compact_matrix, embed, quantize
+
+
+def test_embed_is_deterministic_and_unit_length():
+    a = embed("Rolling deployments replace instances")
+    b = embed("Rolling deployments replace instances")
+    assert a.shape == (VECTOR_DIM,)
+    assert np.array_equal(a, b)
+    assert abs(float(np.linalg.norm(a)) - 1.0) < 1e-5
+    assert not embed("").any()
+
+
+def test_quantize_round_trip():
+    v = embed("int8 quantization keeps cosine ordering")
+    q, scale = quantize(v)
+    assert q.dtype == np.int8
+    assert float(np.abs(q.astype(np.float32) * scale - v).max()) <= scale / 2 + 1e-6
+
+
+def test_search_ranks_morphological_variants():
+    store = SQLiteStore()
+    index = VectorIndex(store)
+    for mid, text in [
+        ("a", "Docker containers package applications"),
+        ("b", "Python decorators modify functions"),
+    ]:
+        store.conn.execute(
+            "INSERT INTO memories (id, text, entities, created_at, updated_at) "
+            "VALUES (?, ?, '[]', 0, 0)",
+            (mid, text),
+        )
+        index.add(mid, text)
+    hits = index.search("containerized applications", limit=2)
+    assert hits[0][0] == "a"
+    assert hits[0][1] > hits[-1][1]
+
+
+def test_search_respects_filters_and_tombstones():
+    e = MemoryEngine(vectors=True)
+    a = e.add("Kubernetes schedules containers", project="infra")
+    b = e.add("Kubernetes scheduling quirks", project="web")
+    hits = e.vectors.search("kubernetes scheduler", filters=MemoryFilter(project="web"))
+    assert [h[0] for h in hits] == [b.id]
+    e.delete(b.id)
+    assert [h[0] for h in e.vectors.search("kubernetes scheduler")] == [a.id]
+
+
+def test_vector_seeds_recall_without_shared_tokens():
+    e = MemoryEngine(vectors=True)
+    m = e.add("Rolling deployments gradually replace old instances")
+    e.add("Python decorators modify function behaviour")
+    assert e.store.search_bm25("deploying") == []
+    assert [r.memory.id for r in e.recall("deploying")] == [m.id]
+
+
+def test_matrix_file_persists_and_backfills(tmp_path):
+    db = str(tmp_path / "m.db")
+    plain = MemoryEngine(db_path=db)
+    old = plain.add("Backfilled memories get vectors when the channel is enabled")
+    e = MemoryEngine(db_path=db, vectors=True)
+    assert (tmp_path / "m.db.vec").exists()
+    new = e.add("Memory-mapped matrices survive restarts")
+
+    reopened = MemoryEngine(db_path=db, vectors=True)
+    assert reopened.vectors.search("backfill")[0][0] == old.id
+    assert reopened.vectors.search("memory mapped matrix")[0][0] == new.id
+
+    # Rows appended by another connection are picked up on search
+    late = e.add("Late writers append rows concurrently")
+    assert reopened.vectors.search("late writer")[0][0] == late.id
+
+
+def test_vector_rows_are_not_reused_between_compactions(tmp_path):
+    db = str(tmp_path / "m.db")
+    e = MemoryEngine(db_path=db, vectors=True)
+    e.add("Kubernetes schedules containers")
+    top = e.add("Terraform provisions infrastructure")
+    other = MemoryEngine(db_path=db, vectors=True)  # loads both rows
+    top_row = e.store.conn.execute(
+        "SELECT row FROM memory_vectors WHERE memory_id = ?", (top.id,)
+    ).fetchone()[0]
+    e.delete(top.id)
+    e.store.purge_deleted()
+
+    late = e.add("Ansible playbooks configure hosts")
+    late_row = e.store.conn.execute(
+        "SELECT row FROM memory_vectors WHERE memory_id = ?", (late.id,)
+    ).fetchone()[0]
+    assert late_row > top_row
+    assert other.vectors.search("ansible playbook")[0][0] == late.id
+
+
+def test_gc_compacts_the_matrix(tmp_path):
+    db = str(tmp_path / "m.db")
+    e = MemoryEngine(db_path=db, vectors=True)
+    memories = [e.add(f"Service {i} deploys with rolling updates") for i in range(5000)]
+    kept = e.add("Kubernetes schedules containers")
+    edited = e.add("Terraform provisions infrastructure")
+    other = MemoryEngine(db_path=db, vectors=True)
+    for m in memories:
+        e.delete(m.id)
+    edited.text = "Ansible playbooks configure hosts"
+    e.update(edited)
+    size = (tmp_path / "m.db.vec").stat().st_size
+
+    assert e.gc()["vector_rows_dropped"] == 5001
+    assert (tmp_path / "m.db.vec").stat().st_size < size
+    assert [r[0] for r in e.store.vector_rows()] == [1, 2]
+    for engine in (e, other):  # the other process reloads the renumbered matrix
+        assert engine.vectors.search("kubernetes scheduler")[0][0] == kept.id
+        assert engine.vectors.search("ansible playbook")[0][0] == edited.id
+        assert engine.vectors.search("terraform provisioning") == []
+    late = other.add("Nightly backups go to cold storage")
+    assert e.vectors.search("backup storage")[0][0] == late.id
+    assert e.gc()["vector_rows_dropped"] == 0
+
+    # gc compacts the matrix even without the vector channel enabled
+    other.delete(kept.id)
+    assert MemoryEngine(db_path=db).gc()["vector_rows_dropped"] == 1
+    assert e.vectors.search("backup storage")[0][0] == late.id
+    assert kept.id not in [h[0] for h in e.vectors.search("kubernetes scheduler")]
+
+
+def test_interrupted_compaction_is_completed_on_open(tmp_path, monkeypatch):
+    db = str(tmp_path / "m.db")
+    e = MemoryEngine(db_path=db, vectors=True)
+    gone = e.add("Terraform provisions infrastructure")
+    kept = e.add("Kubernetes schedules containers")
+    e.delete(gone.id)
+    e.store.purge_deleted()
+    # Crash after the renumbering commits, before the new file is renamed
+    monkeypatch.setattr("openmem.vectors._finish_compaction", lambda path, generation: None)
+    assert compact_matrix(e.store, str(tmp_path / "m.db.vec")) == 1
+    monkeypatch.undo()
+
+    reopened = MemoryEngine(db_path=db, vectors=True)
+    assert reopened.vectors.search("kubernetes scheduler")[0][0] == kept.id
+    assert [p.name for p in tmp_path.glob("m.db.vec*")] == ["m.db.vec"]
+
+
+def test_in_memory_matrix_is_compacted():
+    e = MemoryEngine(vectors=True)
+    gone = e.add("Terraform provisions infrastructure")
+    kept = e.add("Kubernetes schedules containers")
+    e.delete(gone.id)
+    assert e.gc()["vector_rows_dropped"] == 1
+    assert e.vectors._rows == 2
+    assert e.vectors.search("kubernetes scheduler")[0][0] == kept.id
+    assert e.add("Ansible playbooks configure hosts").id == e.vectors.search("ansible")[0][0]
+
+
+def test_edited_text_is_reembedded():
+    e = MemoryEngine(vectors=True)
+    m = e.add("Kubernetes schedules containers")
+    m.text = "Terraform provisions infrastructure"
+    e.update(m)
+    assert e.vectors.search("terraform provisioning")[0][0] == m.id
+    assert m.id not in [h[0] for h in e.vectors.search("kubernetes scheduler")]
+
+    # Edits written straight to the store drop the stale vector until sync()
+    m.text = "Ansible playbooks configure hosts"
+    e.store.update_memory(m)
+    assert e.vectors.search("terraform provisioning") == []
+    assert e.vectors.sync() == 1
+    assert e.vectors.search("ansible playbook")[0][0] == m.id
+
+
+def test_version_3_vector_table_is_upgraded(tmp_path):
+    db = str(tmp_path / "m.db")
+    conn = SQLiteStore(db).conn
+    conn.executescript("""
+        DROP TRIGGER memory_vectors_au;
+        DROP TABLE memory_vectors;
+        CREATE TABLE memory_vectors (
+            row INTEGER PRIMARY KEY, memory_id TEXT NOT NULL UNIQUE, scale REAL NOT NULL
+        );
+        INSERT INTO memory_vectors VALUES (7, 'm1', 0.5);
+        PRAGMA user_version = 3;
+    """)
+    conn.close()
+    store = SQLiteStore(db)
+    sql = store.conn.execute(
+        "SELECT sql FROM sqlite_master WHERE name = 'memory_vectors'"
+    ).fetchone()[0]
+    assert "AUTOINCREMENT" in sql
+    assert store.vector_rows(after_row=0) == [(7, 0.5)]